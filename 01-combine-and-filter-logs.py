@@ -1,3 +1,4 @@
+import argparse
 import gzip
 import os
 import re
@@ -8,17 +9,18 @@ from typing import Iterator
 
 from tqdm import tqdm
 
-# Regex patterns
-SERVER_DONE_PATTERN = r": Done \(\d.*help"
-TIME_PATTERN = r"^\[[^\[]*(\d{2}:\d{2}:\d{2}).*?\]"
-PLAYER_UUID_MAPPING_PATTERN = (
-    r"UUID of player (\S+) is (\S{8}-\S{4}-\S{4}-\S{4}-\S{12})"
+from parsing import (
+    PlayerIdentities,
+    RelevanceFilter,
+    add_time_window_arguments,
+    date_in_window,
+    find_uuid_mapping,
+    get_time_window,
+    parse_timestamp,
+    widen_to_months,
 )
-PLAYER_UUID_MAPPING_PATTERN_ALT = (
-    r"config to (\S+) \((\S{8}-\S{4}-\S{4}-\S{4}-\S{12})\)"
-)
-
-player_names: set[str] = set()
+from parsing.patterns import LOG_TIME_PATTERN
+from profiling import add_profile_argument, profiler, setup_profiling
 
 
 def read_gzipped_file(file: Path) -> Iterator[str]:
@@ -52,7 +54,7 @@ def parse_log_filename(filename: Path) -> tuple[str, int] | None:
 def get_first_timestamp(file: Path) -> datetime | None:
     """Get the first timestamp from a log file"""
     for line in read_gzipped_file(file):
-        match = re.search(TIME_PATTERN, line)
+        match = re.search(LOG_TIME_PATTERN, line)
         if match:
             try:
                 return datetime.strptime(match.group(1), "%H:%M:%S")
@@ -61,7 +63,9 @@ def get_first_timestamp(file: Path) -> datetime | None:
     return None
 
 
-def get_log_files(server: str) -> list[Path]:
+def get_log_files(
+    server: str, since: float | None = None, until: float | None = None
+) -> list[Path]:
     log_dir = Path(f"files/{server}/logs")
     if not log_dir.exists():
         return []
@@ -72,11 +76,13 @@ def get_log_files(server: str) -> list[Path]:
         parsed = parse_log_filename(file)
         if parsed:
             date_str, _ = parsed
-            files_by_date[date_str].append(file)
+            # Skip files outside the time window without opening them
+            if date_in_window(date_str, since, until):
+                files_by_date[date_str].append(file)
 
-    # Sort each day's files by their first timestamp
+    # Sort days, then each day's files by their first timestamp
     sorted_files = []
-    for date_files in files_by_date.values():
+    for _, date_files in sorted(files_by_date.items()):
         # Get first timestamp for each file
         files_with_time = []
         for file in date_files:
@@ -92,59 +98,105 @@ def get_log_files(server: str) -> list[Path]:
     return sorted_files
 
 
-def is_relevant_line(line: str) -> bool:
-    # Check for new player names
-    matches = re.findall(PLAYER_UUID_MAPPING_PATTERN, line)
-    for match in matches:
-        player_names.add(match[0])
-        return True
-
-    matches = re.findall(PLAYER_UUID_MAPPING_PATTERN_ALT, line)
-    for match in matches:
-        player_names.add(match[0])
-        return True
-
-    # Check if line is relevant
-    if re.search(SERVER_DONE_PATTERN, line):
-        return True
-    return any(player in line for player in player_names)
+def read_and_filter_log_file(
+    file: Path,
+    server: str,
+    identities: PlayerIdentities,
+    line_filter: RelevanceFilter,
+    heartbeats: list[float],
+) -> Iterator[str]:
+    """Read and filter log lines, yielding only relevant ones
 
-
-def read_and_filter_log_file(file: Path) -> Iterator[str]:
-    """Read and filter log lines, yielding only relevant ones"""
-    return (
-        f"{file.name}: {line}"
-        for line in read_gzipped_file(file)
-        if is_relevant_line(line)
+    UUID mappings are recorded in identities along the way. The times of the
+    first line of every minute and of the last line are appended to
+    heartbeats, since most lines showing that the server runs are filtered.
+    """
+    date_str, _ = parse_log_filename(file)
+    minute = time_str = None
+    for line in read_gzipped_file(file):
+        time_match = re.search(LOG_TIME_PATTERN, line)
+        if time_match:
+            time_str = time_match.group(1)
+            if time_str[:5] != minute:
+                minute = time_str[:5]
+                heartbeats.append(parse_timestamp(f"{date_str} {time_str}"))
+        if mapping := find_uuid_mapping(line):
+            player, uuid = mapping
+            line_filter.player_names.add(player)
+            if time_match:
+                timestamp = parse_timestamp(f"{date_str} {time_match.group(1)}")
+                identities.observe(uuid, player, server, timestamp)
+            yield f"{file.name}: {line}"
+        elif line_filter.is_relevant(line):
+            yield f"{file.name}: {line}"
+    if time_str is not None:
+        heartbeats.append(parse_timestamp(f"{date_str} {time_str}"))
+
+
+def process_server(
+    server: str,
+    identities: PlayerIdentities,
+    since: float | None = None,
+    until: float | None = None,
+) -> None:
+    # Players who joined before the window have no UUID line in it
+    line_filter = RelevanceFilter(
+        identities.server_names(server) if since is not None else ()
     )
 
-
-def process_server(server: str) -> None:
-    player_names.clear()
-
     output_file = Path(f"files/{server}/filtered_logs.txt")
-    log_files = get_log_files(server)
+    log_files = get_log_files(server, since, until)
 
     total_lines = 0
+    heartbeats: list[float] = []
+    # Time of the last line of each log file, in the order they were read
+    log_ends: list[tuple[str, float]] = []
 
     with open(output_file, "w", encoding="utf-8") as outf:
         for log_file in tqdm(log_files, desc=f"Processing {server} logs"):
-            for line in read_and_filter_log_file(log_file):
+            count = len(heartbeats)
+            for line in read_and_filter_log_file(
+                log_file, server, identities, line_filter, heartbeats
+            ):
                 outf.write(line)
                 total_lines += 1
-
-    print(f"Found {len(player_names)} players in {server}: {player_names}")
+            if len(heartbeats) > count:
+                log_ends.append((log_file.name, heartbeats[-1]))
+
+    with open(f"files/{server}/heartbeats.txt", "w", encoding="utf-8") as f:
+        f.writelines(f"{timestamp:.0f}\n" for timestamp in heartbeats)
+    with open(f"files/{server}/log_ends.txt", "w", encoding="utf-8") as f:
+        f.writelines(f"{name} {timestamp:.0f}\n" for name, timestamp in log_ends)
+
+    profiler.add(lines=total_lines, bytes_read=sum(f.stat().st_size for f in log_files))
+    print(
+        f"Found {len(line_filter.player_names)} players in {server}: "
+        f"{line_filter.player_names}"
+    )
     print(f"Wrote {total_lines} relevant lines for {server}")
 
 
 def main() -> None:
+    parser = argparse.ArgumentParser(description="Combine and filter server logs")
+    add_time_window_arguments(parser)
+    add_profile_argument(parser, "01")
+    args = parser.parse_args()
+    setup_profiling(args, "01")
+    # 02-create-dataframe.py replaces whole months, so it needs all their logs
+    since, until = widen_to_months(*get_time_window(args))
+
     servers = [
         d for d in os.listdir("files") if os.path.isdir(os.path.join("files", d))
     ]
+    identities = PlayerIdentities.load()
     for server in servers:
         print(f"\nProcessing server: {server}")
-        process_server(server)
+        with profiler.measure("server", server):
+            process_server(server, identities, since, until)
         print(f"Completed processing {server}")
+    identities.save()
+
+    profiler.finish()
 
 
 if __name__ == "__main__":
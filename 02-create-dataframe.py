@@ -1,326 +1,378 @@
-import json
+import argparse
 import os
 import re
-from datetime import datetime
 from pathlib import Path
-from zoneinfo import ZoneInfo
 
+import numpy as np
 import pandas as pd
 from tqdm import tqdm
 
-# Constants and patterns
-TIME_PATTERN = r"^(\d{4}-\d{2}-\d{2})-\d\.log\.gz: \[[^\[]*(\d{2}:\d{2}:\d{2}).*?\]"
-SERVER_DONE_PATTERN = r": Done \(\d.*help"
-PLAYER_JOIN_PATTERN = r"(\S+?)\[\S+\] logged in with entity id \d+ at"
-PLAYER_QUIT_PATTERN = r"(\S+?) lost connection: (.*)"
-PLAYER_CHAT_PATTERN = r": (\[Not Secure\] )?<(\S+)> (.*)"
-
-PLAYER_ADVANCEMENT_PATTERN = r"(\S+) has made the advancement \[(.*)\]"
-PLAYER_ADVANCEMENT_PATTERN_ALT = r"(\S+) has just earned the achievement \[(.*)\]"
-
-DEATH_MESSAGE_BASE = r"\]: (\S+) (.*)$"
-DEATH_EXCLUDE_PATTERNS = [
-    r"made the advancement",
-    r"has reached",
-    r"joined the game",
-    r"lost connection",
-    r"moved too quickly",
-    r"has completed",
-    r"has just earned",
-    r"moved wrongly",
-    r"issued server command",
-    r"was kicked",
-    r"is now sleeping",
-    r"forced -?\d+",
-    r"\(\d+",
-    r"is now AFK",
-    r"is no longer AFK",
-]
-DEATH_EXCLUDE_PATTERN = "|".join(DEATH_EXCLUDE_PATTERNS)
-
-PLAYER_UUID_MAPPING_PATTERN = (
-    r"UUID of player (\S+) is (\S{8}-\S{4}-\S{4}-\S{4}-\S{12})"
+from parsing import (
+    SINKS,
+    DeathClassifier,
+    EventBuffer,
+    EventBuffers,
+    NameIndex,
+    PlayerIdentities,
+    SinkDispatcher,
+    add_time_window_arguments,
+    classify_line,
+    find_activity_gaps,
+    find_uuid_mapping,
+    format_date,
+    get_time_window,
+    in_window,
+    load_advancement_files,
+    parse_timestamp,
+    repair_sessions,
+    widen_to_months,
 )
-PLAYER_UUID_MAPPING_PATTERN_ALT = (
-    r"config to (\S+) \((\S{8}-\S{4}-\S{4}-\S{4}-\S{12})\)"
-)
-
-PLAYER_KILLED_BY_PATTERN = r"was slain by (\S+)"
-
+from parsing.patterns import TIME_PATTERN
+from profiling import add_profile_argument, profiler, setup_profiling
+from stats.partitions import write_partitions
+
+
+def process_advancement_files(
+    server: str,
+    advancements: EventBuffer,
+    since: float | None = None,
+    until: float | None = None,
+) -> bool:
+    """Append (server, uuid, adv_name, timestamp) rows, or return False if directory doesn't exist"""
+    adv_dir = Path(f"files/{server}/advancements")
+    if not adv_dir.exists():
+        return False
 
-def parse_timestamp(timestr: str) -> float:
-    """Convert datetime string to Unix timestamp"""
-    if "+" in timestr:
-        dt = datetime.strptime(timestr, "%Y-%m-%d %H:%M:%S %z")
-    else:
-        dt = datetime.strptime(timestr, "%Y-%m-%d %H:%M:%S")
-        dt = dt.replace(tzinfo=ZoneInfo("Asia/Shanghai"))
-    return dt.timestamp()
+    for uuid, player_advancements in load_advancement_files(adv_dir).items():
+        for adv_name, complete_time in player_advancements:
+            if in_window(complete_time, since, until):
+                advancements.append(server, uuid, adv_name, complete_time)
 
+    return True
 
-def timestamp_to_year(ts: float) -> int:
-    """Convert Unix timestamp to year"""
-    return datetime.fromtimestamp(ts, tz=ZoneInfo("Asia/Shanghai")).year
 
+def load_heartbeats(
+    server: str, since: float | None = None, until: float | None = None
+) -> np.ndarray | None:
+    """Sorted times at which stage 1 saw the server log anything
 
-def process_advancement_files(server: str) -> list[tuple] | None:
-    """Returns a list of (server, uuid, adv_name, timestamp) tuples, or None if directory doesn't exist"""
-    adv_dir = Path(f"files/{server}/advancements")
-    if not adv_dir.exists():
+    Returns None for logs filtered before stage 1 recorded them.
+    """
+    path = Path(f"files/{server}/heartbeats.txt")
+    if not path.exists():
         return None
+    heartbeats = np.sort(np.array(path.read_text().split(), dtype=float))
+    start = 0 if since is None else np.searchsorted(heartbeats, since)
+    end = len(heartbeats) if until is None else np.searchsorted(heartbeats, until)
+    return heartbeats[start:end]
 
-    advancements = []
-    adv_files = list(adv_dir.glob("*.json"))
-    for adv_file in tqdm(adv_files, desc=f"Processing {server} advancements"):
-        uuid = adv_file.stem
-        with open(adv_file) as f:
-            data: dict[str, dict] = json.load(f)
-
-        for adv_name, details in tqdm(
-            data.items(), desc=f"Processing {uuid}", leave=False
-        ):
-            # Skip DataVersion, non-completed advancements, and recipe advancements
-            if (
-                adv_name == "DataVersion"
-                or not details.get("done", False)
-                or ":recipes/" in adv_name
-            ):
-                continue
-
-            times = [parse_timestamp(t) for t in details["criteria"].values()]
-            complete_time = max(times)
-            if timestamp_to_year(complete_time) == 2024:
-                advancements.append((server, uuid, adv_name, complete_time))
-
-    return advancements
 
+def load_previous_log_ends(server: str) -> dict[str, float] | None:
+    """Time of the last line of the log file before each log file, by name
 
-def get_uuid(player: str, uuids: dict[str, str]) -> str:
-    """Get UUID for player, with warning if not found"""
-    return uuids.get(player, player)
+    Returns None for logs filtered before stage 1 recorded them.
+    """
+    path = Path(f"files/{server}/log_ends.txt")
+    if not path.exists():
+        return None
+    previous_ends: dict[str, float] = {}
+    end: float | None = None
+    for line in path.read_text().splitlines():
+        name, timestamp = line.split()
+        if end is not None:
+            previous_ends[name] = end
+        end = float(timestamp)
+    return previous_ends
 
 
 def process_server_logs(
-    server: str, need_advancements: bool
-) -> tuple[list, list, list, list, float | None, list, list]:
-    """Returns lists of sessions, deaths, messages, server info, earliest_timestamp, advancements, and name mappings"""
+    server: str,
+    need_advancements: bool,
+    buffers: EventBuffers,
+    identities: PlayerIdentities,
+    sinks: SinkDispatcher,
+    since: float | None = None,
+    until: float | None = None,
+) -> tuple[str, float | None, float | None] | None:
+    """Append the server's events, uptime intervals and activity gaps to buffers
+
+    UUID mappings seen in the logs are recorded in identities, and session,
+    chat, death and command events are passed on to sinks.
+    Returns server info (server, earliest_timestamp, latest_timestamp), or None if no logs
+    """
     log_path = Path(f"files/{server}/filtered_logs.txt")
     if not log_path.exists():
-        return [], [], [], [], None, [], []
+        return None
 
-    sessions = []
-    deaths = []
-    messages = []
-    advancements = []
+    sessions = buffers.sessions
+    deaths = buffers.deaths
+    messages = buffers.messages
+    advancements = buffers.advancements
     current_sessions: dict[str, float] = {}
-    player_uuids: dict[str, str] = {}
+    classifier = DeathClassifier()
+    # Start of the current uptime interval and the last line seen in it
+    up_since: float | None = None
+    last_seen: float | None = None
+    # Most lines showing that the server is up were filtered in stage 1
+    heartbeats = load_heartbeats(server, since, until)
+    previous_log_ends = load_previous_log_ends(server)
+    names = NameIndex()
     earliest_timestamp: float | None = None
     latest_timestamp: float | None = None
-    name_mappings = []
 
-    # First pass - collect UUID mappings
+    # Lines start with the log file's date, which allows a cheap string
+    # comparison before any regex or timestamp parsing happens
+    since_date = format_date(since) if since is not None else None
+    until_date = format_date(until - 1) if until is not None else None
+
+    # First pass - collect time-versioned UUID mappings
     with open(log_path, "r", encoding="utf-8") as f:
         for line in f:
-            if uuid_match := re.search(PLAYER_UUID_MAPPING_PATTERN, line):
-                player, uuid = uuid_match.groups()
-                player_uuids[player] = uuid
-            elif uuid_match_alt := re.search(PLAYER_UUID_MAPPING_PATTERN_ALT, line):
-                player, uuid = uuid_match_alt.groups()
-                player_uuids[player] = uuid
-
-            # Add timestamp tracking for player names
-            time_match = re.search(TIME_PATTERN, line)
-            if time_match and (uuid_match or uuid_match_alt):
+            mapping = find_uuid_mapping(line)
+            if not mapping:
+                continue
+            player, uuid = mapping
+            mapped_at = None
+            if time_match := re.search(TIME_PATTERN, line):
                 date_str, time_str = time_match.groups()
-                timestamp = parse_timestamp(f"{date_str} {time_str}")
-                # Safe access to match groups
-                if uuid_match:
-                    player = uuid_match.group(1)
-                elif uuid_match_alt:
-                    player = uuid_match_alt.group(1)
-                else:
-                    assert False, "Should not reach here"
-                uuid = player_uuids[player]
-                name_mappings.append((uuid, player, timestamp))
-
-    def close_sessions(timestamp: float) -> None:
+                mapped_at = parse_timestamp(f"{date_str} {time_str}")
+            names.add(player, uuid, mapped_at)
+            if mapped_at is not None:
+                identities.observe(uuid, player, server, mapped_at)
+
+    # Players whose UUID lines predate these logs, e.g. in a windowed run
+    for player, uuid in identities.server_names(server).items():
+        if player not in names.starts:
+            names.add(player, uuid, None)
+
+    def end_session(
+        player: str, join_time: float, timestamp: float, closed_by: str
+    ) -> None:
+        uuid = names.resolve(player, join_time)
+        play_time = timestamp - join_time
+        sessions.append(server, uuid, join_time, play_time, closed_by)
+        for handler in sinks.session:
+            handler(server, uuid, join_time, play_time)
+
+    def last_up() -> float:
+        """Time of the last line of any kind in the final interval"""
+        if heartbeats is not None and len(heartbeats):
+            return max(last_seen, heartbeats[-1])
+        return last_seen
+
+    def end_before_boot(log_name: str) -> float:
+        """End of the current interval, given that a boot logged to log_name"""
+        # Startup lines before "Done" belong to the new run, so the interval
+        # ends with the last line of the previous log file
+        end = previous_log_ends.get(log_name) if previous_log_ends else None
+        if end is None or end < up_since:
+            return last_seen
+        return end
+
+    def close_sessions(timestamp: float, closed_by: str) -> None:
         for player, join_time in current_sessions.items():
-            play_time = timestamp - join_time
-            sessions.append(
-                (
-                    server,
-                    get_uuid(player, player_uuids),
-                    join_time,
-                    play_time,
-                )
-            )
+            end_session(player, join_time, timestamp, closed_by)
         current_sessions.clear()
 
     # Main processing pass
     total_lines = sum(1 for _ in open(log_path, "r", encoding="utf-8"))
+    profiler.add(lines=total_lines, bytes_read=log_path.stat().st_size)
     with open(log_path, "r", encoding="utf-8") as f:
         for line in tqdm(f, total=total_lines, desc=f"Processing {server} logs"):
+            line_date = line[:10]
+            if (since_date is not None and line_date < since_date) or (
+                until_date is not None and line_date > until_date
+            ):
+                continue
+
             time_match = re.search(TIME_PATTERN, line)
             if not time_match:
                 continue
 
             date_str, time_str = time_match.groups()
-            timestamp: float = parse_timestamp(f"{date_str} {time_str}")
+            line_timestamp = parse_timestamp(f"{date_str} {time_str}")
+            if not in_window(line_timestamp, since, until):
+                continue
+            timestamp: float = line_timestamp
 
             if earliest_timestamp is None or timestamp < earliest_timestamp:
                 earliest_timestamp = timestamp
             if latest_timestamp is None or timestamp > latest_timestamp:
                 latest_timestamp = timestamp  # Track latest timestamp
 
-            if re.search(SERVER_DONE_PATTERN, line):
-                close_sessions(timestamp)
+            kind, fields = classify_line(line, need_advancements) or (None, ())
+            if kind == "done":
+                close_sessions(timestamp, "restart")
+                if up_since is not None:
+                    end = end_before_boot(line.partition(": ")[0])
+                    buffers.uptime.append(server, up_since, end)
+                up_since = last_seen = timestamp
                 continue
 
-            # Process joins/quits/chat first
-            if join_match := re.search(PLAYER_JOIN_PATTERN, line):
-                player = join_match.group(1)
-                current_sessions[player] = timestamp
+            # Logs of a time window may start while the server is up
+            if up_since is None:
+                up_since = timestamp
+            last_seen = timestamp
 
-            elif quit_match := re.search(PLAYER_QUIT_PATTERN, line):
-                player = quit_match.group(1)
-                if player in current_sessions:
-                    join_time = current_sessions.pop(player)
-                    sessions.append(
-                        (
-                            server,
-                            get_uuid(player, player_uuids),
-                            join_time,
-                            timestamp - join_time,
-                        )
-                    )
+            if kind == "join":
+                current_sessions[fields[0]] = timestamp
 
-            elif msg_match := re.search(PLAYER_CHAT_PATTERN, line):
-                player = msg_match.group(2)
-                messages.append(
-                    (
-                        server,
-                        get_uuid(player, player_uuids),
-                        msg_match.group(3),
-                        timestamp,
+            elif kind == "quit":
+                player = fields[0]
+                if player in current_sessions:
+                    end_session(player, current_sessions.pop(player), timestamp, "quit")
+
+            elif kind == "chat":
+                player, content = fields
+                uuid = names.resolve(player, timestamp)
+                messages.append(server, uuid, content, timestamp)
+                for handler in sinks.chat:
+                    handler(server, uuid, content, timestamp)
+
+            elif kind == "command":
+                player, command = fields
+                for handler in sinks.command:
+                    handler(
+                        server, names.resolve(player, timestamp), command, timestamp
                     )
-                )
 
-            # Process advancements before deaths, but only if needed
-            elif need_advancements and (
-                adv_match := re.search(PLAYER_ADVANCEMENT_PATTERN, line)
-            ):
-                player, adv_name = adv_match.groups()
+            elif kind == "advancement":
+                player, adv_name = fields
                 if player in current_sessions:
                     advancements.append(
-                        (server, get_uuid(player, player_uuids), adv_name, timestamp)
+                        server, names.resolve(player, timestamp), adv_name, timestamp
                     )
-            elif need_advancements and (
-                adv_match := re.search(PLAYER_ADVANCEMENT_PATTERN_ALT, line)
-            ):
-                player, adv_name = adv_match.groups()
+
+            elif kind == "death":
+                player, message = fields
                 if player in current_sessions:
-                    advancements.append(
-                        (server, get_uuid(player, player_uuids), adv_name, timestamp)
-                    )
+                    # Killers that are players are stored by uuid
+                    cause, killer = classifier.classify(message)
+                    if killer in names.starts:
+                        killer = names.resolve(killer, timestamp)
+
+                    # "by" holds the killer of melee deaths, the message otherwise
+                    by = killer if cause == "slain" and killer else message
+                    uuid = names.resolve(player, timestamp)
+                    deaths.append(server, uuid, by, cause, killer, timestamp)
+                    for handler in sinks.death:
+                        handler(server, uuid, message, cause, timestamp)
+
+    # Every line may have been outside the time window
+    if current_sessions:
+        close_sessions(timestamp, "end")
+    if up_since is not None:
+        buffers.uptime.append(server, up_since, last_up())
+    # Filtered lines alone show long gaps whenever nobody does anything
+    if heartbeats is None:
+        print(f"No heartbeats for {server}, rerun stage 1 to cap crashed sessions")
+    else:
+        for gap_start in find_activity_gaps(heartbeats):
+            buffers.activity_gaps.append(server, gap_start)
+    return (server, earliest_timestamp, latest_timestamp)
 
-            # Process deaths last
-            elif death_match := re.search(DEATH_MESSAGE_BASE, line):
-                player, message = death_match.groups()
-                if player in current_sessions and not re.search(
-                    DEATH_EXCLUDE_PATTERN, message
-                ):
-                    killer_uuid = None
-                    if killer_match := re.search(PLAYER_KILLED_BY_PATTERN, message):
-                        killer_name = killer_match.group(1)
-                        killer_uuid = get_uuid(killer_name, player_uuids)
-
-                    deaths.append(
-                        (
-                            server,
-                            get_uuid(player, player_uuids),
-                            killer_uuid if killer_uuid else message,
-                            timestamp,
-                        )
-                    )
 
-    close_sessions(timestamp)
-    return (
-        sessions,
-        deaths,
-        messages,
-        [(server, earliest_timestamp, latest_timestamp)],
-        earliest_timestamp,
-        advancements,
-        name_mappings,
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Create dataframes from filtered logs")
+    add_time_window_arguments(parser)
+    parser.add_argument(
+        "--sinks",
+        nargs="*",
+        choices=sorted(SINKS),
+        default=["commands", "death_messages"],
+        help="Extra analyses to run during the parse pass "
+        "(default: commands death_messages, add sketches to build sketches)",
     )
+    add_profile_argument(parser, "02")
+    args = parser.parse_args()
+    setup_profiling(args, "02")
+    # Partitions and sketches are per month and replaced as a whole, so a
+    # run has to parse whole months to not lose the rest of one
+    since, until = widen_to_months(*get_time_window(args))
 
-
-def main() -> None:
     servers = [
         d for d in os.listdir("files") if os.path.isdir(os.path.join("files", d))
     ]
 
-    all_sessions = []
-    all_deaths = []
-    all_messages = []
-    all_advancements = []
+    buffers = EventBuffers()
+    identities = PlayerIdentities.load()
+    sinks = SinkDispatcher([SINKS[name]() for name in args.sinks])
     all_servers = []
-    all_name_mappings = []
 
     for server in servers:
         print(f"Processing {server}")
-        # Check if we need log-based advancements
-        file_advancements = process_advancement_files(server)
-        need_advancements = file_advancements is None
-
-        # Process logs
-        sessions, deaths, messages, servers, _, log_advancements, name_mappings = (
-            process_server_logs(server, need_advancements)
-        )
-
-        # Use file-based advancements if available, otherwise use log-based
-        if file_advancements is not None:
-            all_advancements.extend(file_advancements)
-        else:
-            all_advancements.extend(log_advancements)
+        with profiler.measure("server", server):
+            # File-based advancements are preferred; fall back to log-based ones
+            has_file_advancements = process_advancement_files(
+                server, buffers.advancements, since, until
+            )
+            need_advancements = not has_file_advancements
 
-        all_sessions.extend(sessions)
-        all_deaths.extend(deaths)
-        all_messages.extend(messages)
-        all_servers.extend(servers)
-        all_name_mappings.extend(name_mappings)
+            # Process logs
+            server_info = process_server_logs(
+                server, need_advancements, buffers, identities, sinks, since, until
+            )
+        if server_info is not None:
+            all_servers.append(server_info)
 
     # Convert to DataFrames at the end
-    Path("data").mkdir(exist_ok=True)
+    base_path = Path("data")
+    base_path.mkdir(exist_ok=True)
+
+    identities.save()
+    sinks.finish()
 
-    # Create player names DataFrame with latest names
+    # Create player names DataFrame with latest names from the identity table,
+    # keeping names written before the table existed
     names_df = pd.DataFrame(
-        all_name_mappings, columns=["uuid", "player_name", "timestamp"]
-    )
-    latest_names = (
-        names_df.sort_values("timestamp")
-        .groupby("uuid")
-        .last()
-        .reset_index()[["uuid", "player_name"]]
+        sorted(identities.latest_names().items()), columns=["uuid", "player_name"]
     )
-    latest_names.to_csv("data/player_names.csv", index=False)
+    names_path = base_path / "player_names.csv"
+    if names_path.exists():
+        names_df = pd.concat([pd.read_csv(names_path), names_df]).drop_duplicates(
+            subset=["uuid"], keep="last"
+        )
+    names_df.to_csv(names_path, index=False)
 
-    pd.DataFrame(
+    # Widen server lifetimes with those recorded by earlier runs
+    servers_df = pd.DataFrame(
         all_servers, columns=["server_name", "created_timestamp", "closed_timestamp"]
-    ).to_csv("data/servers.csv", index=False)
-    pd.DataFrame(
-        all_sessions, columns=["server_name", "uuid", "join_timestamp", "play_time"]
-    ).to_csv("data/sessions.csv", index=False)
-    pd.DataFrame(all_deaths, columns=["server_name", "uuid", "by", "timestamp"]).to_csv(
-        "data/deaths.csv", index=False
     )
-    pd.DataFrame(
-        all_messages, columns=["server_name", "uuid", "content", "timestamp"]
-    ).to_csv("data/messages.csv", index=False)
-    pd.DataFrame(
-        all_advancements,
-        columns=["server_name", "uuid", "advancement_name", "timestamp"],
-    ).to_csv("data/advancements.csv", index=False)
+    servers_path = base_path / "servers.csv"
+    if servers_path.exists():
+        servers_df = (
+            pd.concat([pd.read_csv(servers_path), servers_df])
+            .groupby("server_name", sort=False)
+            .agg(
+                created_timestamp=("created_timestamp", "min"),
+                closed_timestamp=("closed_timestamp", "max"),
+            )
+            .reset_index()
+        )
+    servers_df.to_csv(servers_path, index=False)
+
+    # Event tables are partitioned by server and month, so runs over other
+    # time windows don't overwrite each other
+    dfs = {
+        "sessions": buffers.sessions.to_dataframe(),
+        "deaths": buffers.deaths.to_dataframe(),
+        "messages": buffers.messages.to_dataframe(),
+        "advancements": buffers.advancements.to_dataframe(),
+        "uptime": buffers.uptime.to_dataframe(),
+    }
+
+    # Cap sessions left open by crashes
+    with profiler.measure("repair", "sessions"):
+        dfs["sessions"] = repair_sessions(
+            dfs["sessions"],
+            buffers.activity_gaps.to_dataframe(),
+            [dfs["messages"], dfs["deaths"], dfs["advancements"]],
+        )
+
+    with profiler.measure("write", "partitions"):
+        write_partitions(dfs, base_path)
+
+    profiler.finish()
 
 
 if __name__ == "__main__":
@@ -1,75 +1,109 @@
-from stats import (
-    get_active_players,
-    get_advancement_ranking,
-    get_chat_ranking,
-    get_chat_rate_ranking,
-    get_daily_playtime,
-    get_dangerous_server_ranking,
-    get_death_ranking,
-    get_death_rate_ranking,
-    get_hourly_playtime,
-    get_peak_concurrent_players,
-    get_playtime_ranking,
-    get_pvp_kill_ranking,
-    get_server_chat_ranking,
-    get_server_chat_rate_ranking,
-    get_server_player_list,  # Update this line
-    get_server_playtime_ranking,  # Add this import
-    get_server_timeline,
-    get_server_variety_ranking,
-    get_total_advancements,
-    get_total_deaths,
-    get_total_messages,
-    get_total_playtime,
-    get_weekday_playtime,
-)
-from stats.common import load_dataframes
+import argparse
+
+from profiling import add_profile_argument, profiler, setup_profiling
+from stats import sketches
+from stats.common import BACKENDS, load_backend
+
+
+def print_sketch_statistics() -> None:
+    """Print the stats that bounded-memory sketches can estimate"""
+    data = sketches.load_sketches()
+    if not data.partitions:
+        print("No sketches found, run 02-create-dataframe.py with --sinks sketches")
+        return
+
+    total_players = sketches.get_total_players(data)
+    print(f"\nDistinct Players (approximate): {total_players['total_players']}")
+
+    print("\nPlayers per Server (approximate):")
+    for stat in sketches.get_server_player_counts(data):
+        print(f"{stat['server_name']}: {stat['player_count']} players")
+
+    print("\nMost Server Variety:")
+    for rank in sketches.get_server_variety_ranking(data)[:10]:
+        print(f"{rank['player_name']}: {rank['server_count']} different servers")
+
+    print("\nMost Used Words (approximate):")
+    for word in sketches.get_top_words(data):
+        print(f"{word['word']}: {word['count']}")
 
 
 def main():
     """Main function to generate all statistics"""
-    dfs = load_dataframes()
+    parser = argparse.ArgumentParser(description="Print all statistics")
+    parser.add_argument(
+        "--backend",
+        choices=BACKENDS,
+        default="pandas",
+        help="compute stats with pandas or as SQL in an embedded database",
+    )
+    parser.add_argument(
+        "--sketches",
+        action="store_true",
+        help="only print stats estimated from sketches, without loading the tables",
+    )
+    add_profile_argument(parser, "03")
+    args = parser.parse_args()
+    setup_profiling(args, "03")
+
+    if args.sketches:
+        with profiler.measure("sketches", "all"):
+            print_sketch_statistics()
+        profiler.finish()
+        return
+
+    with profiler.measure("load", args.backend):
+        stats, data = load_backend(args.backend)
+    profiler.patch(stats)
 
     # Generate server timeline
-    timeline = get_server_timeline(dfs)
+    timeline = stats.get_server_timeline(data)
     print("\nServer Timeline:")
     for server in timeline:
         print(
             f"{server['server_name']}: created at {server['created_at']}, closed at {server['closed_at']}"
         )
 
+    # Generate server uptime
+    print("\nServer Uptime:")
+    for server in stats.get_server_uptime(data):
+        print(
+            f"{server['server_name']}: up {server['up_hours']} hours "
+            f"({server['uptime_percent']}% of its lifetime, {server['starts']} starts)"
+        )
+
     # Generate total playtime
-    total_play = get_total_playtime(dfs)
+    total_play = stats.get_total_playtime(data)
     print("\nTotal Server Playtime:")
     print(f"{total_play['total_hours']} hours ({total_play['total_days']} days)")
 
     # Generate active players list
-    active_players = get_active_players(dfs)
+    active_players = stats.get_active_players(data)
     print("\nActive Players:")
     print(f"Total: {len(active_players)} players")
     for player in active_players:
         print(f"- {player['player_name']}")
 
     # Generate playtime rankings
-    playtime_ranking = get_playtime_ranking(dfs)
+    playtime_ranking = stats.get_playtime_ranking(data)
     print("\nMost Active Players:")
     for rank in playtime_ranking[:10]:
         print(f"{rank['player_name']}: {rank['play_hours']} hours")
 
     # Generate server variety rankings
-    server_variety_ranking = get_server_variety_ranking(dfs)
+    server_variety_ranking = stats.get_server_variety_ranking(data)
     print("\nMost Server Variety:")
     for rank in server_variety_ranking[:10]:
         print(f"{rank['player_name']}: {rank['server_count']} different servers")
 
     # Generate death rankings
-    death_ranking = get_death_ranking(dfs)
+    death_ranking = stats.get_death_ranking(data)
     print("\nDeath Rankings:")
     for rank in death_ranking[:10]:
         print(f"{rank['player_name']}: {rank['deaths']} deaths")
 
     # Generate death rate rankings
-    death_rate_ranking = get_death_rate_ranking(dfs)
+    death_rate_ranking = stats.get_death_rate_ranking(data)
     print("\nDeath Rate Rankings (deaths per hour):")
     for rank in death_rate_ranking[:10]:
         print(
@@ -78,7 +112,7 @@ def main():
         )
 
     # Generate dangerous server rankings
-    dangerous_servers = get_dangerous_server_ranking(dfs)
+    dangerous_servers = stats.get_dangerous_server_ranking(data)
     print("\nMost Dangerous Servers (deaths per hour):")
     for rank in dangerous_servers:
         print(
@@ -87,13 +121,13 @@ def main():
         )
 
     # Generate chat rankings
-    chat_ranking = get_chat_ranking(dfs)
+    chat_ranking = stats.get_chat_ranking(data)
     print("\nMost Talkative Players:")
     for rank in chat_ranking[:10]:
         print(f"{rank['player_name']}: {rank['messages']} messages")
 
     # Generate chat rate rankings
-    chat_rate_ranking = get_chat_rate_ranking(dfs)
+    chat_rate_ranking = stats.get_chat_rate_ranking(data)
     print("\nChattiest Players (messages per hour):")
     for rank in chat_rate_ranking[:10]:
         print(
@@ -102,13 +136,13 @@ def main():
         )
 
     # Generate server chat rankings
-    server_chat_ranking = get_server_chat_ranking(dfs)
+    server_chat_ranking = stats.get_server_chat_ranking(data)
     print("\nMost Talkative Servers:")
     for rank in server_chat_ranking:
         print(f"{rank['server_name']}: {rank['messages']} messages")
 
     # Generate server chat rate rankings
-    server_chat_rate_ranking = get_server_chat_rate_ranking(dfs)
+    server_chat_rate_ranking = stats.get_server_chat_rate_ranking(data)
     print("\nNoisiest Servers (messages per hour):")
     for rank in server_chat_rate_ranking:
         print(
@@ -116,35 +150,59 @@ def main():
             f"({rank['total_messages']} messages in {rank['play_hours']} hours)"
         )
 
+    # Generate chat word and phrase frequencies
+    print("\nMost Used Words:")
+    for word in stats.get_top_words(data):
+        print(f"{word['word']}: {word['count']}")
+
+    print("\nMost Used Phrases:")
+    for phrase in stats.get_top_phrases(data):
+        print(f"{phrase['phrase']}: {phrase['count']}")
+
+    print("\nFavourite Words per Server:")
+    for server in stats.get_server_top_words(data):
+        words = ", ".join(word["word"] for word in server["words"][:5])
+        print(f"{server['server_name']}: {words}")
+
+    print("\nFavourite Words per Player:")
+    for player in stats.get_player_top_words(data):
+        words = ", ".join(word["word"] for word in player["words"][:5])
+        print(f"{player['player_name']}: {words}")
+
     # Generate PvP kill rankings
-    pvp_kill_ranking = get_pvp_kill_ranking(dfs)
+    pvp_kill_ranking = stats.get_pvp_kill_ranking(data)
     print("\nTop PvP Killers:")
     for rank in pvp_kill_ranking[:10]:
         print(f"{rank['player_name']}: {rank['kills']} kills")
 
     # Generate advancement rankings
-    advancement_ranking = get_advancement_ranking(dfs)
+    advancement_ranking = stats.get_advancement_ranking(data)
     print("\nMost Achievements Earned:")
     for rank in advancement_ranking[:10]:
         print(f"{rank['player_name']}: {rank['advancements']} advancements")
 
     # Generate total advancements count
-    total_advancements = get_total_advancements(dfs)
+    total_advancements = stats.get_total_advancements(data)
     print(f"\nTotal Advancements Earned: {total_advancements['total_advancements']}")
 
     # Generate total deaths count
-    total_deaths = get_total_deaths(dfs)
+    total_deaths = stats.get_total_deaths(data)
     print(f"\nTotal Deaths: {total_deaths['total_deaths']}")
 
+    # Generate deaths by cause
+    print("\nDeaths by Cause:")
+    for cause in stats.get_deaths_by_cause(data):
+        print(f"{cause['cause']}: {cause['deaths']} deaths")
+
     # Generate server player counts
-    server_players = get_server_player_list(dfs)
+    server_players = stats.get_server_player_list(data)
     print("\nPlayers per Server:")
     for stat in server_players:
         print(f"\n{stat['server_name']}: {stat['player_count']} players")
         print("Players:", ", ".join(stat["player_list"]))
 
     # Generate peak concurrent players
-    peak_concurrent = get_peak_concurrent_players(dfs)
+    peak_concurrent = stats.get_peak_concurrent_players(data)
     print("\nPeak Concurrent Players by Server:")
     for stat in peak_concurrent:
         print(f"\n{stat['server_name']}:")
@@ -152,29 +210,42 @@ def main():
         print("Players online:", ", ".join(stat["player_list"]))
 
     # Calculate total messages sent
-    total_messages = get_total_messages(dfs)
+    total_messages = stats.get_total_messages(data)
     print(f"\nTotal Messages Sent: {total_messages['total_messages']}")
 
     # Generate daily playtime statistics
-    daily_playtime = get_daily_playtime(dfs)
+    daily_playtime = stats.get_daily_playtime(data)
     print("\nDaily Playtime Sample (first 5 days):")
     for day in daily_playtime[:5]:
         print(f"{day['date']}: {day['play_hours']} hours")
 
     # Generate weekday playtime statistics
-    weekday_playtime = get_weekday_playtime(dfs)
+    weekday_playtime = stats.get_weekday_playtime(data)
     print("\nPlaytime by Day of Week:")
     for day in weekday_playtime:
         print(f"{day['weekday']}: {day['play_hours']} hours")
 
     # Generate hourly playtime statistics
-    hourly_playtime = get_hourly_playtime(dfs)
+    hourly_playtime = stats.get_hourly_playtime(data)
     print("\nPlaytime by Hour of Day:")
     for hour in hourly_playtime:
         print(f"{hour['hour']}: {hour['play_hours']} hours")
 
+    # Generate per-server and per-player time distributions
+    print("\nBusiest Hour per Server:")
+    for server in stats.get_server_hourly_playtime(data):
+        hours = server["play_hours"]
+        busiest = hours.index(max(hours))
+        print(f"{server['server_name']}: {busiest:02d}:00 ({hours[busiest]} hours)")
+
+    print("\nFavourite Weekday per Player:")
+    for player in stats.get_player_weekday_playtime(data):
+        days = player["play_hours"]
+        favourite = max(days, key=days.get)
+        print(f"{player['player_name']}: {favourite} ({days[favourite]} hours)")
+
     # Generate server playtime rankings
-    server_playtime = get_server_playtime_ranking(dfs)
+    server_playtime = stats.get_server_playtime_ranking(data)
     print("\nServer Playtime Rankings:")
     for rank in server_playtime:
         print(
@@ -182,6 +253,18 @@ def main():
             f"({rank['play_days']} days)"
         )
 
+    # Generate year-over-year summary
+    yearly_summary = stats.get_yearly_summary(data)
+    print("\nYear over Year:")
+    for year in yearly_summary:
+        print(
+            f"{year['year']}: {year['play_hours']} hours, {year['players']} players, "
+            f"{year['messages']} messages, {year['deaths']} deaths, "
+            f"{year['advancements']} advancements"
+        )
+
+    profiler.finish()
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,44 @@
+import json
+import sys
+
+import stats
+from stats import sql
+from stats.common import load_dataframes
+from stats.registry import REGISTRY
+from stats.sql.database import duckdb
+
+
+def normalize(result):
+    """Make results comparable regardless of numpy types and tie ordering"""
+    rows = json.loads(json.dumps(result, default=lambda x: x.item()))
+    if isinstance(rows, list):
+        return sorted(json.dumps(row, sort_keys=True) for row in rows)
+    return rows
+
+
+def main() -> None:
+    engines = ["sqlite"] + (["duckdb"] if duckdb is not None else [])
+    connections = {engine: sql.load_database(engine) for engine in engines}
+
+    failures = 0
+    for name in stats.__all__:
+        result = getattr(stats, name)(load_dataframes())
+        # The declared columns are what the registry and HTTP API advertise
+        if problem := REGISTRY[name].check_output(result):
+            failures += 1
+            print(f"FAIL output {name}: {problem}")
+        expected = normalize(result)
+        for engine, conn in connections.items():
+            actual = normalize(getattr(sql, name)(conn))
+            if actual == expected:
+                print(f"OK   {engine:6} {name}")
+            else:
+                failures += 1
+                print(f"FAIL {engine:6} {name}")
+
+    print(f"\n{failures} mismatches")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,6 @@
+import argparse
 import os
+from pathlib import Path
 
 from overall_frames import (
     active_players,
@@ -24,10 +26,40 @@ from overall_frames import (
     total_playtime,
     variety_ranking,
 )
+from overall_frames.build import FrameBuilder
+from overall_frames.figures import FigureRenderer
+from profiling import add_profile_argument, profiler, setup_profiling
 from stats.common import load_dataframes
 
 FRAMES_DIR = "representation-overall/frames"
 FIGURES_DIR = "representation-overall/figures"
+MANIFEST_PATH = Path("representation-overall/build-manifest.json")
+
+# Frame modules in report order
+FRAMES = [
+    timeline,
+    active_players,
+    server_players,
+    variety_ranking,
+    total_playtime,
+    server_playtime,
+    playtime_ranking,
+    daily_playtime,
+    time_distribution,
+    peak_players,
+    total_deaths,
+    death_ranking,
+    death_rate_ranking,
+    dangerous_servers,
+    pvp_ranking,
+    total_advancements,
+    advancement_ranking,
+    total_messages,
+    chat_ranking,
+    chat_rate_ranking,
+    server_chat_ranking,
+    server_chat_rate_ranking,
+]
 
 
 def ensure_dirs():
@@ -36,42 +68,41 @@ def ensure_dirs():
         os.makedirs(dir_path, exist_ok=True)
 
 
+def load_tables(tables: list[str]):
+    with profiler.measure("load", "dataframes"):
+        return load_dataframes(tables=tables)
+
+
 def main():
     """Main function to generate all TeX files"""
-    dfs = load_dataframes()
+    parser = argparse.ArgumentParser(description="Write the overall report frames")
+    parser.add_argument(
+        "--force", action="store_true", help="rebuild frames even if unchanged"
+    )
+    add_profile_argument(parser, "04")
+    args = parser.parse_args()
+    setup_profiling(args, "04")
+
+    # Time every frame and the stats it calls
+    for module in FRAMES:
+        profiler.patch(module)
 
     # Ensure directories exist first
     ensure_dirs()
 
-    # Generate all frames
-    timeline.create_figure(dfs, FIGURES_DIR)
-    timeline.write_frame(FRAMES_DIR)
-    active_players.write_frame(dfs, FRAMES_DIR)
-    server_players.write_frame(dfs, FRAMES_DIR)
-    variety_ranking.write_frame(dfs, FRAMES_DIR)
-    total_playtime.write_frame(dfs, FRAMES_DIR)
-    server_playtime.write_frame(dfs, FRAMES_DIR)
-    playtime_ranking.write_frame(dfs, FRAMES_DIR)
-    daily_playtime.create_figure(dfs, FIGURES_DIR)
-    daily_playtime.write_frame(FRAMES_DIR)
-    time_distribution.create_weekday_figure(dfs, FIGURES_DIR)
-    time_distribution.create_hourly_figure(dfs, FIGURES_DIR)
-    time_distribution.write_frames(FRAMES_DIR)
+    # Generate frames whose inputs or code changed since the last run
+    with FigureRenderer() as renderer:
+        builder = FrameBuilder(
+            FRAMES_DIR,
+            FIGURES_DIR,
+            MANIFEST_PATH,
+            load_tables,
+            renderer,
+            force=args.force,
+        )
+        builder.build(FRAMES)
 
-    # Update peak players to only write frame
-    peak_players.write_frame(dfs, FRAMES_DIR)
-    total_deaths.write_frame(dfs, FRAMES_DIR)
-    death_ranking.write_frame(dfs, FRAMES_DIR)
-    death_rate_ranking.write_frame(dfs, FRAMES_DIR)
-    dangerous_servers.write_frame(dfs, FRAMES_DIR)
-    pvp_ranking.write_frame(dfs, FRAMES_DIR)
-    total_advancements.write_frame(dfs, FRAMES_DIR)
-    advancement_ranking.write_frame(dfs, FRAMES_DIR)
-    total_messages.write_frame(dfs, FRAMES_DIR)
-    chat_ranking.write_frame(dfs, FRAMES_DIR)
-    chat_rate_ranking.write_frame(dfs, FRAMES_DIR)
-    server_chat_ranking.write_frame(dfs, FRAMES_DIR)
-    server_chat_rate_ranking.write_frame(dfs, FRAMES_DIR)
+    profiler.finish()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,160 @@
+import argparse
+import asyncio
+import json
+import os
+import signal
+import time
+from pathlib import Path
+
+from parsing import (
+    DeathClassifier,
+    LiveServer,
+    LiveTotals,
+    PlayerIdentities,
+    SinkDispatcher,
+    follow,
+)
+
+
+def live_snapshot(servers: list[LiveServer], totals: LiveTotals, now: float) -> dict:
+    """Online players and running totals, counting open sessions up to now"""
+    play_time = totals.play_time.copy()
+    for live in servers:
+        for player in live.online_players():
+            play_time[(live.server, player["uuid"])] += now - player["join_timestamp"]
+
+    names = {
+        uuid: player
+        for live in servers
+        for player, uuids in live.names.uuids.items()
+        for uuid in uuids
+    }
+    keys = play_time.keys() | totals.messages.keys() | totals.deaths.keys()
+    players = [
+        {
+            "server_name": server,
+            "uuid": uuid,
+            "player_name": names.get(uuid, uuid),
+            "sessions": totals.sessions[(server, uuid)],
+            "play_time": round(play_time[(server, uuid)], 1),
+            "messages": totals.messages[(server, uuid)],
+            "deaths": totals.deaths[(server, uuid)],
+        }
+        for server, uuid in keys
+    ]
+    players.sort(key=lambda x: (x["server_name"], -x["play_time"], x["player_name"]))
+    return {
+        "updated_timestamp": now,
+        "servers": [
+            {
+                "server_name": live.server,
+                "up_since": live.up_since,
+                "online": live.online_players(),
+            }
+            for live in servers
+        ],
+        "players": players,
+    }
+
+
+def write_snapshot(snapshot: dict, path: Path) -> None:
+    # Readers never see a half-written file
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_suffix(".tmp")
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(snapshot, f, ensure_ascii=False, indent=2)
+    os.replace(temp_path, path)
+
+
+async def tail_server(
+    live: LiveServer, path: Path, poll_interval: float, from_start: bool
+) -> None:
+    async for line in follow(path, poll_interval, from_start):
+        live.feed(line, time.time())
+
+
+async def report(
+    servers: list[LiveServer], totals: LiveTotals, output: Path, interval: float
+) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        snapshot = live_snapshot(servers, totals, time.time())
+        write_snapshot(snapshot, output)
+        online = sum(len(server["online"]) for server in snapshot["servers"])
+        print(
+            f"{time.strftime('%H:%M:%S')} {online} players online, "
+            f"{sum(totals.messages.values())} messages, "
+            f"{sum(totals.sessions.values())} finished sessions"
+        )
+
+
+async def run(
+    servers: list[LiveServer],
+    totals: LiveTotals,
+    args: argparse.Namespace,
+) -> None:
+    tasks = [
+        tail_server(
+            live,
+            Path(f"files/{live.server}/logs/latest.log"),
+            args.poll_interval,
+            not args.from_end,
+        )
+        for live in servers
+    ]
+    await asyncio.gather(
+        *tasks, report(servers, totals, args.output, args.report_interval)
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Follow every server's latest.log and keep live stats"
+    )
+    parser.add_argument(
+        "--servers", nargs="*", help="servers to follow (default: all in files/)"
+    )
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=1.0,
+        help="seconds between checks for new lines",
+    )
+    parser.add_argument(
+        "--report-interval",
+        type=float,
+        default=10.0,
+        help="seconds between snapshots",
+    )
+    parser.add_argument("--output", type=Path, default=Path("data/live.json"))
+    parser.add_argument(
+        "--from-end",
+        action="store_true",
+        help="skip what latest.log already has, so players online now are missed",
+    )
+    args = parser.parse_args()
+
+    server_names = args.servers or sorted(
+        d for d in os.listdir("files") if os.path.isdir(os.path.join("files", d))
+    )
+    identities = PlayerIdentities.load()
+    totals = LiveTotals()
+    sinks = SinkDispatcher([totals])
+    classifier = DeathClassifier()
+    servers = [
+        LiveServer(server, sinks, identities, classifier) for server in server_names
+    ]
+
+    # Stopping as a service does the same as Ctrl+C
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    print(f"Following {len(servers)} servers, Ctrl+C to stop")
+    try:
+        asyncio.run(run(servers, totals, args))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        write_snapshot(live_snapshot(servers, totals, time.time()), args.output)
+
+
+if __name__ == "__main__":
+    main()
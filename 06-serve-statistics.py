@@ -0,0 +1,100 @@
+import argparse
+import json
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+import stats
+from stats.registry import REGISTRY
+from stats.service import StatsCache
+
+
+class StatsHandler(BaseHTTPRequestHandler):
+    """GET /stats lists the stats, GET /stats/<name>?arg=value returns one as JSON"""
+
+    cache: StatsCache
+
+    def send_json(
+        self, status: HTTPStatus, body: bytes, etag: str | None = None
+    ) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        if etag is not None:
+            self.send_header("ETag", etag)
+            # Clients may keep results, but must revalidate them
+            self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_error_json(self, status: HTTPStatus, message: str) -> None:
+        self.send_json(status, json.dumps({"error": message}).encode())
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        parts = [part for part in url.path.split("/") if part]
+        if parts == ["stats"]:
+            listing = [
+                {
+                    "name": name,
+                    "description": (function.__doc__ or "").split("\n")[0],
+                    "arguments": {
+                        key: parameter.default
+                        for key, parameter in self.cache.parameters(name).items()
+                    },
+                    "columns": REGISTRY[name].output,
+                }
+                for name, function in self.cache.functions.items()
+            ]
+            self.send_json(HTTPStatus.OK, json.dumps(listing).encode())
+            return
+        if len(parts) != 2 or parts[0] != "stats":
+            self.send_error_json(HTTPStatus.NOT_FOUND, f"No such path {url.path}")
+            return
+
+        name = parts[1]
+        if name not in self.cache.functions:
+            self.send_error_json(HTTPStatus.NOT_FOUND, f"No such stat {name}")
+            return
+        # Results only change with the data, so a current ETag needs no work
+        version, _ = self.cache.refresh()
+        if self.headers.get("If-None-Match") == f'"{version}"':
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header("ETag", f'"{version}"')
+            self.end_headers()
+            return
+        try:
+            version, body = self.cache.get(name, dict(parse_qsl(url.query)))
+        except ValueError as e:
+            self.send_error_json(HTTPStatus.BAD_REQUEST, str(e))
+            return
+        self.send_json(HTTPStatus.OK, body, f'"{version}"')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve the statistics as JSON")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument(
+        "--check-interval",
+        type=float,
+        default=1.0,
+        help="seconds between checks of data/ for changed files",
+    )
+    args = parser.parse_args()
+
+    StatsHandler.cache = StatsCache(stats, args.check_interval)
+    # Load the tables before the first request
+    StatsHandler.cache.refresh()
+    server = ThreadingHTTPServer((args.host, args.port), StatsHandler)
+    print(f"Serving statistics on http://{args.host}:{args.port}/stats")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
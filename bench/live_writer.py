@@ -0,0 +1,109 @@
+import argparse
+import gzip
+import heapq
+import random
+import shutil
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Iterator, TextIO
+from zoneinfo import ZoneInfo
+
+from .synthetic import ServerSimulation, make_players
+
+# Log times are read as UTC+8, whatever the machine's time zone is
+LOG_TIMEZONE = ZoneInfo("Asia/Shanghai")
+
+
+def server_events(
+    simulation: ServerSimulation, server_idx: int, start: datetime, days: int
+) -> Iterator[tuple[datetime, int, str | None]]:
+    """Simulated (time, server_idx, text) events, text None where a new run starts"""
+    for day_offset in range(days):
+        for run in simulation.simulate_day(start + timedelta(days=day_offset)):
+            if run:
+                yield run[0][0], server_idx, None
+                for at, text in run:
+                    yield at, server_idx, text
+
+
+class LatestLog:
+    """latest.log of one fake server, rotated to a .log.gz as the real server does"""
+
+    def __init__(self, log_dir: Path) -> None:
+        self.log_dir = log_dir
+        self.path = log_dir / "latest.log"
+        self.file: TextIO | None = None
+        log_dir.mkdir(parents=True, exist_ok=True)
+
+    def rotate(self) -> None:
+        if self.file is not None:
+            self.file.close()
+        if self.path.exists():
+            date = datetime.fromtimestamp(
+                self.path.stat().st_mtime, tz=LOG_TIMEZONE
+            ).strftime("%Y-%m-%d")
+            index = 1
+            while (archive := self.log_dir / f"{date}-{index}.log.gz").exists():
+                index += 1
+            with open(self.path, "rb") as src, gzip.open(archive, "wb") as dst:
+                shutil.copyfileobj(src, dst)
+            self.path.unlink()
+        self.file = open(self.path, "w", encoding="utf-8")
+
+    def write(self, text: str) -> None:
+        if self.file is None:
+            self.rotate()
+        self.file.write(f"[{datetime.now(LOG_TIMEZONE):%H:%M:%S}] {text}\n")
+        self.file.flush()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Append simulated events to files/<server>/logs/latest.log in real time"
+    )
+    parser.add_argument("root", type=Path, help="directory to create files/ in")
+    parser.add_argument("--servers", type=int, default=3)
+    parser.add_argument("--players", type=int, default=40)
+    parser.add_argument("--days", type=int, default=1)
+    parser.add_argument("--sessions-per-day", type=int, default=20)
+    parser.add_argument("--events-per-session", type=int, default=30)
+    parser.add_argument("--noise-ratio", type=float, default=1.0)
+    parser.add_argument(
+        "--speed", type=float, default=600.0, help="simulated seconds per second"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    players = make_players(rng, args.players)
+    start = datetime.combine(datetime.now().date(), datetime.min.time())
+    streams = []
+    logs = []
+    for server_idx in range(args.servers):
+        simulation = ServerSimulation(
+            rng,
+            players,
+            args.sessions_per_day,
+            args.events_per_session,
+            args.noise_ratio,
+        )
+        logs.append(LatestLog(args.root / "files" / f"server{server_idx}" / "logs"))
+        streams.append(server_events(simulation, server_idx, start, args.days))
+
+    # Lines carry the time they are written at, the simulated times only pace them
+    real_start = time.monotonic()
+    for at, server_idx, text in heapq.merge(*streams, key=lambda event: event[0]):
+        delay = (at - start).total_seconds() / args.speed - (
+            time.monotonic() - real_start
+        )
+        if delay > 0:
+            time.sleep(delay)
+        if text is None:
+            logs[server_idx].rotate()
+        else:
+            logs[server_idx].write(text)
+
+
+if __name__ == "__main__":
+    main()
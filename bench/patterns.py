@@ -0,0 +1,217 @@
+import argparse
+import random
+import re
+import sys
+import time
+from datetime import datetime
+from typing import Callable
+
+from parsing import patterns
+
+from .synthetic import ServerSimulation, make_players
+
+Extractor = Callable[[str], tuple | None]
+
+
+def regex_extractor(pattern: str) -> Extractor:
+    """re.search with the pattern string, as 02-create-dataframe.py does"""
+
+    def extract(line: str) -> tuple | None:
+        match = re.search(pattern, line)
+        return match.groups() if match else None
+
+    return extract
+
+
+def compiled_extractor(pattern: str, guard: str | None = None) -> Extractor:
+    """Precompiled search, skipped when a literal the pattern requires is absent"""
+    search = re.compile(pattern).search
+
+    if guard is None:
+
+        def extract(line: str) -> tuple | None:
+            match = search(line)
+            return match.groups() if match else None
+
+    else:
+
+        def extract(line: str) -> tuple | None:
+            if guard not in line:
+                return None
+            match = search(line)
+            return match.groups() if match else None
+
+    return extract
+
+
+# The leftmost match of a leading (\S+?) always starts at a token boundary,
+# so (?<!\S) gives identical groups without retrying from inside tokens
+CANDIDATES: dict[str, dict[str, Extractor]] = {
+    "TIME_PATTERN": {
+        "current": regex_extractor(patterns.TIME_PATTERN),
+        "compiled": compiled_extractor(patterns.TIME_PATTERN),
+    },
+    "SERVER_DONE_PATTERN": {
+        "current": regex_extractor(patterns.SERVER_DONE_PATTERN),
+        "guarded": compiled_extractor(patterns.SERVER_DONE_PATTERN, ": Done ("),
+    },
+    "PLAYER_JOIN_PATTERN": {
+        "current": regex_extractor(patterns.PLAYER_JOIN_PATTERN),
+        "guarded": compiled_extractor(
+            patterns.PLAYER_JOIN_PATTERN, "] logged in with entity id "
+        ),
+        "token-start": compiled_extractor(
+            r"(?<!\S)(\S+?)\[\S+\] logged in with entity id \d+ at",
+            "] logged in with entity id ",
+        ),
+    },
+    "PLAYER_QUIT_PATTERN": {
+        "current": regex_extractor(patterns.PLAYER_QUIT_PATTERN),
+        "guarded": compiled_extractor(
+            patterns.PLAYER_QUIT_PATTERN, " lost connection: "
+        ),
+        "token-start": compiled_extractor(
+            r"(?<!\S)(\S+?) lost connection: (.*)", " lost connection: "
+        ),
+    },
+    "PLAYER_CHAT_PATTERN": {
+        "current": regex_extractor(patterns.PLAYER_CHAT_PATTERN),
+        "guarded": compiled_extractor(patterns.PLAYER_CHAT_PATTERN, "> "),
+    },
+    "PLAYER_ADVANCEMENT_PATTERN": {
+        "current": regex_extractor(patterns.PLAYER_ADVANCEMENT_PATTERN),
+        "guarded": compiled_extractor(
+            patterns.PLAYER_ADVANCEMENT_PATTERN, " has made the advancement ["
+        ),
+        "token-start": compiled_extractor(
+            r"(?<!\S)(\S+) has made the advancement \[(.*)\]",
+            " has made the advancement [",
+        ),
+    },
+    "DEATH_MESSAGE_BASE": {
+        "current": regex_extractor(patterns.DEATH_MESSAGE_BASE),
+        "guarded": compiled_extractor(patterns.DEATH_MESSAGE_BASE, "]: "),
+    },
+    "DEATH_EXCLUDE_PATTERN": {
+        "current": regex_extractor(f"({patterns.DEATH_EXCLUDE_PATTERN})"),
+        "compiled": compiled_extractor(f"({patterns.DEATH_EXCLUDE_PATTERN})"),
+    },
+    "PLAYER_UUID_MAPPING_PATTERN": {
+        "current": regex_extractor(patterns.PLAYER_UUID_MAPPING_PATTERN),
+        "guarded": compiled_extractor(
+            patterns.PLAYER_UUID_MAPPING_PATTERN, "UUID of player "
+        ),
+    },
+}
+
+
+def realistic_lines(count: int, seed: int = 0) -> list[str]:
+    """Lines shaped like filtered_logs.txt, taken from the synthetic generator"""
+    rng = random.Random(seed)
+    simulation = ServerSimulation(
+        rng,
+        make_players(rng, 30),
+        sessions_per_day=40,
+        events_per_session=40,
+        noise_ratio=0.5,
+    )
+    lines: list[str] = []
+    day = datetime(2024, 1, 1)
+    while len(lines) < count:
+        for run in simulation.simulate_day(day):
+            lines.extend(
+                f"{day:%Y-%m-%d}-1.log.gz: [{at:%H:%M:%S}] {text}\n" for at, text in run
+            )
+        day = day.replace(day=day.day % 28 + 1)
+    return lines[:count]
+
+
+def pathological_lines(length: int = 1000) -> list[str]:
+    """Long lines that make unanchored patterns backtrack"""
+    prefix = "2024-01-01-1.log.gz: [12:00:00] [Server thread/INFO]: "
+    token = "a" * length
+    return [
+        prefix + token + "\n",
+        prefix + token + " logged in with entity id 1 at\n",
+        prefix + token + "[" + "b" * length + " logged in\n",
+        prefix + "x[" * (length // 2) + "] logged in with entity id 12 at (0, 0, 0)\n",
+        prefix + "a[b]c[d] logged in with entity id 5 at (0, 0, 0)\n",
+        prefix + token + " lost connection" + ": " * (length // 4) + "\n",
+        prefix + "<Steve> " + "哈" * length + "\n",
+        prefix + "]: " * (length // 3) + "\n",
+        prefix + " ".join(["Steve"] * (length // 6)) + " has made the advancement\n",
+        prefix + "Steve was slain by " + "Zombie " * (length // 7) + "\n",
+        "2024-01-01-1.log.gz: [" + "[" * length + "12:00:00]\n",
+    ]
+
+
+def check_identical(
+    name: str, extractors: dict[str, Extractor], lines: list[str]
+) -> list[str]:
+    """Lines on which a candidate extracts something else than the current pattern"""
+    current = extractors["current"]
+    expected = [current(line) for line in lines]
+    mismatches = []
+    for candidate, extract in extractors.items():
+        for line, groups in zip(lines, expected):
+            actual = extract(line)
+            if actual != groups:
+                mismatches.append(
+                    f"{name}/{candidate} differs on {line[:120]!r}: "
+                    f"{actual!r} != {groups!r}"
+                )
+    return mismatches
+
+
+def time_extractor(extract: Extractor, lines: list[str], repeat: int) -> float:
+    """Best-of-repeat seconds to run extract over every line"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for line in lines:
+            extract(line)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark stage-2 regex patterns")
+    parser.add_argument("--lines", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--long-line-length", type=int, default=1000)
+    parser.add_argument("--pattern", action="append", help="only these patterns")
+    args = parser.parse_args()
+
+    corpora = {
+        "realistic": realistic_lines(args.lines),
+        "pathological": pathological_lines(args.long_line_length),
+    }
+
+    failed = False
+    for name, extractors in CANDIDATES.items():
+        if args.pattern and name not in args.pattern:
+            continue
+        print(f"\n{name}")
+        for corpus_name, lines in corpora.items():
+            mismatches = check_identical(name, extractors, lines)
+            if mismatches:
+                failed = True
+                for mismatch in mismatches:
+                    print(f"  MISMATCH {mismatch}")
+                continue
+            seconds = {
+                candidate: time_extractor(extract, lines, args.repeat)
+                for candidate, extract in extractors.items()
+            }
+            for candidate, elapsed in seconds.items():
+                print(
+                    f"  {corpus_name:12} {candidate:12} "
+                    f"{elapsed / len(lines) * 1e9:12.0f} ns/line "
+                    f"{seconds['current'] / elapsed:8.2f}x"
+                )
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+import argparse
+import gzip
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from .synthetic import add_generator_arguments, generate_from_args
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+STAGES = [
+    "01-combine-and-filter-logs.py",
+    "02-create-dataframe.py",
+    "03-print-statistics.py",
+    "04-write-overall-representation.py",
+]
+
+
+def count_input(stage: str, workdir: Path) -> tuple[int, int]:
+    """Returns (lines, bytes) of the input a stage reads"""
+    files = workdir / "files"
+    if stage.startswith("01"):
+        lines = total_bytes = 0
+        for path in files.glob("*/logs/*.log.gz"):
+            total_bytes += path.stat().st_size
+            with gzip.open(path, "rb") as f:
+                lines += sum(1 for _ in f)
+        return lines, total_bytes
+    if stage.startswith("02"):
+        paths = list(files.glob("*/filtered_logs.txt"))
+        paths += list(files.glob("*/advancements/*.json"))
+    else:
+        paths = list((workdir / "data").rglob("*.csv"))
+    lines = total_bytes = 0
+    for path in paths:
+        total_bytes += path.stat().st_size
+        with open(path, "rb") as f:
+            lines += sum(1 for _ in f)
+    return lines, total_bytes
+
+
+def run_stage(stage: str, workdir: Path, extra_args: list[str]) -> dict:
+    """Run one pipeline stage in a subprocess, measuring time and peak RSS"""
+    lines, total_bytes = count_input(stage, workdir)
+    env = dict(os.environ, PYTHONPATH=str(REPO_ROOT))
+
+    start = time.perf_counter()
+    with open(workdir / f"{stage}.log", "w", encoding="utf-8") as log:
+        process = subprocess.Popen(
+            [sys.executable, str(REPO_ROOT / stage), *extra_args],
+            cwd=workdir,
+            env=env,
+            stdout=log,
+            stderr=subprocess.STDOUT,
+        )
+        # wait4 gives resource usage of this child only
+        _, status, usage = os.wait4(process.pid, 0)
+        process.returncode = os.waitstatus_to_exitcode(status)
+    wall = time.perf_counter() - start
+
+    if process.returncode != 0:
+        raise RuntimeError(f"{stage} failed, see {workdir / f'{stage}.log'}")
+
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    rss_scale = 1 if sys.platform == "darwin" else 1024
+    return {
+        "stage": stage,
+        "wall_seconds": round(wall, 3),
+        "cpu_seconds": round(usage.ru_utime + usage.ru_stime, 3),
+        "input_lines": lines,
+        "input_mb": round(total_bytes / 1e6, 3),
+        "lines_per_second": round(lines / wall, 1) if wall else None,
+        "mb_per_second": round(total_bytes / 1e6 / wall, 3) if wall else None,
+        "peak_rss_mb": round(usage.ru_maxrss * rss_scale / 1e6, 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark stages 01-04 on synthetic logs"
+    )
+    parser.add_argument(
+        "--workdir", type=Path, default=Path("bench_work"), help="scratch directory"
+    )
+    parser.add_argument("--json", type=Path, help="write results to this file")
+    parser.add_argument(
+        "--stages", nargs="*", default=["01", "02", "03", "04"], help="stage prefixes"
+    )
+    parser.add_argument(
+        "--keep", action="store_true", help="reuse an existing workdir's files/"
+    )
+    add_generator_arguments(parser)
+    args = parser.parse_args()
+
+    workdir: Path = args.workdir.resolve()
+    if not (args.keep and (workdir / "files").exists()):
+        shutil.rmtree(workdir, ignore_errors=True)
+        workdir.mkdir(parents=True)
+        print("Generating synthetic logs...")
+        totals = generate_from_args(workdir, args)
+        print(
+            f"Generated {totals['log_files']} log files, {totals['lines']} lines, "
+            f"{totals['bytes'] / 1e6:.1f} MB"
+        )
+
+    results = []
+    for stage in STAGES:
+        if not any(stage.startswith(prefix) for prefix in args.stages):
+            continue
+        result = run_stage(stage, workdir, [])
+        results.append(result)
+        print(
+            f"{stage}: {result['wall_seconds']}s wall, {result['cpu_seconds']}s cpu, "
+            f"{result['lines_per_second']} lines/s, {result['mb_per_second']} MB/s, "
+            f"peak RSS {result['peak_rss_mb']} MB"
+        )
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(
+                {"config": vars(args) | {"workdir": str(workdir)}, "stages": results},
+                f,
+                indent=2,
+                default=str,
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,333 @@
+import argparse
+import gzip
+import io
+import json
+import random
+import uuid as uuid_lib
+from datetime import datetime, timedelta
+from pathlib import Path
+
+MOBS = [
+    "Zombie",
+    "Skeleton",
+    "Spider",
+    "Creeper",
+    "Enderman",
+    "Witch",
+    "Drowned",
+    "Pillager",
+    "Blaze",
+    "Piglin Brute",
+]
+# Vanilla death message templates; {mob} or {player} is the killer
+DEATH_TEMPLATES = [
+    "was slain by {mob}",
+    "was shot by {mob}",
+    "was blown up by Creeper",
+    "was doomed to fall by {mob}",
+    "walked into fire whilst fighting {mob}",
+    "fell from a high place",
+    "hit the ground too hard",
+    "drowned",
+    "burned to death",
+    "went up in flames",
+    "tried to swim in lava",
+    "blew up",
+    "starved to death",
+    "suffocated in a wall",
+    "was killed by magic",
+    "withered away",
+    "was pricked to death",
+    "fell out of the world",
+    "experienced kinetic energy",
+    "froze to death",
+    "was struck by lightning",
+]
+PVP_TEMPLATES = ["was slain by {player}", "was shot by {player}"]
+ADVANCEMENTS = [
+    ("minecraft:story/mine_stone", "Stone Age"),
+    ("minecraft:story/upgrade_tools", "Getting an Upgrade"),
+    ("minecraft:story/smelt_iron", "Acquire Hardware"),
+    ("minecraft:story/obtain_armor", "Suit Up"),
+    ("minecraft:story/lava_bucket", "Hot Stuff"),
+    ("minecraft:story/iron_tools", "Isn't It Iron Pick"),
+    ("minecraft:story/mine_diamond", "Diamonds!"),
+    ("minecraft:story/enter_the_nether", "We Need to Go Deeper"),
+    ("minecraft:nether/find_fortress", "A Terrible Fortress"),
+    ("minecraft:story/follow_ender_eye", "Eye Spy"),
+    ("minecraft:end/kill_dragon", "Free the End"),
+    ("minecraft:adventure/sleep_in_bed", "Sweet Dreams"),
+    ("minecraft:husbandry/plant_seed", "A Seedy Place"),
+    ("minecraft:husbandry/tame_an_animal", "Best Friends Forever"),
+]
+CHAT_WORDS = [
+    "hello",
+    "gg",
+    "lol",
+    "anyone",
+    "online",
+    "diamonds",
+    "nether",
+    "base",
+    "come",
+    "here",
+    "tql",
+    "你好",
+    "服务器",
+    "卡了",
+    "钻石",
+    "哈哈哈",
+    "下线了",
+    "晚安",
+]
+NOISE_LINES = [
+    "[Server thread/WARN]: Can't keep up! Is the server overloaded? Running 2104ms or 42 ticks behind",
+    "[Server thread/INFO]: Saving the game (this may take a moment!)",
+    "[Server thread/INFO]: Saved the game",
+    "[Server thread/INFO]: ThreadedAnvilChunkStorage: All dimensions are saved",
+    "[Server thread/INFO]: [Rcon: Saved the game]",
+    "[Worker-Main-3/INFO]: Preparing spawn area: 84%",
+]
+
+
+def make_players(rng: random.Random, count: int) -> dict[str, str]:
+    """Returns name -> uuid for count players"""
+    return {
+        f"Player{i:03d}": str(uuid_lib.UUID(int=rng.getrandbits(128), version=4))
+        for i in range(count)
+    }
+
+
+def write_gzip(path: Path, lines: list[str]) -> None:
+    # mtime=0 keeps the output byte-for-byte reproducible
+    with open(path, "wb") as raw:
+        with gzip.GzipFile(fileobj=raw, mode="wb", mtime=0) as gz:
+            with io.TextIOWrapper(gz, encoding="utf-8") as f:
+                f.writelines(lines)
+
+
+class ServerSimulation:
+    """Simulates one server's days, producing vanilla-looking log lines"""
+
+    def __init__(
+        self,
+        rng: random.Random,
+        players: dict[str, str],
+        sessions_per_day: int,
+        events_per_session: int,
+        noise_ratio: float,
+    ) -> None:
+        self.rng = rng
+        self.players = players
+        self.sessions_per_day = sessions_per_day
+        self.events_per_session = events_per_session
+        self.noise_ratio = noise_ratio
+        self.earned: dict[str, dict[str, datetime]] = {name: {} for name in players}
+
+    def simulate_day(self, day: datetime) -> list[list[tuple[datetime, str]]]:
+        """Returns the day's events split into one list per server run"""
+        rng = self.rng
+        events: list[tuple[datetime, str]] = []
+        names = list(self.players)
+
+        for _ in range(self.sessions_per_day):
+            player = rng.choice(names)
+            start = day + timedelta(seconds=rng.randint(0, 20 * 3600))
+            duration = rng.randint(5 * 60, 4 * 3600)
+            end = start + timedelta(seconds=duration)
+            events.extend(self.simulate_session(player, start, end))
+
+        # Background noise spread across the day
+        noise_count = int(len(events) * self.noise_ratio)
+        for _ in range(noise_count):
+            at = day + timedelta(seconds=rng.randint(0, 24 * 3600 - 1))
+            events.append((at, rng.choice(NOISE_LINES)))
+
+        events.sort(key=lambda event: event[0])
+        events = [event for event in events if event[0].date() == day.date()]
+
+        # Occasionally restart mid-day, which starts a new log file
+        runs = [events]
+        if events and rng.random() < 0.2:
+            cut = rng.randint(0, len(events) - 1)
+            runs = [events[:cut], events[cut:]]
+        return [[(run[0][0] if run else day, done_line(rng))] + run for run in runs]
+
+    def simulate_session(
+        self, player: str, start: datetime, end: datetime
+    ) -> list[tuple[datetime, str]]:
+        rng = self.rng
+        uuid = self.players[player]
+        entity_id = rng.randint(100, 99999)
+        events = [
+            (
+                start,
+                f"[User Authenticator #{rng.randint(1, 9)}/INFO]: "
+                f"UUID of player {player} is {uuid}",
+            ),
+            (
+                start,
+                f"[Server thread/INFO]: {player}[/127.0.0.1:{rng.randint(1024, 65535)}] "
+                f"logged in with entity id {entity_id} at "
+                f"({rng.uniform(-1000, 1000):.2f}, 64.0, {rng.uniform(-1000, 1000):.2f})",
+            ),
+            (start, f"[Server thread/INFO]: {player} joined the game"),
+        ]
+
+        span = max(1, int((end - start).total_seconds()))
+        for _ in range(rng.randint(0, self.events_per_session)):
+            at = start + timedelta(seconds=rng.randint(1, span))
+            events.append((at, self.random_event(player, at)))
+
+        events.append(
+            (end, f"[Server thread/INFO]: {player} lost connection: Disconnected")
+        )
+        events.append((end, f"[Server thread/INFO]: {player} left the game"))
+        return events
+
+    def random_event(self, player: str, at: datetime) -> str:
+        rng = self.rng
+        roll = rng.random()
+        if roll < 0.6:
+            words = rng.choices(CHAT_WORDS, k=rng.randint(1, 8))
+            prefix = "[Not Secure] " if rng.random() < 0.3 else ""
+            return f"[Server thread/INFO]: {prefix}<{player}> {' '.join(words)}"
+        if roll < 0.75:
+            if rng.random() < 0.1:
+                killer = rng.choice(list(self.players))
+                message = rng.choice(PVP_TEMPLATES).format(player=killer)
+            else:
+                message = rng.choice(DEATH_TEMPLATES).format(mob=rng.choice(MOBS))
+            return f"[Server thread/INFO]: {player} {message}"
+        if roll < 0.85:
+            adv_id, title = rng.choice(ADVANCEMENTS)
+            self.earned[player].setdefault(adv_id, at)
+            return f"[Server thread/INFO]: {player} has made the advancement [{title}]"
+        if roll < 0.9:
+            return f"[Server thread/WARN]: {player} moved too quickly! 12.3,0.0,4.5"
+        if roll < 0.95:
+            return f"[Server thread/INFO]: {player} issued server command: /home"
+        return f"[Server thread/INFO]: {player} is now AFK"
+
+
+def done_line(rng: random.Random) -> str:
+    return (
+        f'[Server thread/INFO]: Done ({rng.uniform(2, 30):.3f}s)! For help, type "help"'
+    )
+
+
+def write_advancement_files(
+    adv_dir: Path, players: dict[str, str], earned: dict[str, dict[str, datetime]]
+) -> None:
+    adv_dir.mkdir(parents=True, exist_ok=True)
+    for player, advancements in earned.items():
+        if not advancements:
+            continue
+        data: dict = {}
+        for adv_id, at in sorted(advancements.items()):
+            time_str = at.strftime("%Y-%m-%d %H:%M:%S +0800")
+            data[adv_id] = {"criteria": {"requirement": time_str}, "done": True}
+            # Recipe unlocks are usually the bulk of these files
+            recipe = f"minecraft:recipes/misc/{adv_id.rsplit('/', 1)[-1]}"
+            data[recipe] = {"criteria": {"has_item": time_str}, "done": True}
+        data["DataVersion"] = 3700
+        with open(adv_dir / f"{players[player]}.json", "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+
+
+def generate(
+    root: Path,
+    servers: int = 3,
+    players: int = 40,
+    days: int = 30,
+    sessions_per_day: int = 20,
+    events_per_session: int = 30,
+    noise_ratio: float = 1.0,
+    start: str = "2024-01-01",
+    seed: int = 0,
+) -> dict:
+    """Generate files/<server>/logs/*.log.gz and advancement files under root
+
+    Returns counts of what was generated.
+    """
+    rng = random.Random(seed)
+    all_players = make_players(rng, players)
+    start_day = datetime.strptime(start, "%Y-%m-%d")
+    totals = {"log_files": 0, "lines": 0, "bytes": 0}
+
+    for server_idx in range(servers):
+        server = f"server{server_idx}"
+        log_dir = root / "files" / server / "logs"
+        log_dir.mkdir(parents=True, exist_ok=True)
+
+        # Each server sees a random subset of all players
+        names = rng.sample(sorted(all_players), k=max(1, len(all_players) * 2 // 3))
+        # Every other server only has advancements in its logs
+        with_files = server_idx % 2 == 0
+        simulation = ServerSimulation(
+            rng,
+            {name: all_players[name] for name in names},
+            sessions_per_day,
+            events_per_session,
+            noise_ratio,
+        )
+
+        for day_offset in range(days):
+            day = start_day + timedelta(days=day_offset)
+            for index, run in enumerate(simulation.simulate_day(day), start=1):
+                lines = [f"[{at:%H:%M:%S}] {text}\n" for at, text in run]
+                path = log_dir / f"{day:%Y-%m-%d}-{index}.log.gz"
+                write_gzip(path, lines)
+                totals["log_files"] += 1
+                totals["lines"] += len(lines)
+                totals["bytes"] += path.stat().st_size
+
+        if with_files:
+            write_advancement_files(
+                root / "files" / server / "advancements",
+                simulation.players,
+                simulation.earned,
+            )
+
+    return totals
+
+
+def add_generator_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--servers", type=int, default=3)
+    parser.add_argument("--players", type=int, default=40)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--sessions-per-day", type=int, default=20)
+    parser.add_argument("--events-per-session", type=int, default=30)
+    parser.add_argument("--noise-ratio", type=float, default=1.0)
+    parser.add_argument("--start", default="2024-01-01")
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def generate_from_args(root: Path, args: argparse.Namespace) -> dict:
+    return generate(
+        root,
+        servers=args.servers,
+        players=args.players,
+        days=args.days,
+        sessions_per_day=args.sessions_per_day,
+        events_per_session=args.events_per_session,
+        noise_ratio=args.noise_ratio,
+        start=args.start,
+        seed=args.seed,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate synthetic server logs")
+    parser.add_argument("root", type=Path, help="directory to create files/ in")
+    add_generator_arguments(parser)
+    args = parser.parse_args()
+    totals = generate_from_args(args.root, args)
+    print(
+        f"Wrote {totals['log_files']} log files, {totals['lines']} lines, "
+        f"{totals['bytes'] / 1e6:.1f} MB"
+    )
+
+
+if __name__ == "__main__":
+    main()
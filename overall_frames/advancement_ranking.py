@@ -2,6 +2,8 @@ from stats import get_advancement_ranking
 
 from .common import escape_latex
 
+TABLES = ["advancements", "player_names"]
+
 
 def write_frame(dfs, frames_dir):
     """Generate the advancement ranking frame"""
@@ -0,0 +1,137 @@
+import hashlib
+import json
+from pathlib import Path
+from types import ModuleType
+from typing import Callable
+
+import pandas as pd
+
+from stats.common import table_files
+
+from .figures import FigureRenderer
+
+PACKAGE_DIR = Path(__file__).resolve().parent
+STATS_DIR = PACKAGE_DIR.parent / "stats"
+
+
+def hash_sources(paths: list[Path]) -> str:
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def hash_tables(tables: list[str]) -> str:
+    """Hash the path, size and mtime of every file the tables are loaded from"""
+    digest = hashlib.sha256()
+    for table in sorted(tables):
+        for path in table_files(table):
+            stat = path.stat() if path.exists() else None
+            signature = (stat.st_size, stat.st_mtime_ns) if stat else None
+            digest.update(f"{path}:{signature}\n".encode())
+    return digest.hexdigest()
+
+
+def snapshot(dirs: list[str]) -> dict[str, int]:
+    return {
+        str(path): path.stat().st_mtime_ns
+        for dir_path in dirs
+        for path in Path(dir_path).iterdir()
+        if path.is_file()
+    }
+
+
+class FrameBuilder:
+    """Rebuilds only the frames whose input tables or code changed since the last run
+
+    Every frame module declares the tables it reads in TABLES. A frame is
+    skipped when the hash of those tables' files, its own source, and the
+    shared frame and stats code match the manifest, and its outputs exist.
+    Figures are rendered concurrently by renderer while later frames build.
+    """
+
+    def __init__(
+        self,
+        frames_dir: str,
+        figures_dir: str,
+        manifest_path: Path,
+        load: Callable[[list[str]], dict[str, pd.DataFrame]],
+        renderer: FigureRenderer,
+        force: bool = False,
+    ) -> None:
+        self.frames_dir = frames_dir
+        self.figures_dir = figures_dir
+        self.manifest_path = manifest_path
+        self.load = load
+        self.renderer = renderer
+        self.force = force
+        self.shared_code = hash_sources(
+            [
+                PACKAGE_DIR / name
+                for name in ["build.py", "common.py", "figures.py", "writer.py"]
+            ]
+            + sorted(p for p in STATS_DIR.rglob("*.py") if "sql" not in p.parts)
+            # The chat stats split messages with the stage-2 tokenizer
+            + [PACKAGE_DIR.parent / "parsing" / "text.py"]
+        )
+
+    def frame_key(self, module: ModuleType) -> str:
+        own_code = hash_sources([Path(module.__file__)])
+        return hashlib.sha256(
+            f"{self.shared_code}:{own_code}:{hash_tables(module.TABLES)}".encode()
+        ).hexdigest()
+
+    def run_frame(self, module: ModuleType, dfs: dict[str, pd.DataFrame]) -> None:
+        # Frames with figures write several files through their own build()
+        if hasattr(module, "build"):
+            module.build(dfs, self.frames_dir, self.figures_dir, self.renderer)
+        else:
+            module.write_frame(dfs, self.frames_dir)
+
+    def build(self, modules: list[ModuleType]) -> None:
+        """Build the stale frames in order, loading only the tables they read"""
+        manifest = {}
+        if self.manifest_path.exists():
+            with open(self.manifest_path, encoding="utf-8") as f:
+                manifest = json.load(f)
+
+        stale = []
+        for module in modules:
+            name = module.__name__.rsplit(".", 1)[-1]
+            key = self.frame_key(module)
+            entry = manifest.get(name)
+            if (
+                self.force
+                or entry is None
+                or entry["key"] != key
+                or not all(Path(path).exists() for path in entry["outputs"])
+            ):
+                stale.append((name, key, module))
+
+        print(f"Building {len(stale)} of {len(modules)} frames")
+        if not stale:
+            return
+
+        tables = sorted({table for _, _, module in stale for table in module.TABLES})
+        dfs = self.load(tables)
+        dirs = [self.frames_dir, self.figures_dir]
+        # Frames with figures are only recorded once their figures are saved
+        rendering = {}
+        try:
+            for name, key, module in stale:
+                before = snapshot(dirs)
+                submitted = len(self.renderer.paths)
+                self.run_frame(module, dfs)
+                after = snapshot(dirs)
+                outputs = [p for p, t in after.items() if before.get(p) != t]
+                figures = self.renderer.paths[submitted:]
+                entry = {"key": key, "outputs": sorted(set(outputs + figures))}
+                if figures:
+                    rendering[name] = entry
+                else:
+                    manifest[name] = entry
+            self.renderer.wait()
+            manifest.update(rendering)
+        finally:
+            with open(self.manifest_path, "w", encoding="utf-8") as f:
+                json.dump(manifest, f, indent=2)
@@ -2,6 +2,8 @@ from stats import get_chat_ranking
 
 from .common import escape_latex
 
+TABLES = ["messages", "player_names"]
+
 
 def write_frame(dfs, frames_dir):
     """Generate the chat ranking frame"""
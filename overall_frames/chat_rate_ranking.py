@@ -2,6 +2,8 @@ from stats import get_chat_rate_ranking
 
 from .common import escape_latex
 
+TABLES = ["messages", "sessions", "player_names"]
+
 
 def write_frame(dfs, frames_dir):
     """Generate the chat rate ranking frame"""
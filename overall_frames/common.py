@@ -1,6 +1,6 @@
-def escape_latex(text: str) -> str:
-    """Escape special LaTeX characters"""
-    chars = {
+# Built once, so escaping a string is a single str.translate() call
+LATEX_ESCAPES = str.maketrans(
+    {
         "_": "\\_",
         "&": "\\&",
         "%": "\\%",
@@ -12,4 +12,9 @@ def escape_latex(text: str) -> str:
         "~": "\\~{}",
         "\\": "\\textbackslash{}",
     }
-    return "".join(chars.get(c, c) for c in text)
+)
+
+
+def escape_latex(text: str) -> str:
+    """Escape special LaTeX characters"""
+    return text.translate(LATEX_ESCAPES)
@@ -1,95 +1,95 @@
-import matplotlib.pyplot as plt
 import numpy as np
-import pandas as pd
+from matplotlib.figure import Figure
 
 from stats import get_daily_playtime
 
+from .figures import FigureRenderer, new_figure
+
+TABLES = ["sessions"]
 FONT_SIZE = 20
 
 
-def create_figure(dfs, figures_dir):
+def create_figure(dfs, figures_dir, renderer: FigureRenderer | None = None):
     """Create daily playtime heatmap"""
+    renderer = renderer or FigureRenderer(max_workers=0)
+
     # Get daily playtime data
     daily_data = get_daily_playtime(dfs)
 
-    # Convert to DataFrame and process dates
-    df = pd.DataFrame(daily_data)
-    df["date"] = pd.to_datetime(df["date"])
-    df["weekday"] = df["date"].dt.weekday  # 0 = Monday, 6 = Sunday
-    df["week_num"] = df["date"].dt.isocalendar().week
+    heatmap_data, month_boundaries = build_heatmap(
+        [d["date"] for d in daily_data], [d["play_hours"] for d in daily_data]
+    )
 
-    # Create matrix for heatmap (week x weekday)
-    num_weeks = 52  # Standard number of weeks in a year
-    heatmap_data = np.zeros((num_weeks, 7))  # weeks x weekdays
-    week_totals = np.zeros((num_weeks, 7))
+    renderer.submit(
+        draw_figure,
+        (heatmap_data, month_boundaries),
+        f"{figures_dir}/daily_playtime.pdf",
+        font_size=FONT_SIZE,  # Increase base font size
+    )
 
-    # Calculate month boundaries for x-axis labels
-    month_boundaries = []
-    current_month = None
 
-    for _, row in df.sort_values("date").iterrows():
-        week_idx = int(row["week_num"]) - 1
-        weekday_idx = row["weekday"]
-        month = row["date"].month
+def build_heatmap(dates, values) -> tuple[np.ndarray, list[tuple[int, int]]]:
+    """Average daily values into a week x weekday matrix covering the dates' range
+
+    Rows start at the Monday of the earliest date, so any window, including
+    ISO week 53 and multi-year ranges, fits. Also returns (week index, month)
+    where each month starts.
+    """
+    days = np.asarray(dates, dtype="datetime64[D]")
+    values = np.asarray(values, dtype=float)
+    if len(days) == 0:
+        return np.zeros((0, 7)), []
 
-        # Track month changes for labels
-        if current_month != month:
-            month_boundaries.append((week_idx, month))
-            current_month = month
+    # Day 0 (1970-01-01) was a Thursday
+    day_numbers = days.astype(np.int64)
+    weekdays = (day_numbers + 3) % 7  # 0 = Monday, 6 = Sunday
+    first_monday = day_numbers.min() - weekdays[day_numbers.argmin()]
+    weeks = (day_numbers - first_monday) // 7
 
-        heatmap_data[week_idx, weekday_idx] += row["play_hours"]
-        week_totals[week_idx, weekday_idx] += 1
+    shape = (int(weeks.max()) + 1, 7)
+    totals = np.zeros(shape)
+    counts = np.zeros(shape)
+    np.add.at(totals, (weeks, weekdays), values)
+    np.add.at(counts, (weeks, weekdays), 1)
 
     # Calculate averages
-    heatmap_data = np.divide(
-        heatmap_data,
-        week_totals,
-        where=week_totals != 0,
-        out=np.zeros_like(heatmap_data),
-    )
+    heatmap = np.divide(totals, counts, where=counts != 0, out=np.zeros(shape))
+
+    # Calculate month boundaries for x-axis labels
+    order = np.argsort(day_numbers, kind="stable")
+    months = days[order].astype("datetime64[M]").astype(np.int64)
+    starts = np.flatnonzero(np.diff(months, prepend=months[0] - 1))
+    month_boundaries = [(int(weeks[order][i]), int(months[i] % 12) + 1) for i in starts]
+    return heatmap, month_boundaries
 
-    # Create figure
-    plt.figure(figsize=(17, 4))
-    plt.rcParams.update({"font.size": FONT_SIZE})  # Increase base font size
+
+def draw_figure(data: tuple[np.ndarray, list[tuple[int, int]]]) -> Figure:
+    heatmap_data, month_boundaries = data
+    fig = new_figure((17, 4))
+    ax = fig.add_subplot()
 
     # Create heatmap
-    im = plt.imshow(heatmap_data.T, cmap="YlOrRd", aspect="auto")
-    cbar = plt.colorbar(im, label="游玩时长（小时/天）")
+    im = ax.imshow(heatmap_data.T, cmap="YlOrRd", aspect="auto")
+    cbar = fig.colorbar(im, ax=ax, label="游玩时长（小时/天）")
     cbar.ax.tick_params(labelsize=FONT_SIZE)  # Colorbar tick size
 
     # Configure axes with larger fonts
     weekday_names = ["周一", "周二", "周三", "周四", "周五", "周六", "周日"]
-    plt.yticks(range(7), weekday_names, fontsize=FONT_SIZE)
+    ax.set_yticks(range(7), weekday_names, fontsize=FONT_SIZE)
 
     # Set x-axis ticks at month boundaries
     month_positions = [pos for pos, _ in month_boundaries]
-    month_labels = [
-        "1月",
-        "2月",
-        "3月",
-        "4月",
-        "5月",
-        "6月",
-        "7月",
-        "8月",
-        "9月",
-        "10月",
-        "11月",
-        "12月",
-    ][: len(month_boundaries)]
-    plt.xticks(month_positions, month_labels, rotation=45, fontsize=FONT_SIZE)
-
-    plt.xlabel("月份", fontsize=FONT_SIZE)
-    plt.ylabel("星期", fontsize=FONT_SIZE)
-    plt.title("每日游玩时间热力图", pad=20, fontsize=FONT_SIZE)
+    month_labels = [f"{month}月" for _, month in month_boundaries]
+    ax.set_xticks(month_positions, month_labels, rotation=45, fontsize=FONT_SIZE)
 
-    # Add grid
-    plt.grid(True, color="gray", linestyle=":", alpha=0.3)
-    plt.tight_layout()
+    ax.set_xlabel("月份", fontsize=FONT_SIZE)
+    ax.set_ylabel("星期", fontsize=FONT_SIZE)
+    ax.set_title("每日游玩时间热力图", pad=20, fontsize=FONT_SIZE)
 
-    # Save figure
-    plt.savefig(f"{figures_dir}/daily_playtime.pdf", bbox_inches="tight", format="pdf")
-    plt.close()
+    # Add grid
+    ax.grid(True, color="gray", linestyle=":", alpha=0.3)
+    fig.tight_layout()
+    return fig
 
 
 def write_frame(frames_dir):
@@ -101,3 +101,8 @@ def write_frame(frames_dir):
 \\end{center}
 \\end{frame}
 """)
+
+
+def build(dfs, frames_dir, figures_dir, renderer: FigureRenderer | None = None):
+    create_figure(dfs, figures_dir, renderer)
+    write_frame(frames_dir)
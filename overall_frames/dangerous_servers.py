@@ -2,6 +2,8 @@ from stats import get_dangerous_server_ranking
 
 from .common import escape_latex
 
+TABLES = ["deaths", "sessions"]
+
 
 def write_frame(dfs, frames_dir):
     """Generate the dangerous servers frame"""
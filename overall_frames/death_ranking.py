@@ -1,6 +1,9 @@
 from stats import get_death_ranking
 from .common import escape_latex
 
+TABLES = ["deaths", "player_names"]
+
+
 def write_frame(dfs, frames_dir):
     """Generate the death ranking frame"""
     rankings = get_death_ranking(dfs)
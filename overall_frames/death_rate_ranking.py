@@ -2,6 +2,8 @@ from stats import get_death_rate_ranking
 
 from .common import escape_latex
 
+TABLES = ["deaths", "sessions", "player_names"]
+
 
 def write_frame(dfs, frames_dir):
     """Generate the death rate ranking frame"""
@@ -0,0 +1,100 @@
+import functools
+import os
+import warnings
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable
+
+import matplotlib
+from matplotlib import font_manager
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+CJK_FONTS = ["Microsoft YaHei", "SimHei", "Arial Unicode MS"]
+
+Draw = Callable[..., Figure]
+
+
+@functools.cache
+def cjk_font_family() -> list[str]:
+    """The first installed CJK font, looked up once per process"""
+    for family in CJK_FONTS:
+        try:
+            font_manager.findfont(
+                font_manager.FontProperties(family=family), fallback_to_default=False
+            )
+            return [family]
+        except ValueError:
+            continue
+    warnings.warn(f"None of {CJK_FONTS} are installed, CJK text will not render")
+    return ["sans-serif"]
+
+
+def new_figure(figsize: tuple[float, float]) -> Figure:
+    """A figure on its own Agg canvas, independent of pyplot"""
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    return fig
+
+
+def render(draw: Draw, data, path: str, font_size: float | None = None) -> str:
+    """Draw data on a new figure and save it as a PDF
+
+    Styles only apply inside this call, so figures don't leak settings into
+    each other. Module-level draw functions can be rendered in worker processes.
+    """
+    style = {"font.family": cjk_font_family(), "axes.unicode_minus": False}
+    if font_size is not None:
+        style["font.size"] = font_size
+    with matplotlib.rc_context(style):
+        fig = draw(data)
+        fig.savefig(path, bbox_inches="tight", format="pdf")
+    return path
+
+
+class FigureRenderer:
+    """Renders figures in worker processes, or inline with max_workers=0
+
+    Matplotlib settings are per process, so rendering in processes rather than
+    threads keeps concurrent figures from affecting each other.
+    """
+
+    def __init__(self, max_workers: int | None = None) -> None:
+        if max_workers is None:
+            # Workers only pay off with more than one CPU
+            cpus = os.cpu_count() or 1
+            max_workers = cpus if cpus > 1 else 0
+        self.max_workers = max_workers
+        self.executor: ProcessPoolExecutor | None = None
+        self.futures: list[Future] = []
+        self.paths: list[str] = []
+
+    def submit(
+        self, draw: Draw, data, path: str, font_size: float | None = None
+    ) -> None:
+        self.paths.append(path)
+        if self.max_workers == 0:
+            render(draw, data, path, font_size)
+            return
+        if self.executor is None:
+            # Forked workers inherit the resolved font
+            cjk_font_family()
+            self.executor = ProcessPoolExecutor(self.max_workers)
+        self.futures.append(self.executor.submit(render, draw, data, path, font_size))
+
+    def wait(self) -> list[str]:
+        """Wait for every submitted figure, raising the first failure"""
+        futures, self.futures = self.futures, []
+        for future in futures:
+            future.result()
+        return self.paths
+
+    def close(self) -> None:
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+    def __enter__(self) -> "FigureRenderer":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -2,6 +2,8 @@ from stats import get_peak_concurrent_players
 
 from .common import escape_latex
 
+TABLES = ["sessions", "player_names"]
+
 
 def write_frame(dfs, frames_dir):
     """Write the peak players frame"""
@@ -2,6 +2,8 @@ from stats import get_playtime_ranking
 
 from .common import escape_latex
 
+TABLES = ["sessions", "player_names"]
+
 
 def write_frame(dfs, frames_dir):
     """Generate the playtime ranking frame"""
@@ -2,6 +2,8 @@ from stats import get_pvp_kill_ranking
 
 from .common import escape_latex
 
+TABLES = ["deaths", "player_names"]
+
 
 def write_frame(dfs, frames_dir):
     """Generate the PvP kill ranking frame"""
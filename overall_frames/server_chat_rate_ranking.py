@@ -2,6 +2,8 @@ from stats import get_server_chat_rate_ranking
 
 from .common import escape_latex
 
+TABLES = ["messages", "sessions"]
+
 
 def write_frame(dfs, frames_dir):
     """Generate the server chat rate ranking frame"""
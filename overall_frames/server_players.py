@@ -1,69 +1,73 @@
 from stats import get_server_player_list
 
 from .common import escape_latex
+from .writer import FrameWriter, paginate, text_width, wrapped_lines
 
+TABLES = ["sessions", "player_names"]
 
-def write_frame(dfs, frames_dir):
-    """Generate the server players frame across three slides"""
-    # Get server player data
-    server_data = get_server_player_list(dfs)
+# Columns of \tiny text in a line, and lines in a slide, where a server's
+# heading takes HEADING_LINES
+LINE_WIDTH = 130
+PAGE_LINES = 24
+HEADING_LINES = 2
 
-    # Split servers into three parts
-    first_group = server_data[:1]  # First server only
-    remaining = server_data[1:]
-    mid_point = (len(remaining) + 1) // 2  # Ensure even split of remaining servers
-    second_group = remaining[:mid_point]
-    third_group = remaining[mid_point:]
 
-    # Write first slide (First server)
-    if first_group:
-        server = first_group[0]
-        content = [
-            f"\\begin{{frame}}{{{server['server_name']} 服务器玩家列表}}",
-            "\\begin{center}",
-            f"{server['server_name']}共有 {server['player_count']} 位玩家上线至少一次\\\\[1em]",
-            "\\begin{tiny}",
-            ", ".join(escape_latex(name) for name in sorted(server["player_list"])),
-            "\\end{tiny}",
-            "\\end{center}",
-            "\\end{frame}",
-        ]
+def list_lines(names: list[str]) -> int:
+    return HEADING_LINES + wrapped_lines(", ".join(names), LINE_WIDTH)
 
-        with open(f"{frames_dir}/server_players_1.tex", "w", encoding="utf-8") as f:
-            f.write("\n".join(content))
 
-    # Write second slide (First half of remaining servers)
-    content = ["\\begin{frame}{服务器玩家列表 - 其他服务器 (1/2)}", "\\begin{itemize}"]
+def server_entries(server_data: list[dict]) -> list[tuple[dict, list[str], bool]]:
+    """(server, names, continued) entries that each fit on a slide
 
-    for server in second_group:
-        content.extend(
-            [
-                f"\\item {server['server_name']}: {server['player_count']} 位玩家",
-                "\\begin{tiny}",
-                f"{', '.join(escape_latex(name) for name in sorted(server['player_list']))}",
-                "\\end{tiny}",
-                "",
-            ]
+    A server whose player list is longer than a slide is split into several
+    entries, the later ones marked as continued.
+    """
+    entries = []
+    for server in server_data:
+        names = [escape_latex(name) for name in sorted(server["player_list"])]
+        # Each name takes its width plus the ", " separator
+        chunks = paginate(
+            names,
+            lambda name: text_width(name) + 2,
+            (PAGE_LINES - HEADING_LINES) * LINE_WIDTH,
         )
+        for i, chunk in enumerate(chunks):
+            entries.append((server, chunk, i > 0))
+    return entries
 
-    content.extend(["\\end{itemize}", "\\end{frame}"])
-    with open(f"{frames_dir}/server_players_2.tex", "w", encoding="utf-8") as f:
-        f.write("\n".join(content))
-
-    # Write third slide (Second half of remaining servers)
-    content = ["\\begin{frame}{服务器玩家列表 - 其他服务器 (2/2)}", "\\begin{itemize}"]
 
-    for server in third_group:
-        content.extend(
-            [
-                f"\\item {server['server_name']}: {server['player_count']} 位玩家",
-                "\\begin{tiny}",
-                f"{', '.join(escape_latex(name) for name in sorted(server['player_list']))}",
-                "\\end{tiny}",
-                "",
-            ]
+def write_frame(dfs, frames_dir):
+    """Generate the server players frames, as many slides as the lists need"""
+    server_data = get_server_player_list(dfs)
+    pages = list(
+        paginate(
+            server_entries(server_data),
+            lambda entry: list_lines(entry[1]),
+            PAGE_LINES,
         )
+    )
 
-    content.extend(["\\end{itemize}", "\\end{frame}"])
-    with open(f"{frames_dir}/server_players_3.tex", "w", encoding="utf-8") as f:
-        f.write("\n".join(content))
+    with FrameWriter(f"{frames_dir}/server_players.tex") as writer:
+        for page_number, page in enumerate(pages, 1):
+            title = "服务器玩家列表"
+            if len(pages) > 1:
+                title += f" ({page_number}/{len(pages)})"
+            body = ["\\begin{itemize}"]
+            for server, names, continued in page:
+                server_name = escape_latex(server["server_name"])
+                heading = (
+                    f"{server_name} (续)"
+                    if continued
+                    else f"{server_name}: {server['player_count']} 位玩家"
+                )
+                body.extend(
+                    [
+                        f"\\item {heading}",
+                        "\\begin{tiny}",
+                        ", ".join(names),
+                        "\\end{tiny}",
+                        "",
+                    ]
+                )
+            body.append("\\end{itemize}")
+            writer.write_frame(title, body)
@@ -2,6 +2,8 @@ from stats import get_server_playtime_ranking
 
 from .common import escape_latex
 
+TABLES = ["sessions"]
+
 
 def write_frame(dfs, frames_dir):
     """Generate the server playtime ranking frame"""
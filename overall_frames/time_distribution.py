@@ -1,14 +1,27 @@
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 
 from stats import get_hourly_playtime, get_weekday_playtime
 
+from .figures import FigureRenderer, new_figure
+
+TABLES = ["sessions"]
 
-def create_weekday_figure(dfs, figures_dir):
-    """Create weekday playtime visualization"""
-    plt.rcParams["font.size"] = 16
 
+def create_weekday_figure(dfs, figures_dir, renderer: FigureRenderer | None = None):
+    """Create weekday playtime visualization"""
+    renderer = renderer or FigureRenderer(max_workers=0)
     weekday_data = get_weekday_playtime(dfs)
-    plt.figure(figsize=(15, 8))  # Increased height for better visibility
+    renderer.submit(
+        draw_weekday_figure,
+        weekday_data,
+        f"{figures_dir}/weekday_playtime.pdf",
+        font_size=16,
+    )
+
+
+def draw_weekday_figure(weekday_data: list[dict]) -> Figure:
+    fig = new_figure((15, 8))  # Increased height for better visibility
+    ax = fig.add_subplot()
 
     days = [d["weekday"] for d in weekday_data]
     hours = [d["play_hours"] for d in weekday_data]
@@ -24,10 +37,10 @@ def create_weekday_figure(dfs, figures_dir):
     }
     x_labels = [day_names[day] for day in days]
 
-    plt.plot(x_labels, hours, "b-o", linewidth=3, markersize=10)
+    ax.plot(x_labels, hours, "b-o", linewidth=3, markersize=10)
 
     for i, hour in enumerate(hours):
-        plt.text(
+        ax.text(
             i,
             hour + max(hours) * 0.05,
             f"{hour:.1f}",
@@ -36,33 +49,38 @@ def create_weekday_figure(dfs, figures_dir):
             fontsize=16,
         )
 
-    plt.grid(True, linestyle="--", alpha=0.7)
-    plt.title("周一到周日游玩统计", pad=20, fontsize=20)
-    plt.ylabel("游玩时长（小时）", fontsize=18)
-    plt.xticks(fontsize=16)
-    plt.yticks(fontsize=16)
+    ax.grid(True, linestyle="--", alpha=0.7)
+    ax.set_title("周一到周日游玩统计", pad=20, fontsize=20)
+    ax.set_ylabel("游玩时长（小时）", fontsize=18)
+    ax.tick_params(labelsize=16)
 
-    plt.tight_layout()
-    plt.savefig(
-        f"{figures_dir}/weekday_playtime.pdf", bbox_inches="tight", format="pdf"
-    )
-    plt.close()
+    fig.tight_layout()
+    return fig
 
 
-def create_hourly_figure(dfs, figures_dir):
+def create_hourly_figure(dfs, figures_dir, renderer: FigureRenderer | None = None):
     """Create hourly playtime visualization"""
-    plt.rcParams["font.size"] = 16
-
+    renderer = renderer or FigureRenderer(max_workers=0)
     hourly_data = get_hourly_playtime(dfs)
-    plt.figure(figsize=(15, 8))  # Increased height for better visibility
+    renderer.submit(
+        draw_hourly_figure,
+        hourly_data,
+        f"{figures_dir}/hourly_playtime.pdf",
+        font_size=16,
+    )
+
+
+def draw_hourly_figure(hourly_data: list[dict]) -> Figure:
+    fig = new_figure((15, 8))  # Increased height for better visibility
+    ax = fig.add_subplot()
 
     hours_x = [d["hour"].split(":")[0] for d in hourly_data]
     hours_y = [d["play_hours"] for d in hourly_data]
 
-    plt.plot(hours_x, hours_y, "r-o", linewidth=3, markersize=10)
+    ax.plot(hours_x, hours_y, "r-o", linewidth=3, markersize=10)
 
     for i, hour in enumerate(hours_y):
-        plt.text(
+        ax.text(
             i,
             hour + max(hours_y) * 0.05,
             f"{hour:.1f}",
@@ -71,16 +89,15 @@ def create_hourly_figure(dfs, figures_dir):
             fontsize=16,
         )
 
-    plt.grid(True, linestyle="--", alpha=0.7)
-    plt.title("每小时游玩统计", pad=20, fontsize=20)
-    plt.xlabel("小时", fontsize=18)
-    plt.ylabel("游玩时长（小时）", fontsize=18)
-    plt.xticks(range(0, 24, 2), fontsize=16)
-    plt.yticks(fontsize=16)
+    ax.grid(True, linestyle="--", alpha=0.7)
+    ax.set_title("每小时游玩统计", pad=20, fontsize=20)
+    ax.set_xlabel("小时", fontsize=18)
+    ax.set_ylabel("游玩时长（小时）", fontsize=18)
+    ax.set_xticks(range(0, 24, 2))
+    ax.tick_params(labelsize=16)
 
-    plt.tight_layout()
-    plt.savefig(f"{figures_dir}/hourly_playtime.pdf", bbox_inches="tight", format="pdf")
-    plt.close()
+    fig.tight_layout()
+    return fig
 
 
 def write_frames(frames_dir):
@@ -102,3 +119,9 @@ def write_frames(frames_dir):
 \\end{center}
 \\end{frame}
 """)
+
+
+def build(dfs, frames_dir, figures_dir, renderer: FigureRenderer | None = None):
+    create_weekday_figure(dfs, figures_dir, renderer)
+    create_hourly_figure(dfs, figures_dir, renderer)
+    write_frames(frames_dir)
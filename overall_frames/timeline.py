@@ -1,21 +1,34 @@
 from datetime import datetime
 
 import matplotlib.dates as mdates
-import matplotlib.pyplot as plt
 import numpy as np
+import pandas as pd
+from matplotlib import colormaps
+from matplotlib.figure import Figure
 
 from stats import get_server_timeline
 
+from .figures import FigureRenderer, new_figure
 
-def create_figure(dfs, figures_dir):
+TABLES = ["uptime", "sessions"]
+
+
+def create_figure(dfs, figures_dir, renderer: FigureRenderer | None = None):
     """Create the server timeline figure"""
-    # Configure Chinese font support
-    plt.rcParams["font.sans-serif"] = ["Microsoft YaHei", "SimHei", "Arial Unicode MS"]
-    plt.rcParams["axes.unicode_minus"] = False
+    renderer = renderer or FigureRenderer(max_workers=0)
 
     # Get server timeline data and process
     timeline = get_server_timeline(dfs)
+    uptime = dfs["uptime"]
     for server in timeline:
+        # Uptime intervals in UTC+8, like the timeline
+        intervals = uptime[uptime["server_name"] == server["server_name"]]
+        server["uptime"] = [
+            (
+                pd.to_datetime(intervals[column], unit="s") + pd.Timedelta(hours=8)
+            ).dt.to_pydatetime()
+            for column in ["start_timestamp", "end_timestamp"]
+        ]
         server["created_datetime"] = datetime.fromisoformat(server["created_at"])
         server["closed_datetime"] = datetime.fromisoformat(server["closed_at"])
         # Store special dates for certain servers
@@ -30,18 +43,30 @@ def create_figure(dfs, figures_dir):
 
     timeline.sort(key=lambda x: x["created_datetime"])
 
-    # Create visualization
-    plt.figure(figsize=(15, 12))
-    ax = plt.gca()
-    colors = plt.cm.tab20(np.linspace(0, 1, len(timeline)))  # type: ignore
+    renderer.submit(draw_figure, timeline, f"{figures_dir}/server_timeline.pdf")
+
+
+def draw_figure(timeline: list[dict]) -> Figure:
+    fig = new_figure((15, 12))
+    ax = fig.add_subplot()
+    colors = colormaps["tab20"](np.linspace(0, 1, len(timeline)))
 
     # Draw timeline elements
     for idx, server in enumerate(timeline):
         y_pos = len(timeline) - idx - 1
-        plt.hlines(
+        # A thin line for the server's lifetime, thick where it was up
+        ax.hlines(
             y=y_pos,
             xmin=server["created_datetime"],
             xmax=server["closed_datetime"],
+            linewidth=1,
+            color=colors[idx],
+        )
+        starts, ends = server["uptime"]
+        ax.hlines(
+            y=np.full(len(starts), y_pos),
+            xmin=starts,
+            xmax=ends,
             linewidth=4,
             color=colors[idx],
         )
@@ -51,7 +76,7 @@ def create_figure(dfs, figures_dir):
         ).total_seconds()
         min_time_for_both_dates = 24 * 60 * 60
 
-        plt.text(
+        ax.text(
             server["created_datetime"],
             y_pos + 0.1,
             f"{server['server_name']}\n{server['display_date']}",  # Use display_date here
@@ -62,7 +87,7 @@ def create_figure(dfs, figures_dir):
         )
 
         if time_diff >= min_time_for_both_dates:
-            plt.text(
+            ax.text(
                 server["closed_datetime"],
                 y_pos + 0.1,
                 f"{server['closed_datetime'].strftime('%m-%d')}",
@@ -72,17 +97,15 @@ def create_figure(dfs, figures_dir):
             )
 
     # Configure plot
-    plt.ylim(-0.3, len(timeline) - 0.3)
-    plt.yticks([])
+    ax.set_ylim(-0.3, len(timeline) - 0.3)
+    ax.set_yticks([])
     ax.xaxis.set_major_locator(mdates.MonthLocator())
     ax.xaxis.set_major_formatter(mdates.DateFormatter("%m-%d"))
-    plt.xticks(rotation=45, fontsize=24)
-    plt.grid(True, axis="x")
+    ax.tick_params(axis="x", labelrotation=45, labelsize=24)
+    ax.grid(True, axis="x")
 
-    # Save figure (without ensuring directory exists)
-    plt.tight_layout()
-    plt.savefig(f"{figures_dir}/server_timeline.pdf", bbox_inches="tight", format="pdf")
-    plt.close()
+    fig.tight_layout()
+    return fig
 
 
 def write_frame(frames_dir):
@@ -94,3 +117,8 @@ def write_frame(frames_dir):
 \\end{center}
 \\end{frame}
 """)
+
+
+def build(dfs, frames_dir, figures_dir, renderer: FigureRenderer | None = None):
+    create_figure(dfs, figures_dir, renderer)
+    write_frame(frames_dir)
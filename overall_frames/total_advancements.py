@@ -1,5 +1,8 @@
 from stats import get_total_advancements
 
+TABLES = ["advancements"]
+
+
 def write_frame(dfs, frames_dir):
     """Generate the total advancements frame"""
     total_advs = get_total_advancements(dfs)
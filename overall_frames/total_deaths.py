@@ -1,5 +1,8 @@
 from stats import get_total_deaths
 
+TABLES = ["deaths"]
+
+
 def write_frame(dfs, frames_dir):
     """Generate the total deaths frame"""
     total_deaths = get_total_deaths(dfs)
@@ -1,5 +1,7 @@
 from stats import get_total_messages
 
+TABLES = ["messages"]
+
 
 def write_frame(dfs, frames_dir):
     """Generate the total messages frame"""
@@ -1,5 +1,7 @@
 from stats import get_total_playtime
 
+TABLES = ["sessions"]
+
 
 def write_frame(dfs, frames_dir):
     """Generate the total playtime frame"""
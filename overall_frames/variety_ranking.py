@@ -2,6 +2,8 @@ from stats import get_server_variety_ranking
 
 from .common import escape_latex
 
+TABLES = ["sessions", "player_names"]
+
 
 def write_frame(dfs, frames_dir):
     """Generate the server variety ranking frame"""
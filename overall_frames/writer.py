@@ -0,0 +1,62 @@
+import math
+import unicodedata
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+# Write buffer of a FrameWriter, so a deck of frames takes few write calls
+BUFFER_SIZE = 1 << 16
+
+
+def text_width(text: str) -> int:
+    """Width of text in columns, counting wide East Asian characters as two"""
+    if text.isascii():
+        return len(text)
+    return sum(2 if unicodedata.east_asian_width(c) in "WF" else 1 for c in text)
+
+
+def wrapped_lines(text: str, line_width: int) -> int:
+    """Number of lines text takes when wrapped at line_width columns"""
+    return max(1, math.ceil(text_width(text) / line_width))
+
+
+def paginate(
+    items: Iterable[T], measure: Callable[[T], int], capacity: int
+) -> Iterator[list[T]]:
+    """Split items, in order, into pages whose measured sizes add up to at most capacity
+
+    An item larger than capacity gets a page of its own.
+    """
+    page: list[T] = []
+    used = 0
+    for item in items:
+        size = measure(item)
+        if page and used + size > capacity:
+            yield page
+            page, used = [], 0
+        page.append(item)
+        used += size
+    if page:
+        yield page
+
+
+class FrameWriter:
+    """Streams beamer frames into one .tex file through a large write buffer"""
+
+    def __init__(self, path: str | Path, buffer_size: int = BUFFER_SIZE) -> None:
+        self.file = open(path, "w", encoding="utf-8", buffering=buffer_size)
+
+    def write_frame(self, title: str, body: Iterable[str]) -> None:
+        self.file.write(f"\\begin{{frame}}{{{title}}}\n")
+        self.file.writelines(f"{line}\n" for line in body)
+        self.file.write("\\end{frame}\n")
+
+    def close(self) -> None:
+        self.file.close()
+
+    def __enter__(self) -> "FrameWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,51 @@
+from .advancement_files import load_advancement_files
+from .common import (
+    add_time_window_arguments,
+    date_in_window,
+    format_date,
+    format_month,
+    get_time_window,
+    in_window,
+    parse_timestamp,
+    timestamp_to_year,
+    widen_to_months,
+)
+from .deaths import DeathClassifier
+from .event_buffer import EventBuffer, EventBuffers, Interner, StringArena
+from .identity import PlayerIdentities
+from .lines import RelevanceFilter, classify_line, find_uuid_mapping
+from .live import LiveServer, LiveTotals, follow
+from .names import NameIndex
+from .sessions import find_activity_gaps, repair_sessions
+from .sinks import SINKS, EventSink, SinkDispatcher
+
+__all__ = [
+    "SINKS",
+    "DeathClassifier",
+    "EventBuffer",
+    "EventBuffers",
+    "EventSink",
+    "Interner",
+    "LiveServer",
+    "LiveTotals",
+    "NameIndex",
+    "PlayerIdentities",
+    "RelevanceFilter",
+    "SinkDispatcher",
+    "StringArena",
+    "add_time_window_arguments",
+    "classify_line",
+    "date_in_window",
+    "find_activity_gaps",
+    "find_uuid_mapping",
+    "follow",
+    "format_date",
+    "format_month",
+    "get_time_window",
+    "in_window",
+    "load_advancement_files",
+    "parse_timestamp",
+    "repair_sessions",
+    "timestamp_to_year",
+    "widen_to_months",
+]
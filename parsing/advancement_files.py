@@ -0,0 +1,85 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from tqdm import tqdm
+
+from .common import dump_json, load_json, parse_timestamp
+
+CACHE_FILENAME = "advancements_cache.json"
+
+
+def parse_advancement_file(path: Path) -> list[tuple[str, float]]:
+    """Returns (adv_name, complete_time) for every completed non-recipe advancement"""
+    data: dict[str, dict] = load_json(path)
+
+    # Collect criterion times first, skipping entries we would discard anyway
+    completed: list[tuple[str, list[str]]] = []
+    for adv_name, details in data.items():
+        if (
+            adv_name == "DataVersion"
+            or ":recipes/" in adv_name
+            or not details.get("done", False)
+        ):
+            continue
+        completed.append((adv_name, list(details["criteria"].values())))
+
+    # Criteria are often granted together, so parse each distinct string once
+    unique_times = {t for _, times in completed for t in times}
+    parsed = {t: parse_timestamp(t) for t in unique_times}
+
+    return [
+        (adv_name, max(parsed[t] for t in times))
+        for adv_name, times in completed
+        if times
+    ]
+
+
+def _parse_with_path(path: Path) -> tuple[Path, list[tuple[str, float]]]:
+    return path, parse_advancement_file(path)
+
+
+def load_advancement_files(
+    adv_dir: Path, max_workers: int | None = None
+) -> dict[str, list[tuple[str, float]]]:
+    """Parse every advancement file in adv_dir in parallel, keyed by uuid
+
+    Parsed results are cached next to adv_dir and reused while a file's
+    mtime is unchanged.
+    """
+    cache_path = adv_dir.parent / CACHE_FILENAME
+    cache: dict[str, dict] = load_json(cache_path) if cache_path.exists() else {}
+
+    results: dict[str, list[tuple[str, float]]] = {}
+    mtimes: dict[Path, float] = {}
+    stale: list[Path] = []
+    for adv_file in adv_dir.glob("*.json"):
+        mtime = os.stat(adv_file).st_mtime
+        entry = cache.get(adv_file.name)
+        if entry is not None and entry["mtime"] == mtime:
+            results[adv_file.stem] = [tuple(adv) for adv in entry["advancements"]]
+        else:
+            mtimes[adv_file] = mtime
+            stale.append(adv_file)
+
+    if stale:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            parsed = executor.map(_parse_with_path, stale, chunksize=16)
+            for adv_file, advancements in tqdm(
+                parsed,
+                total=len(stale),
+                desc=f"Parsing {adv_dir.parent.name} advancements",
+            ):
+                results[adv_file.stem] = advancements
+                cache[adv_file.name] = {
+                    "mtime": mtimes[adv_file],
+                    "advancements": advancements,
+                }
+
+    if stale or len(cache) != len(results):
+        # Drop entries for files that no longer exist
+        current = {f"{uuid}.json" for uuid in results}
+        cache = {name: entry for name, entry in cache.items() if name in current}
+        dump_json(cache, cache_path)
+
+    return results
@@ -0,0 +1,105 @@
+import argparse
+import json
+from datetime import datetime
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, fall back to the stdlib parser
+    orjson = None
+
+
+def parse_timestamp(timestr: str) -> float:
+    """Convert datetime string to Unix timestamp"""
+    if "+" in timestr:
+        dt = datetime.strptime(timestr, "%Y-%m-%d %H:%M:%S %z")
+    else:
+        dt = datetime.strptime(timestr, "%Y-%m-%d %H:%M:%S")
+        dt = dt.replace(tzinfo=ZoneInfo("Asia/Shanghai"))
+    return dt.timestamp()
+
+
+def timestamp_to_year(ts: float) -> int:
+    """Convert Unix timestamp to year"""
+    return datetime.fromtimestamp(ts, tz=ZoneInfo("Asia/Shanghai")).year
+
+
+def format_date(ts: float) -> str:
+    """Convert Unix timestamp to a YYYY-MM-DD date in UTC+8"""
+    return datetime.fromtimestamp(ts, tz=ZoneInfo("Asia/Shanghai")).strftime("%Y-%m-%d")
+
+
+def format_month(ts: float) -> str:
+    """Convert Unix timestamp to a YYYY-MM month in UTC+8"""
+    return datetime.fromtimestamp(ts, tz=ZoneInfo("Asia/Shanghai")).strftime("%Y-%m")
+
+
+def parse_date(date_str: str) -> float:
+    """Convert a YYYY-MM-DD date in UTC+8 to the Unix timestamp of its midnight"""
+    return parse_timestamp(f"{date_str} 00:00:00")
+
+
+def get_time_window(args: argparse.Namespace) -> tuple[float | None, float | None]:
+    """Returns the [since, until) window selected by --year/--since/--until"""
+    since = until = None
+    if args.year is not None:
+        since = parse_date(f"{args.year}-01-01")
+        until = parse_date(f"{args.year + 1}-01-01")
+    if args.since is not None:
+        since = parse_date(args.since)
+    if args.until is not None:
+        # --until is inclusive of the whole day
+        until = parse_date(args.until) + 24 * 60 * 60
+    return since, until
+
+
+def widen_to_months(
+    since: float | None, until: float | None
+) -> tuple[float | None, float | None]:
+    """Widen [since, until) to whole months in UTC+8"""
+    if since is not None:
+        since = parse_date(f"{format_month(since)}-01")
+    if until is not None:
+        year, month = map(int, format_month(until - 1).split("-"))
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+        until = parse_date(f"{year:04d}-{month:02d}-01")
+    return since, until
+
+
+def add_time_window_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--year", type=int, help="only include this year")
+    parser.add_argument("--since", help="only include data from this date (YYYY-MM-DD)")
+    parser.add_argument(
+        "--until", help="only include data up to and including this date (YYYY-MM-DD)"
+    )
+
+
+def in_window(ts: float, since: float | None, until: float | None) -> bool:
+    return (since is None or ts >= since) and (until is None or ts < until)
+
+
+def date_in_window(date_str: str, since: float | None, until: float | None) -> bool:
+    """Whether any part of the given YYYY-MM-DD day falls inside the window"""
+    day_start = parse_date(date_str)
+    return (since is None or day_start + 24 * 60 * 60 > since) and (
+        until is None or day_start < until
+    )
+
+
+def load_json(path: Path):
+    """Load a JSON file, using orjson when it is installed"""
+    if orjson is not None:
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def dump_json(data, path: Path) -> None:
+    if orjson is not None:
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(data))
+        return
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
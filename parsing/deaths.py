@@ -0,0 +1,163 @@
+# Vanilla death message templates (after the player name) and their causes.
+# {killer} and {item} stand for one or more words.
+DEATH_TEMPLATES = {
+    "was slain by {killer}": "slain",
+    "was slain by {killer} using {item}": "slain",
+    "was shot by {killer}": "shot",
+    "was shot by {killer} using {item}": "shot",
+    "was shot by a skull from {killer}": "wither_skull",
+    "was fireballed by {killer}": "fireball",
+    "was fireballed by {killer} using {item}": "fireball",
+    "was pummeled by {killer}": "thrown",
+    "was pummeled by {killer} using {item}": "thrown",
+    "was impaled by {killer}": "trident",
+    "was impaled by {killer} with {item}": "trident",
+    "was killed by {killer} using magic": "magic",
+    "was killed by {killer} using {item}": "magic",
+    "was killed by magic": "magic",
+    "was killed by magic whilst trying to escape {killer}": "magic",
+    "was killed by even more magic": "magic",
+    "was killed while trying to hurt {killer}": "thorns",
+    "was killed by [Intentional Game Design]": "bad_respawn_point",
+    "was killed": "generic",
+    "died": "generic",
+    "died because of {killer}": "generic",
+    "blew up": "explosion",
+    "was blown up by {killer}": "explosion",
+    "was blown up by {killer} using {item}": "explosion",
+    "hit the ground too hard": "fall",
+    "hit the ground too hard whilst trying to escape {killer}": "fall",
+    "fell from a high place": "fall",
+    "fell off a ladder": "fall",
+    "fell off some vines": "fall",
+    "fell off some weeping vines": "fall",
+    "fell off some twisting vines": "fall",
+    "fell off scaffolding": "fall",
+    "fell while climbing": "fall",
+    "was doomed to fall": "fall",
+    "was doomed to fall by {killer}": "fall",
+    "was doomed to fall by {killer} using {item}": "fall",
+    "fell too far and was finished by {killer}": "fall",
+    "fell too far and was finished by {killer} using {item}": "fall",
+    "experienced kinetic energy": "fly_into_wall",
+    "experienced kinetic energy whilst trying to escape {killer}": "fly_into_wall",
+    "drowned": "drowning",
+    "drowned whilst trying to escape {killer}": "drowning",
+    "died from dehydration": "dehydration",
+    "died from dehydration whilst trying to escape {killer}": "dehydration",
+    "went up in flames": "fire",
+    "walked into fire whilst fighting {killer}": "fire",
+    "burned to death": "fire",
+    "was burnt to a crisp whilst fighting {killer}": "fire",
+    "tried to swim in lava": "lava",
+    "tried to swim in lava to escape {killer}": "lava",
+    "discovered the floor was lava": "hot_floor",
+    "walked into the danger zone due to {killer}": "hot_floor",
+    "was struck by lightning": "lightning",
+    "was struck by lightning whilst fighting {killer}": "lightning",
+    "suffocated in a wall": "suffocation",
+    "suffocated in a wall whilst fighting {killer}": "suffocation",
+    "was squished too much": "cramming",
+    "was squashed by {killer}": "cramming",
+    "was squashed by a falling anvil": "falling_block",
+    "was squashed by a falling anvil whilst fighting {killer}": "falling_block",
+    "was squashed by a falling block": "falling_block",
+    "was squashed by a falling block whilst fighting {killer}": "falling_block",
+    "was skewered by a falling stalactite": "falling_block",
+    "was skewered by a falling stalactite whilst fighting {killer}": "falling_block",
+    "was impaled on a stalagmite": "stalagmite",
+    "was impaled on a stalagmite whilst fighting {killer}": "stalagmite",
+    "was pricked to death": "cactus",
+    "walked into a cactus whilst trying to escape {killer}": "cactus",
+    "was poked to death by a sweet berry bush": "sweet_berry_bush",
+    "was poked to death by a sweet berry bush whilst trying to escape {killer}": (
+        "sweet_berry_bush"
+    ),
+    "was stung to death": "sting",
+    "was stung to death by {killer}": "sting",
+    "starved to death": "starvation",
+    "starved to death whilst fighting {killer}": "starvation",
+    "withered away": "wither",
+    "withered away whilst fighting {killer}": "wither",
+    "froze to death": "freezing",
+    "was frozen to death by {killer}": "freezing",
+    "was roasted in dragon's breath": "dragon_breath",
+    "was roasted in dragon's breath by {killer}": "dragon_breath",
+    "went off with a bang": "fireworks",
+    "went off with a bang whilst fighting {killer}": "fireworks",
+    "went off with a bang due to a firework fired from {item} by {killer}": (
+        "fireworks"
+    ),
+    "was obliterated by a sonically-charged shriek": "sonic_boom",
+    "was obliterated by a sonically-charged shriek whilst trying to escape {killer}": (
+        "sonic_boom"
+    ),
+    "fell out of the world": "void",
+    "didn't want to live in the same world as {killer}": "void",
+    "left the confines of this world": "world_border",
+    "left the confines of this world whilst fighting {killer}": "world_border",
+}
+UNKNOWN_CAUSE = "unknown"
+SLOTS = ("{killer}", "{item}")
+
+
+class TemplateNode:
+    __slots__ = ("children", "slot", "slot_name", "cause")
+
+    def __init__(self) -> None:
+        self.children: dict[str, TemplateNode] = {}
+        self.slot: TemplateNode | None = None
+        self.slot_name: str | None = None
+        self.cause: str | None = None
+
+
+class DeathClassifier:
+    """Maps death messages to (cause, killer) with a word trie over the templates
+
+    Literal words are followed before placeholders, and a placeholder takes
+    as few words as possible, so "was slain by Piglin Brute using [Axe]"
+    gives killer "Piglin Brute". Results are cached per distinct message.
+    """
+
+    def __init__(self, templates: dict[str, str] = DEATH_TEMPLATES) -> None:
+        self.root = TemplateNode()
+        self.cache: dict[str, tuple[str, str | None]] = {}
+        for template, cause in templates.items():
+            node = self.root
+            for word in template.split(" "):
+                if word in SLOTS:
+                    if node.slot is None:
+                        node.slot = TemplateNode()
+                        node.slot_name = word
+                    elif node.slot_name != word:
+                        raise ValueError(f"Ambiguous placeholders in {template!r}")
+                    node = node.slot
+                else:
+                    node = node.children.setdefault(word, TemplateNode())
+            node.cause = cause
+
+    def _match(
+        self, words: list[str], i: int, node: TemplateNode, killer: str | None
+    ) -> tuple[str, str | None] | None:
+        if i == len(words):
+            return (node.cause, killer) if node.cause is not None else None
+
+        if (child := node.children.get(words[i])) is not None:
+            if result := self._match(words, i + 1, child, killer):
+                return result
+
+        if node.slot is not None:
+            for j in range(i + 1, len(words) + 1):
+                value = " ".join(words[i:j]) if node.slot_name == "{killer}" else None
+                if result := self._match(words, j, node.slot, value or killer):
+                    return result
+        return None
+
+    def classify(self, message: str) -> tuple[str, str | None]:
+        """Returns (cause, killer name or None), with cause "unknown" if no template fits"""
+        result = self.cache.get(message)
+        if result is None:
+            words = message.strip().split(" ")
+            result = self._match(words, 0, self.root, None) or (UNKNOWN_CAUSE, None)
+            self.cache[message] = result
+        return result
@@ -0,0 +1,167 @@
+from array import array
+
+import numpy as np
+import pandas as pd
+
+
+class Interner:
+    """Map repeated strings (servers, uuids, death messages) to integer codes"""
+
+    def __init__(self) -> None:
+        self.codes: dict[str, int] = {}
+        self.values: list[str] = []
+
+    def intern(self, value: str) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self.codes[value] = code
+            self.values.append(value)
+        return code
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+class StringArena:
+    """Store many unique strings as one utf-8 buffer plus offsets"""
+
+    def __init__(self) -> None:
+        self.data = bytearray()
+        self.offsets = array("q", [0])
+
+    def append(self, value: str) -> None:
+        self.data += value.encode("utf-8")
+        self.offsets.append(len(self.data))
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def to_numpy(self) -> np.ndarray:
+        """Decode all strings into an object array"""
+        data = bytes(self.data)
+        offsets = self.offsets
+        result = np.empty(len(self), dtype=object)
+        for i in range(len(self)):
+            result[i] = data[offsets[i] : offsets[i + 1]].decode("utf-8")
+        return result
+
+
+class EventBuffer:
+    """Columnar, append-only buffer for one event table
+
+    Each column is one of:
+        - "category": interned integer codes (array('i')), shared interner
+        - "float": array('d')
+        - "text": StringArena, for mostly unique strings like chat content
+    """
+
+    def __init__(self, columns: dict[str, str], interners: dict[str, Interner]) -> None:
+        self.columns = columns
+        self.interners = interners
+        self.data: dict[str, array | StringArena] = {}
+        for name, kind in columns.items():
+            if kind == "category":
+                self.data[name] = array("i")
+            elif kind == "float":
+                self.data[name] = array("d")
+            elif kind == "text":
+                self.data[name] = StringArena()
+            else:
+                raise ValueError(f"Unknown column kind: {kind}")
+
+    def append(self, *row) -> None:
+        for (name, kind), value in zip(self.columns.items(), row):
+            column = self.data[name]
+            if kind == "category":
+                # Missing values become NaN in the DataFrame
+                column.append(
+                    -1 if value is None else self.interners[name].intern(value)
+                )
+            else:
+                column.append(value)
+
+    def __len__(self) -> int:
+        first = next(iter(self.columns))
+        return len(self.data[first])
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """Convert to a DataFrame, sharing numeric buffers where possible"""
+        frame = {}
+        for name, kind in self.columns.items():
+            column = self.data[name]
+            if kind == "category":
+                codes = np.frombuffer(column, dtype=np.int32)
+                categories = pd.Index(self.interners[name].values, dtype=object)
+                frame[name] = pd.Categorical.from_codes(codes, categories=categories)
+            elif kind == "float":
+                frame[name] = np.frombuffer(column, dtype=np.float64)
+            else:
+                frame[name] = column.to_numpy()
+        return pd.DataFrame(frame, copy=False)
+
+
+class EventBuffers:
+    """All stage-2 output tables, sharing interners for server names and uuids"""
+
+    def __init__(self) -> None:
+        servers = Interner()
+        uuids = Interner()
+        self.sessions = EventBuffer(
+            {
+                "server_name": "category",
+                "uuid": "category",
+                "join_timestamp": "float",
+                "play_time": "float",
+                # "quit", "restart" or "end"; only used to repair sessions
+                "closed_by": "category",
+            },
+            {"server_name": servers, "uuid": uuids, "closed_by": Interner()},
+        )
+        self.deaths = EventBuffer(
+            {
+                "server_name": "category",
+                "uuid": "category",
+                "by": "category",
+                "cause": "category",
+                "killer": "category",
+                "timestamp": "float",
+            },
+            {
+                "server_name": servers,
+                "uuid": uuids,
+                "by": Interner(),
+                "cause": Interner(),
+                "killer": Interner(),
+            },
+        )
+        self.messages = EventBuffer(
+            {
+                "server_name": "category",
+                "uuid": "category",
+                "content": "text",
+                "timestamp": "float",
+            },
+            {"server_name": servers, "uuid": uuids},
+        )
+        self.advancements = EventBuffer(
+            {
+                "server_name": "category",
+                "uuid": "category",
+                "advancement_name": "category",
+                "timestamp": "float",
+            },
+            {"server_name": servers, "uuid": uuids, "advancement_name": Interner()},
+        )
+        self.uptime = EventBuffer(
+            {
+                "server_name": "category",
+                "start_timestamp": "float",
+                "end_timestamp": "float",
+            },
+            {"server_name": servers},
+        )
+        self.activity_gaps = EventBuffer(
+            {"server_name": "category", "gap_start": "float"},
+            {"server_name": servers},
+        )
@@ -0,0 +1,54 @@
+from pathlib import Path
+
+from .common import dump_json, load_json
+
+IDENTITY_PATH = Path("data/players.json")
+
+
+class PlayerIdentities:
+    """Persistent table of every player's uuid, known names and servers
+
+    Stored as {uuid: {"names": {name: [first_seen, last_seen]},
+    "servers": {server: [first_seen, last_seen]}}}. Stages 1 and 2 add what
+    they observe and save it, so later runs and other stages start from it.
+    """
+
+    def __init__(self, players: dict[str, dict] | None = None) -> None:
+        self.players: dict[str, dict] = players if players is not None else {}
+
+    @classmethod
+    def load(cls, path: Path = IDENTITY_PATH) -> "PlayerIdentities":
+        return cls(load_json(path) if path.exists() else None)
+
+    def save(self, path: Path = IDENTITY_PATH) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        dump_json(self.players, path)
+
+    def observe(self, uuid: str, name: str, server: str, timestamp: float) -> None:
+        """Record that uuid used name on server at timestamp"""
+        player = self.players.setdefault(uuid, {"names": {}, "servers": {}})
+        for key, seen in [("names", name), ("servers", server)]:
+            span = player[key].get(seen)
+            if span is None:
+                player[key][seen] = [timestamp, timestamp]
+            else:
+                span[0] = min(span[0], timestamp)
+                span[1] = max(span[1], timestamp)
+
+    def latest_names(self) -> dict[str, str]:
+        """uuid -> the name it was last seen with"""
+        return {
+            uuid: max(player["names"].items(), key=lambda item: item[1][1])[0]
+            for uuid, player in self.players.items()
+        }
+
+    def server_names(self, server: str) -> dict[str, str]:
+        """name -> uuid for players seen on server, preferring the latest user of a name"""
+        names: dict[str, tuple[float, str]] = {}
+        for uuid, player in self.players.items():
+            if server not in player["servers"]:
+                continue
+            for name, (_, last_seen) in player["names"].items():
+                if name not in names or last_seen >= names[name][0]:
+                    names[name] = (last_seen, uuid)
+        return {name: uuid for name, (_, uuid) in names.items()}
@@ -0,0 +1,74 @@
+import re
+from typing import Iterable
+
+from .patterns import (
+    DEATH_EXCLUDE_PATTERN,
+    DEATH_MESSAGE_BASE,
+    PLAYER_ADVANCEMENT_PATTERN,
+    PLAYER_ADVANCEMENT_PATTERN_ALT,
+    PLAYER_CHAT_PATTERN,
+    PLAYER_COMMAND_PATTERN,
+    PLAYER_JOIN_PATTERN,
+    PLAYER_QUIT_PATTERN,
+    PLAYER_UUID_MAPPING_PATTERN,
+    PLAYER_UUID_MAPPING_PATTERN_ALT,
+    SERVER_DONE_PATTERN,
+)
+
+
+def find_uuid_mapping(line: str) -> tuple[str, str] | None:
+    """Returns (player, uuid) if the line maps a player name to a UUID"""
+    match = re.search(PLAYER_UUID_MAPPING_PATTERN, line) or re.search(
+        PLAYER_UUID_MAPPING_PATTERN_ALT, line
+    )
+    return match.groups() if match else None
+
+
+class RelevanceFilter:
+    """The stage-1 filter: keeps server starts and lines naming a known player
+
+    Names are learned from UUID mapping lines as they pass through.
+    """
+
+    def __init__(self, player_names: Iterable[str] = ()) -> None:
+        self.player_names: set[str] = set(player_names)
+
+    def is_relevant(self, line: str) -> bool:
+        if mapping := find_uuid_mapping(line):
+            self.player_names.add(mapping[0])
+            return True
+        if re.search(SERVER_DONE_PATTERN, line):
+            return True
+        return any(player in line for player in self.player_names)
+
+
+def classify_line(
+    line: str, need_advancements: bool = True
+) -> tuple[str, tuple[str, ...]] | None:
+    """Returns (kind, fields) for a line with an event stage 2 handles, else None
+
+    Kinds and their fields are "done" (), "join" (player,), "quit" (player,),
+    "chat" (player, content), "command" (player, command), "advancement"
+    (player, name) and "death" (player, message). Checks run in this order,
+    so a line is only a death when nothing else matched.
+    """
+    if re.search(SERVER_DONE_PATTERN, line):
+        return ("done", ())
+    if match := re.search(PLAYER_JOIN_PATTERN, line):
+        return ("join", (match.group(1),))
+    if match := re.search(PLAYER_QUIT_PATTERN, line):
+        return ("quit", (match.group(1),))
+    if match := re.search(PLAYER_CHAT_PATTERN, line):
+        return ("chat", (match.group(2), match.group(3)))
+    if match := re.search(PLAYER_COMMAND_PATTERN, line):
+        return ("command", match.groups())
+    if need_advancements and (
+        match := re.search(PLAYER_ADVANCEMENT_PATTERN, line)
+        or re.search(PLAYER_ADVANCEMENT_PATTERN_ALT, line)
+    ):
+        return ("advancement", match.groups())
+    if match := re.search(DEATH_MESSAGE_BASE, line):
+        player, message = match.groups()
+        if not re.search(DEATH_EXCLUDE_PATTERN, message):
+            return ("death", (player, message))
+    return None
@@ -0,0 +1,204 @@
+import asyncio
+import os
+import re
+from collections import Counter
+from pathlib import Path
+from typing import AsyncIterator, BinaryIO
+
+from .common import format_date, parse_timestamp
+from .deaths import DeathClassifier
+from .identity import PlayerIdentities
+from .lines import RelevanceFilter, classify_line, find_uuid_mapping
+from .names import NameIndex
+from .patterns import LOG_TIME_PATTERN
+from .sinks import EventSink, SinkDispatcher
+
+DAY = 24 * 60 * 60
+# Bytes read from a file before other files get a turn
+READ_SIZE = 1 << 20
+# How far ahead of the clock a log time may be before it's taken as yesterday's
+CLOCK_SKEW = 60
+
+
+def open_log(path: Path) -> BinaryIO | None:
+    try:
+        return open(path, "rb")
+    except FileNotFoundError:
+        return None
+
+
+async def follow(
+    path: Path, poll_interval: float = 1.0, from_start: bool = True
+) -> AsyncIterator[str]:
+    """Yield lines as they are appended to path, forever
+
+    The file is polled, which costs one read and one stat per interval while
+    it's idle, so one event loop can follow many files. When path is
+    replaced by a new file, as on log rotation, the rest of the old file is
+    read before the new one is opened; when it shrinks, it is read again
+    from the start. A line is only yielded once its newline was written.
+    """
+    f = None
+    pending = b""
+    try:
+        while True:
+            if f is None and (f := open_log(path)) is not None:
+                if not from_start:
+                    f.seek(0, os.SEEK_END)
+                # Files that appear later are read whole
+                from_start = True
+
+            if f is not None:
+                chunk = f.read(READ_SIZE)
+                if chunk:
+                    *lines, pending = (pending + chunk).split(b"\n")
+                    for line in lines:
+                        yield line.decode("utf-8", errors="replace") + "\n"
+                    if len(chunk) == READ_SIZE:
+                        await asyncio.sleep(0)
+                        continue
+                else:
+                    try:
+                        stat = os.stat(path)
+                    except FileNotFoundError:
+                        stat = None
+                    if stat is None or stat.st_ino != os.fstat(f.fileno()).st_ino:
+                        # Everything the old file will ever have was read
+                        if pending:
+                            yield pending.decode("utf-8", errors="replace") + "\n"
+                        f.close()
+                        f = None
+                        pending = b""
+                        continue
+                    if stat.st_size < f.tell():
+                        f.seek(0)
+                        pending = b""
+                        continue
+
+            await asyncio.sleep(poll_interval)
+    finally:
+        if f is not None:
+            f.close()
+
+
+class LiveTotals(EventSink):
+    """Running sessions, playtime, chat messages and deaths per server and player"""
+
+    def __init__(self) -> None:
+        self.sessions: Counter[tuple[str, str]] = Counter()
+        self.play_time: Counter[tuple[str, str]] = Counter()
+        self.messages: Counter[tuple[str, str]] = Counter()
+        self.deaths: Counter[tuple[str, str]] = Counter()
+
+    def on_session(
+        self, server: str, uuid: str, join_timestamp: float, play_time: float
+    ) -> None:
+        self.sessions[(server, uuid)] += 1
+        self.play_time[(server, uuid)] += play_time
+
+    def on_chat(self, server: str, uuid: str, content: str, timestamp: float) -> None:
+        self.messages[(server, uuid)] += 1
+
+    def on_death(
+        self, server: str, uuid: str, message: str, cause: str, timestamp: float
+    ) -> None:
+        self.deaths[(server, uuid)] += 1
+
+
+class LiveServer:
+    """Stages 1 and 2 for the lines of one server's latest.log, one line at a time
+
+    Lines pass the same RelevanceFilter and classify_line as the batch
+    stages, and session, chat, death and command events go to sinks.
+    Players online right now are kept in online, by name.
+    """
+
+    def __init__(
+        self,
+        server: str,
+        sinks: SinkDispatcher,
+        identities: PlayerIdentities | None = None,
+        classifier: DeathClassifier | None = None,
+    ) -> None:
+        known = identities.server_names(server) if identities is not None else {}
+        self.server = server
+        self.sinks = sinks
+        self.filter = RelevanceFilter(known)
+        self.names = NameIndex()
+        for player, uuid in known.items():
+            self.names.add(player, uuid, None)
+        self.classifier = classifier if classifier is not None else DeathClassifier()
+        self.online: dict[str, float] = {}
+        self.up_since: float | None = None
+
+    def timestamp(self, time_str: str, now: float) -> float:
+        # latest.log only has times of day, and is rotated every day
+        timestamp = parse_timestamp(f"{format_date(now)} {time_str}")
+        if timestamp > now + CLOCK_SKEW:
+            timestamp -= DAY
+        return timestamp
+
+    def end_session(self, player: str, timestamp: float) -> None:
+        join_time = self.online.pop(player)
+        uuid = self.names.resolve(player, join_time)
+        for handler in self.sinks.session:
+            handler(self.server, uuid, join_time, timestamp - join_time)
+
+    def feed(self, line: str, now: float) -> None:
+        """Handle one log line read at now"""
+        if mapping := find_uuid_mapping(line):
+            self.filter.player_names.add(mapping[0])
+        elif not self.filter.is_relevant(line):
+            return
+
+        time_match = re.search(LOG_TIME_PATTERN, line)
+        if not time_match:
+            return
+        timestamp = self.timestamp(time_match.group(1), now)
+        if mapping:
+            self.names.add(*mapping, timestamp)
+            return
+
+        # Advancements only matter for the batch stats
+        kind, fields = classify_line(line, need_advancements=False) or (None, ())
+        if kind == "done":
+            for player in list(self.online):
+                self.end_session(player, timestamp)
+            self.up_since = timestamp
+
+        elif kind == "join":
+            self.online[fields[0]] = timestamp
+
+        elif kind == "quit":
+            if fields[0] in self.online:
+                self.end_session(fields[0], timestamp)
+
+        elif kind == "chat":
+            player, content = fields
+            uuid = self.names.resolve(player, timestamp)
+            for handler in self.sinks.chat:
+                handler(self.server, uuid, content, timestamp)
+
+        elif kind == "command":
+            player, command = fields
+            uuid = self.names.resolve(player, timestamp)
+            for handler in self.sinks.command:
+                handler(self.server, uuid, command, timestamp)
+
+        elif kind == "death":
+            player, message = fields
+            if player in self.online:
+                cause, _ = self.classifier.classify(message)
+                uuid = self.names.resolve(player, timestamp)
+                for handler in self.sinks.death:
+                    handler(self.server, uuid, message, cause, timestamp)
+
+    def online_players(self) -> list[dict]:
+        return [
+            {
+                "player_name": player,
+                "uuid": self.names.resolve(player, join_time),
+                "join_timestamp": join_time,
+            }
+            for player, join_time in sorted(self.online.items())
+        ]
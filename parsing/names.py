@@ -0,0 +1,44 @@
+from bisect import bisect_right
+
+
+class NameIndex:
+    """Time-versioned player name -> uuid index
+
+    Each name keeps the timestamps at which it started mapping to a uuid, sorted,
+    so a name that later belongs to another player resolves by when it was used.
+    """
+
+    def __init__(self) -> None:
+        self.starts: dict[str, list[float]] = {}
+        self.uuids: dict[str, list[str]] = {}
+
+    def add(self, name: str, uuid: str, timestamp: float | None) -> None:
+        """Record that name mapped to uuid at timestamp
+
+        Mappings without a timestamp only help resolution, from the earliest time on.
+        """
+        starts = self.starts.setdefault(name, [])
+        uuids = self.uuids.setdefault(name, [])
+        at = float("-inf") if timestamp is None else timestamp
+
+        # Repeated mappings extend the interval they fall into, so only
+        # actual name changes add entries
+        i = bisect_right(starts, at)
+        if i > 0 and uuids[i - 1] == uuid:
+            pass
+        elif i < len(starts) and uuids[i] == uuid:
+            starts[i] = at
+        else:
+            starts.insert(i, at)
+            uuids.insert(i, uuid)
+
+    def resolve(self, name: str, timestamp: float) -> str:
+        """Get the uuid name mapped to at timestamp, or name itself if never mapped
+
+        Times before the first mapping resolve to the earliest uuid.
+        """
+        starts = self.starts.get(name)
+        if starts is None:
+            return name
+        i = bisect_right(starts, timestamp) - 1
+        return self.uuids[name][max(i, 0)]
@@ -0,0 +1,39 @@
+# Patterns for lines of filtered_logs.txt, which are prefixed with the log file name
+TIME_PATTERN = r"^(\d{4}-\d{2}-\d{2})-\d\.log\.gz: \[[^\[]*(\d{2}:\d{2}:\d{2}).*?\]"
+# The same for raw log lines, which only carry the time of day
+LOG_TIME_PATTERN = r"^\[[^\[]*(\d{2}:\d{2}:\d{2}).*?\]"
+SERVER_DONE_PATTERN = r": Done \(\d.*help"
+PLAYER_JOIN_PATTERN = r"(\S+?)\[\S+\] logged in with entity id \d+ at"
+PLAYER_QUIT_PATTERN = r"(\S+?) lost connection: (.*)"
+PLAYER_CHAT_PATTERN = r": (\[Not Secure\] )?<(\S+)> (.*)"
+PLAYER_COMMAND_PATTERN = r"\]: (\S+) issued server command: (.*)$"
+
+PLAYER_ADVANCEMENT_PATTERN = r"(\S+) has made the advancement \[(.*)\]"
+PLAYER_ADVANCEMENT_PATTERN_ALT = r"(\S+) has just earned the achievement \[(.*)\]"
+
+DEATH_MESSAGE_BASE = r"\]: (\S+) (.*)$"
+DEATH_EXCLUDE_PATTERNS = [
+    r"made the advancement",
+    r"has reached",
+    r"joined the game",
+    r"lost connection",
+    r"moved too quickly",
+    r"has completed",
+    r"has just earned",
+    r"moved wrongly",
+    r"issued server command",
+    r"was kicked",
+    r"is now sleeping",
+    r"forced -?\d+",
+    r"\(\d+",
+    r"is now AFK",
+    r"is no longer AFK",
+]
+DEATH_EXCLUDE_PATTERN = "|".join(DEATH_EXCLUDE_PATTERNS)
+
+PLAYER_UUID_MAPPING_PATTERN = (
+    r"UUID of player (\S+) is (\S{8}-\S{4}-\S{4}-\S{4}-\S{12})"
+)
+PLAYER_UUID_MAPPING_PATTERN_ALT = (
+    r"config to (\S+) \((\S{8}-\S{4}-\S{4}-\S{4}-\S{12})\)"
+)
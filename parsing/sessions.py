@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+
+# Seconds without any observed line after which a server is considered down
+MAX_ACTIVITY_GAP = 30 * 60
+# Seconds a player may stay silent at the end of a session that was never quit
+IDLE_TIMEOUT = 30 * 60
+
+
+def find_activity_gaps(
+    timestamps: np.ndarray, max_gap: float = MAX_ACTIVITY_GAP
+) -> np.ndarray:
+    """Times of the last line before each gap longer than max_gap"""
+    timestamps = np.sort(timestamps)
+    return timestamps[:-1][np.diff(timestamps) > max_gap]
+
+
+def repair_sessions(
+    sessions: pd.DataFrame,
+    gaps: pd.DataFrame,
+    events: list[pd.DataFrame],
+    idle_timeout: float = IDLE_TIMEOUT,
+) -> pd.DataFrame:
+    """Shorten sessions that were closed by a restart or the end of the logs
+
+    Such sessions usually mean the server crashed with players online. They
+    are capped at the server's first activity gap (server_name, gap_start)
+    after the player's last chat, death or advancement (server_name, uuid,
+    timestamp rows in events), then at idle_timeout after that event.
+    Sessions ended by a quit are left alone. Returns sessions without the
+    closed_by column.
+    """
+    end = (sessions["join_timestamp"] + sessions["play_time"]).to_numpy(copy=True)
+    rows = np.flatnonzero((sessions["closed_by"] != "quit").to_numpy())
+    suspect = sessions.iloc[rows][["server_name", "uuid", "join_timestamp"]].assign(
+        row=rows, end=end[rows]
+    )
+
+    # The player's last event in the session shows the server was still up
+    activity = pd.concat(
+        [df[["server_name", "uuid", "timestamp"]] for df in events], ignore_index=True
+    )
+    suspect = pd.merge_asof(
+        suspect.sort_values("end"),
+        activity.sort_values("timestamp"),
+        left_on="end",
+        right_on="timestamp",
+        by=["server_name", "uuid"],
+        direction="backward",
+    )
+    suspect["last_seen"] = np.fmax(suspect["timestamp"], suspect["join_timestamp"])
+
+    # Cap at the first gap in server activity after that, then trim trailing
+    # idle time
+    suspect = pd.merge_asof(
+        suspect.sort_values("last_seen"),
+        gaps.sort_values("gap_start"),
+        left_on="last_seen",
+        right_on="gap_start",
+        by="server_name",
+        direction="forward",
+    )
+    capped = np.fmin(suspect["end"], suspect["gap_start"])
+    end[suspect["row"].to_numpy()] = np.fmin(
+        capped, suspect["last_seen"] + idle_timeout
+    )
+
+    repaired = sessions.drop(columns="closed_by")
+    repaired["play_time"] = end - repaired["join_timestamp"].to_numpy()
+    return repaired
@@ -0,0 +1,150 @@
+import csv
+from collections import Counter
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from .common import format_month
+from .text import tokenize
+
+if TYPE_CHECKING:
+    from stats.sketches import PartitionSketch
+
+
+class EventSink:
+    """Consumer of the events found by the stage-2 parse pass
+
+    Subclasses override the handlers they need; handlers that aren't
+    overridden are never called. Players are passed by uuid. finish() is
+    called once after every server was processed.
+    """
+
+    def on_session(
+        self, server: str, uuid: str, join_timestamp: float, play_time: float
+    ) -> None:
+        pass
+
+    def on_chat(self, server: str, uuid: str, content: str, timestamp: float) -> None:
+        pass
+
+    def on_death(
+        self, server: str, uuid: str, message: str, cause: str, timestamp: float
+    ) -> None:
+        pass
+
+    def on_command(
+        self, server: str, uuid: str, command: str, timestamp: float
+    ) -> None:
+        pass
+
+    def finish(self) -> None:
+        pass
+
+
+class SinkDispatcher:
+    """Fans events out to the sinks that handle them"""
+
+    def __init__(self, sinks: list[EventSink]) -> None:
+        self.sinks = sinks
+        self.session = self.handlers("on_session")
+        self.chat = self.handlers("on_chat")
+        self.death = self.handlers("on_death")
+        self.command = self.handlers("on_command")
+
+    def handlers(self, name: str) -> list:
+        # Skipping the base class no-ops keeps unused events free
+        return [
+            getattr(sink, name)
+            for sink in self.sinks
+            if getattr(type(sink), name) is not getattr(EventSink, name)
+        ]
+
+    def finish(self) -> None:
+        for sink in self.sinks:
+            sink.finish()
+
+
+class DeathMessageHistogram(EventSink):
+    """Counts distinct death messages, for finding ones the classifier misses"""
+
+    def __init__(self, path: Path = Path("files/unique_death_messages.txt")) -> None:
+        self.path = path
+        self.counts: Counter[str] = Counter()
+
+    def on_death(
+        self, server: str, uuid: str, message: str, cause: str, timestamp: float
+    ) -> None:
+        self.counts[message] += 1
+
+    def finish(self) -> None:
+        with open(self.path, "w", encoding="utf-8") as f:
+            for message, count in sorted(
+                self.counts.items(), key=lambda x: (-x[1], x[0])
+            ):
+                f.write(f"[{count:4d}] {message}\n")
+        print(f"Wrote {len(self.counts)} unique death messages to {self.path}")
+
+
+class CommandUsage(EventSink):
+    """Counts uses of each command per server, by its first word"""
+
+    def __init__(self, path: Path = Path("data/command_usage.csv")) -> None:
+        self.path = path
+        self.counts: Counter[tuple[str, str]] = Counter()
+
+    def on_command(
+        self, server: str, uuid: str, command: str, timestamp: float
+    ) -> None:
+        self.counts[(server, command.split(" ", 1)[0])] += 1
+
+    def finish(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["server_name", "command", "uses"])
+            for (server, command), uses in sorted(
+                self.counts.items(), key=lambda x: (x[0][0], -x[1], x[0][1])
+            ):
+                writer.writerow([server, command, uses])
+
+
+class SketchBuilder(EventSink):
+    """Keeps a bounded-memory sketch of players and chat words per server and month
+
+    The sketches are defined and stored by stats.sketches, which is only
+    imported once this sink is used.
+    """
+
+    def __init__(self, base_path: Path = Path("data")) -> None:
+        self.base_path = base_path
+        self.sketches: dict[tuple[str, str], "PartitionSketch"] = {}
+
+    def sketch(self, server: str, timestamp: float) -> "PartitionSketch":
+        from stats.sketches import PartitionSketch
+
+        key = (server, format_month(timestamp))
+        if key not in self.sketches:
+            self.sketches[key] = PartitionSketch()
+        return self.sketches[key]
+
+    def on_session(
+        self, server: str, uuid: str, join_timestamp: float, play_time: float
+    ) -> None:
+        self.sketch(server, join_timestamp).players.add(uuid)
+
+    def on_chat(self, server: str, uuid: str, content: str, timestamp: float) -> None:
+        words = self.sketch(server, timestamp).words
+        for word in tokenize(content):
+            words.add(word)
+
+    def finish(self) -> None:
+        from stats.sketches import write_sketches
+
+        write_sketches(self.sketches, self.base_path)
+
+
+# Sinks that can be enabled by name in stage 2
+SINKS: dict[str, type[EventSink]] = {
+    "commands": CommandUsage,
+    "death_messages": DeathMessageHistogram,
+    "sketches": SketchBuilder,
+}
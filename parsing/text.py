@@ -0,0 +1,43 @@
+import functools
+import re
+
+try:
+    import jieba
+except ImportError:  # jieba is optional, CJK runs fall back to character bigrams
+    jieba = None
+
+# Kana, CJK ideographs and hangul
+CJK = "\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff"
+# A run of CJK characters, or a run of other letters and digits
+TOKEN_PATTERN = re.compile(rf"([{CJK}]+)|((?:(?![{CJK}])[^\W_])+)")
+WORD_PATTERN = re.compile(r"[^\W_]+")
+# CJK runs up to this length are kept whole when jieba isn't installed
+MAX_CJK_WORD = 4
+
+
+def split_cjk(run: str) -> list[str]:
+    if jieba is not None:
+        return jieba.lcut(run)
+    if len(run) <= MAX_CJK_WORD:
+        return [run]
+    return [run[i : i + 2] for i in range(len(run) - 1)]
+
+
+@functools.lru_cache(maxsize=1 << 16)
+def tokenize(text: str) -> tuple[str, ...]:
+    """Lowercased words of a chat message, with CJK text split into words"""
+    text = text.lower()
+    # Single letters and numbers are noise
+    if text.isascii():
+        return tuple(
+            word
+            for word in WORD_PATTERN.findall(text)
+            if len(word) > 1 and not word.isdigit()
+        )
+    tokens = []
+    for cjk, word in TOKEN_PATTERN.findall(text):
+        if cjk:
+            tokens.extend(split_cjk(cjk))
+        elif len(word) > 1 and not word.isdigit():
+            tokens.append(word)
+    return tuple(tokens)
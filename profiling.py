@@ -0,0 +1,136 @@
+import argparse
+import functools
+import json
+import resource
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from types import ModuleType
+
+# ru_maxrss is in kilobytes on Linux and bytes on macOS
+RSS_SCALE = 1 if sys.platform == "darwin" else 1024
+
+
+def peak_rss_mb() -> float:
+    """Peak resident memory of this process so far"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * RSS_SCALE / 1e6
+
+
+class Profiler:
+    """Collects wall/CPU time, counters and peak memory for stages, servers and functions
+
+    Disabled by default, in which case every method is a cheap no-op.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.stage: str | None = None
+        self.output_path: Path | None = None
+        self.records: list[dict] = []
+        self._active: list[dict] = []
+        self._stage_start: tuple[float, float] | None = None
+
+    def enable(self, stage: str, output_path: Path) -> None:
+        self.enabled = True
+        self.stage = stage
+        self.output_path = output_path
+        self._stage_start = (time.perf_counter(), time.process_time())
+
+    @contextmanager
+    def measure(self, kind: str, name: str, **fields):
+        """Time a block; counters added with add() inside it land in its record"""
+        if not self.enabled:
+            yield {}
+            return
+
+        record = {"kind": kind, "name": name, **fields}
+        self._active.append(record)
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        try:
+            yield record
+        finally:
+            record["wall_seconds"] = round(time.perf_counter() - wall, 6)
+            record["cpu_seconds"] = round(time.process_time() - cpu, 6)
+            record["peak_rss_mb"] = round(peak_rss_mb(), 1)
+            self._active.pop()
+            self.records.append(record)
+
+    def add(self, **counters: int) -> None:
+        """Add counters such as lines or bytes_read to the innermost measured block"""
+        if not self.enabled or not self._active:
+            return
+        record = self._active[-1]
+        for key, value in counters.items():
+            record[key] = record.get(key, 0) + value
+
+    def wrap(self, func, kind: str, name: str | None = None):
+        name = name or f"{func.__module__}.{func.__name__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with self.measure(kind, name):
+                return func(*args, **kwargs)
+
+        wrapper.__wrapped_by_profiler__ = True
+        return wrapper
+
+    def patch(self, module: ModuleType | object) -> None:
+        """Wrap a module's get_* (stat) and write_*/create_* (frame) functions in place"""
+        if not self.enabled:
+            return
+        for attr in dir(module):
+            if attr.startswith("get_"):
+                kind = "stat"
+            elif attr.startswith(("write_", "create_")):
+                kind = "frame"
+            else:
+                continue
+            func = getattr(module, attr)
+            if not callable(func) or getattr(func, "__wrapped_by_profiler__", False):
+                continue
+            setattr(module, attr, self.wrap(func, kind))
+
+    def finish(self) -> None:
+        """Record the whole stage and write the JSON report"""
+        if not self.enabled or self.output_path is None:
+            return
+        wall, cpu = self._stage_start or (time.perf_counter(), time.process_time())
+        stage = {
+            "kind": "stage",
+            "name": self.stage,
+            "wall_seconds": round(time.perf_counter() - wall, 6),
+            "cpu_seconds": round(time.process_time() - cpu, 6),
+            "peak_rss_mb": round(peak_rss_mb(), 1),
+        }
+        for key in ["lines", "bytes_read"]:
+            values = [
+                r[key] for r in self.records if r["kind"] == "server" and key in r
+            ]
+            if values:
+                stage[key] = sum(values)
+
+        # Slowest first, so bottlenecks are at the top of each kind
+        records = sorted(self.records, key=lambda r: (r["kind"], -r["wall_seconds"]))
+        with open(self.output_path, "w", encoding="utf-8") as f:
+            json.dump({"stage": stage, "records": records}, f, indent=2)
+        print(f"Wrote profile to {self.output_path}")
+
+
+profiler = Profiler()
+
+
+def add_profile_argument(parser: argparse.ArgumentParser, stage: str) -> None:
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const=f"profile-{stage}.json",
+        metavar="PATH",
+        help=f"write a JSON timing report (default: profile-{stage}.json)",
+    )
+
+
+def setup_profiling(args: argparse.Namespace, stage: str) -> None:
+    if args.profile:
+        profiler.enable(stage, Path(args.profile))
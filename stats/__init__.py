@@ -2,11 +2,15 @@ from .overall.advancement import get_advancement_ranking, get_total_advancements
 from .overall.chat import (
     get_chat_ranking,
     get_chat_rate_ranking,
+    get_player_top_words,
+    get_top_phrases,
+    get_top_words,
     get_total_messages,
 )
 from .overall.deaths import (
     get_death_ranking,
     get_death_rate_ranking,
+    get_deaths_by_cause,
     get_pvp_kill_ranking,
     get_total_deaths,
 )
@@ -14,18 +18,26 @@ from .overall.playtime import (
     get_active_players,
     get_daily_playtime,
     get_hourly_playtime,
+    get_player_weekday_playtime,
     get_playtime_ranking,
+    get_server_hourly_playtime,
     get_server_playtime_ranking,
     get_server_variety_ranking,
     get_total_playtime,
     get_weekday_playtime,
 )
+from .overall.yearly import get_yearly_summary
 from .server.activity import (
     get_peak_concurrent_players,
     get_server_player_list,
     get_server_timeline,
+    get_server_uptime,
+)
+from .server.chat import (
+    get_server_chat_ranking,
+    get_server_chat_rate_ranking,
+    get_server_top_words,
 )
-from .server.chat import get_server_chat_ranking, get_server_chat_rate_ranking
 from .server.deaths import get_dangerous_server_ranking
 
 __all__ = [
@@ -37,6 +49,10 @@ __all__ = [
     "get_server_chat_ranking",
     "get_server_chat_rate_ranking",
     "get_total_messages",
+    "get_top_words",
+    "get_top_phrases",
+    "get_player_top_words",
+    "get_server_top_words",
     "get_pvp_kill_ranking",
     "get_advancement_ranking",
     "get_playtime_ranking",
@@ -47,9 +63,14 @@ __all__ = [
     "get_total_advancements",
     "get_peak_concurrent_players",
     "get_server_timeline",
+    "get_server_uptime",
     "get_total_deaths",
+    "get_deaths_by_cause",
     "get_daily_playtime",
     "get_hourly_playtime",
     "get_weekday_playtime",
+    "get_server_hourly_playtime",
+    "get_player_weekday_playtime",
     "get_server_playtime_ranking",
+    "get_yearly_summary",
 ]
@@ -0,0 +1,41 @@
+import argparse
+from pathlib import Path
+
+import stats
+from parsing import add_time_window_arguments, get_time_window
+
+from .common import load_dataframes
+from .export import ARROW_MIN_ROWS, export_stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m stats")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export = commands.add_parser(
+        "export", help="compute every stat once and write them to a bundle"
+    )
+    export.add_argument("--output", type=Path, default=Path("data/export"))
+    export.add_argument(
+        "--arrow-min-rows",
+        type=int,
+        default=ARROW_MIN_ROWS,
+        help="write results with this many rows as Arrow files (needs pyarrow)",
+    )
+    add_time_window_arguments(export)
+    args = parser.parse_args()
+
+    if args.command == "export":
+        since, until = get_time_window(args)
+        bundle = export_stats(
+            stats,
+            load_dataframes(since, until),
+            args.output,
+            since,
+            until,
+            args.arrow_min_rows,
+        )
+        print(f"Wrote {len(bundle['stats'])} stats to {args.output}")
+
+
+main()
@@ -0,0 +1,42 @@
+import pandas as pd
+
+from .cube import build_playtime_cube
+from .registry import aggregate
+
+
+@aggregate({"sessions": ["uuid", "play_time"]})
+def player_play_time(dfs: dict[str, pd.DataFrame]) -> pd.Series:
+    """Playtime seconds per uuid"""
+    return dfs["sessions"].groupby("uuid")["play_time"].sum()
+
+
+@aggregate({"sessions": ["server_name", "play_time"]})
+def server_play_time(dfs: dict[str, pd.DataFrame]) -> pd.Series:
+    """Playtime seconds per server"""
+    return dfs["sessions"].groupby("server_name")["play_time"].sum()
+
+
+@aggregate({"sessions": ["server_name", "uuid", "join_timestamp", "play_time"]})
+def playtime_cube(dfs: dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """build_playtime_cube() of the sessions"""
+    return build_playtime_cube(dfs["sessions"])
+
+
+@aggregate({"deaths": ["uuid"]})
+def player_deaths(dfs: dict[str, pd.DataFrame]) -> pd.Series:
+    return dfs["deaths"].groupby("uuid").size()
+
+
+@aggregate({"deaths": ["server_name"]})
+def server_deaths(dfs: dict[str, pd.DataFrame]) -> pd.Series:
+    return dfs["deaths"].groupby("server_name").size()
+
+
+@aggregate({"messages": ["uuid"]})
+def player_messages(dfs: dict[str, pd.DataFrame]) -> pd.Series:
+    return dfs["messages"].groupby("uuid").size()
+
+
+@aggregate({"messages": ["server_name"]})
+def server_messages(dfs: dict[str, pd.DataFrame]) -> pd.Series:
+    return dfs["messages"].groupby("server_name").size()
@@ -2,15 +2,103 @@ from pathlib import Path
 
 import pandas as pd
 
+from .partitions import (
+    PARTITIONED_TABLES,
+    TABLE_COLUMNS,
+    TEXT_COLUMNS,
+    load_partitioned_table,
+    load_summaries,
+    read_columns,
+    summarize,
+)
 
-def load_dataframes():
-    """Load all dataframes from CSV files"""
+TABLES = [*PARTITIONED_TABLES, "summaries", "servers", "player_names"]
+
+
+def load_dataframes(
+    since: float | None = None,
+    until: float | None = None,
+    tables: list[str] | None = None,
+    columns: dict[str, list[str]] | None = None,
+):
+    """Load all dataframes, from partitions if available, otherwise from CSV files
+
+    since/until only restrict partitioned tables; summaries cover every
+    month overlapping the range. tables limits which ones are loaded, and
+    columns which columns of a table are read, all of them by default.
+    """
+    base_path = Path("data")
+    wanted = set(TABLES if tables is None else tables)
+    columns = dict(columns or {})
+    if (base_path / "sessions").is_dir():
+        dfs = {
+            table: load_partitioned_table(
+                base_path, table, since, until, columns.get(table)
+            )
+            for table in PARTITIONED_TABLES
+            if table in wanted
+        }
+        if "summaries" in wanted:
+            dfs["summaries"] = load_summaries(
+                base_path, since, until, columns.get("summaries")
+            )
+    else:
+        # Summaries are computed from every column of every event table
+        if "summaries" in wanted:
+            wanted.update(PARTITIONED_TABLES)
+            columns = {}
+        dfs = {}
+        for table in ["deaths", "sessions", "messages", "advancements"]:
+            if table not in wanted:
+                continue
+            table_columns = columns.get(table)
+            if table_columns is not None:
+                # Row counts need at least one column
+                table_columns = [*table_columns, PARTITIONED_TABLES[table]]
+            df = read_columns(base_path / f"{table}.csv", table_columns)
+            # Columns added after the flat layout, like the death cause, are
+            # empty rather than missing
+            expected = table_columns or TABLE_COLUMNS[table]
+            missing = [column for column in expected if column not in df]
+            dfs[table] = df.reindex(columns=[*df.columns, *missing]).astype(
+                {column: str for column in missing if column in TEXT_COLUMNS}
+            )
+        # Flat data predates the uptime table
+        if "uptime" in wanted:
+            dfs["uptime"] = pd.DataFrame(columns=TABLE_COLUMNS["uptime"])
+        if "summaries" in wanted:
+            dfs["summaries"] = summarize(dfs)
+
+    for table in ["servers", "player_names"]:
+        if table in wanted:
+            dfs[table] = read_columns(base_path / f"{table}.csv", columns.get(table))
+    return dfs
+
+
+def table_files(table: str) -> list[Path]:
+    """Every file a table is loaded from, whichever layout data/ uses"""
     base_path = Path("data")
-    return {
-        "deaths": pd.read_csv(base_path / "deaths.csv"),
-        "servers": pd.read_csv(base_path / "servers.csv"),
-        "sessions": pd.read_csv(base_path / "sessions.csv"),
-        "messages": pd.read_csv(base_path / "messages.csv"),
-        "advancements": pd.read_csv(base_path / "advancements.csv"),
-        "player_names": pd.read_csv(base_path / "player_names.csv"),
-    }
+    if (base_path / table).is_dir():
+        return sorted((base_path / table).rglob("*.csv"))
+    if table == "summaries" and not (base_path / "sessions").is_dir():
+        return [base_path / f"{t}.csv" for t in PARTITIONED_TABLES if t != "uptime"]
+    return [base_path / f"{table}.csv"]
+
+
+BACKENDS = ["pandas", "sqlite", "duckdb"]
+
+
+def load_backend(backend: str = "pandas"):
+    """Returns (stats module, data) for the chosen backend
+
+    Every backend module exposes the same get_* functions, called as
+    module.get_total_playtime(data).
+    """
+    if backend == "pandas":
+        import stats
+
+        return stats, load_dataframes()
+
+    from . import sql
+
+    return sql, sql.load_database(backend)
@@ -0,0 +1,61 @@
+import json
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from .registry import run_stats
+from .service import data_version
+
+try:
+    import pyarrow as pa
+    from pyarrow import ipc
+except ImportError:  # pyarrow is optional, large results stay in the JSON file
+    pa = None
+
+# Results with at least this many rows are written as Arrow files
+ARROW_MIN_ROWS = 1000
+
+
+def write_arrow(rows: list[dict], path: Path) -> None:
+    table = pa.Table.from_pylist(rows)
+    with ipc.new_file(path, table.schema) as writer:
+        writer.write_table(table)
+
+
+def export_stats(
+    module,
+    dfs: dict[str, pd.DataFrame],
+    output_dir: Path,
+    since: float | None = None,
+    until: float | None = None,
+    arrow_min_rows: int = ARROW_MIN_ROWS,
+) -> dict:
+    """Compute every stat of module once and write them to output_dir/stats.json
+
+    List results of at least arrow_min_rows rows go to <name>.arrow files
+    instead, and the JSON holds {"arrow": file name, "rows": count} for
+    them. since and until are only recorded. Returns the JSON document.
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    bundle = {
+        "version": data_version(),
+        "generated_timestamp": time.time(),
+        "since": since,
+        "until": until,
+        "stats": {},
+    }
+    results = run_stats(list(module.__all__), dfs)
+    for name, result in results.items():
+        if (
+            pa is not None
+            and isinstance(result, list)
+            and len(result) >= arrow_min_rows
+        ):
+            write_arrow(result, output_dir / f"{name}.arrow")
+            result = {"arrow": f"{name}.arrow", "rows": len(result)}
+        bundle["stats"][name] = result
+
+    with open(output_dir / "stats.json", "w", encoding="utf-8") as f:
+        json.dump(bundle, f, ensure_ascii=False, default=lambda x: x.item())
+    return bundle
@@ -1,6 +1,9 @@
 import pandas as pd
 
+from ..registry import stat
 
+
+@stat({"advancements": []}, {"total_advancements": "int"})
 def get_total_advancements(dfs: dict[str, pd.DataFrame]) -> dict:
     """Calculate total advancements earned across all players"""
     advancements_df = dfs["advancements"]
@@ -11,6 +14,10 @@ def get_total_advancements(dfs: dict[str, pd.DataFrame]) -> dict:
     return {"total_advancements": int(total_count)}
 
 
+@stat(
+    {"advancements": ["uuid"], "player_names": ["uuid", "player_name"]},
+    {"player_name": "str", "advancements": "int"},
+)
 def get_advancement_ranking(dfs: dict[str, pd.DataFrame]) -> list[dict]:
     """Calculate player rankings by total advancements achieved"""
     advancements_df = dfs["advancements"]
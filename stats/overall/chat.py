@@ -1,33 +1,47 @@
 import pandas as pd
 
+from ..aggregates import player_messages, player_play_time
+from ..registry import shared, stat
+from ..text import message_contents, message_contents_by, top_terms, top_terms_by
 
+
+@stat(
+    {"player_names": ["uuid", "player_name"]},
+    {"player_name": "str", "messages": "int"},
+    shared=[player_messages],
+)
 def get_chat_ranking(dfs: dict[str, pd.DataFrame]) -> list[dict]:
     """Calculate player rankings by total message count"""
-    messages_df = dfs["messages"]
     names_df = dfs["player_names"]
 
-    message_counts = messages_df.groupby("uuid").size().reset_index(name="messages")
-    chat_ranking = message_counts.merge(names_df, on="uuid")
+    counts = shared(dfs, player_messages).reset_index(name="messages")
+    chat_ranking = counts.merge(names_df, on="uuid")
     chat_ranking = chat_ranking.sort_values("messages", ascending=False)
 
     return chat_ranking[["player_name", "messages"]].to_dict("records")
 
 
+@stat(
+    {"player_names": ["uuid", "player_name"]},
+    {
+        "player_name": "str",
+        "messages_per_hour": "float",
+        "total_messages": "int",
+        "play_hours": "float",
+    },
+    shared=[player_messages, player_play_time],
+)
 def get_chat_rate_ranking(dfs: dict[str, pd.DataFrame]) -> list[dict]:
     """Calculate player rankings by messages per hour of playtime"""
-    messages_df = dfs["messages"]
-    sessions_df = dfs["sessions"]
     names_df = dfs["player_names"]
 
-    message_counts = (
-        messages_df.groupby("uuid").size().reset_index(name="total_messages")
-    )
+    counts = shared(dfs, player_messages).reset_index(name="total_messages")
 
-    play_time = sessions_df.groupby("uuid")["play_time"].sum().reset_index()
+    play_time = shared(dfs, player_play_time).reset_index()
     play_time["play_hours"] = play_time["play_time"] / 3600
     play_time = play_time[play_time["play_hours"] >= 1]
 
-    chat_rate = message_counts.merge(play_time, on="uuid")
+    chat_rate = counts.merge(play_time, on="uuid")
     chat_rate["messages_per_hour"] = (
         chat_rate["total_messages"] / chat_rate["play_hours"]
     )
@@ -45,8 +59,43 @@ def get_chat_rate_ranking(dfs: dict[str, pd.DataFrame]) -> list[dict]:
     ]
 
 
+@stat({"messages": []}, {"total_messages": "int"})
 def get_total_messages(dfs: dict[str, pd.DataFrame]) -> dict:
     """Calculate total messages sent across all players"""
     messages_df = dfs["messages"]
     total_count = len(messages_df)
     return {"total_messages": int(total_count)}
+
+
+@stat({"messages": ["timestamp", "content"]}, {"word": "str", "count": "int"})
+def get_top_words(dfs: dict[str, pd.DataFrame], limit: int = 20) -> list[dict]:
+    """Find the most used words in chat"""
+    return top_terms(message_contents(dfs["messages"]), limit)
+
+
+@stat({"messages": ["timestamp", "content"]}, {"phrase": "str", "count": "int"})
+def get_top_phrases(dfs: dict[str, pd.DataFrame], limit: int = 20) -> list[dict]:
+    """Find the most used two-word phrases in chat"""
+    return top_terms(message_contents(dfs["messages"]), limit, ngram=2)
+
+
+@stat(
+    {
+        "messages": ["uuid", "timestamp", "content"],
+        "player_names": ["uuid", "player_name"],
+    },
+    {"player_name": "str", "words": "list[dict]"},
+)
+def get_player_top_words(dfs: dict[str, pd.DataFrame], limit: int = 10) -> list[dict]:
+    """Find each player's most used words in chat"""
+    names = dfs["player_names"].set_index("uuid")["player_name"]
+    messages = dfs["messages"]
+    # Grouped by uuid, so players who share a name aren't merged
+    messages = messages[messages["uuid"].isin(names.index)]
+    groups = message_contents_by(messages, "uuid")
+    result = [
+        {"player_name": names[uuid], "words": words}
+        for uuid, words in top_terms_by(groups, limit).items()
+    ]
+    result.sort(key=lambda x: x["player_name"])
+    return result
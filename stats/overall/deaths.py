@@ -1,27 +1,42 @@
 import pandas as pd
 
+from ..aggregates import player_deaths, player_play_time
+from ..registry import shared, stat
 
+
+@stat(
+    {"player_names": ["uuid", "player_name"]},
+    {"player_name": "str", "deaths": "int"},
+    shared=[player_deaths],
+)
 def get_death_ranking(dfs: dict[str, pd.DataFrame]) -> list[dict]:
     """Calculate death rankings excluding specific servers"""
-    deaths_df = dfs["deaths"]
     names_df = dfs["player_names"]
 
-    death_counts = deaths_df.groupby("uuid").size().reset_index(name="deaths")
+    death_counts = shared(dfs, player_deaths).reset_index(name="deaths")
     death_ranking = death_counts.merge(names_df, on="uuid")
     death_ranking = death_ranking.sort_values("deaths", ascending=False)
 
     return death_ranking[["player_name", "deaths"]].to_dict("records")
 
 
+@stat(
+    {"player_names": ["uuid", "player_name"]},
+    {
+        "player_name": "str",
+        "deaths_per_hour": "float",
+        "total_deaths": "int",
+        "play_hours": "float",
+    },
+    shared=[player_deaths, player_play_time],
+)
 def get_death_rate_ranking(dfs: dict[str, pd.DataFrame]) -> list[dict]:
     """Calculate average death rate (deaths per hour) for each player"""
-    deaths_df = dfs["deaths"]
-    sessions_df = dfs["sessions"]
     names_df = dfs["player_names"]
 
-    death_counts = deaths_df.groupby("uuid").size().reset_index(name="total_deaths")
+    death_counts = shared(dfs, player_deaths).reset_index(name="total_deaths")
 
-    play_time = sessions_df.groupby("uuid")["play_time"].sum().reset_index()
+    play_time = shared(dfs, player_play_time).reset_index()
     play_time["play_hours"] = play_time["play_time"] / 3600
     play_time = play_time[play_time["play_hours"] >= 1]
 
@@ -43,6 +58,7 @@ def get_death_rate_ranking(dfs: dict[str, pd.DataFrame]) -> list[dict]:
     ]
 
 
+@stat({"deaths": []}, {"total_deaths": "int"})
 def get_total_deaths(dfs: dict[str, pd.DataFrame]) -> dict:
     """Calculate total deaths across all players"""
     deaths_df = dfs["deaths"]
@@ -50,6 +66,10 @@ def get_total_deaths(dfs: dict[str, pd.DataFrame]) -> dict:
     return {"total_deaths": int(total_count)}
 
 
+@stat(
+    {"deaths": ["by"], "player_names": ["uuid", "player_name"]},
+    {"player_name": "str", "kills": "int"},
+)
 def get_pvp_kill_ranking(dfs: dict[str, pd.DataFrame]) -> list[dict]:
     """Calculate player rankings by PvP kills"""
     deaths_df = dfs["deaths"]
@@ -72,3 +92,22 @@ def get_pvp_kill_ranking(dfs: dict[str, pd.DataFrame]) -> list[dict]:
     result = kill_ranking[["player_name", "kills"]].to_dict("records")
 
     return result
+
+
+@stat({"deaths": ["cause"]}, {"cause": "str", "deaths": "int"})
+def get_deaths_by_cause(dfs: dict[str, pd.DataFrame]) -> list[dict]:
+    """Count deaths per classified cause"""
+    deaths_df = dfs["deaths"]
+
+    # Deaths recorded before causes were classified count as unknown
+    causes = deaths_df.get("cause", pd.Series(index=deaths_df.index))
+    causes = causes.astype(object).fillna("unknown")
+    cause_counts = causes.value_counts().rename_axis("cause").reset_index(name="deaths")
+    cause_counts = cause_counts.sort_values(
+        ["deaths", "cause"], ascending=[False, True]
+    )
+
+    return [
+        {"cause": row["cause"], "deaths": int(row["deaths"])}
+        for _, row in cause_counts.iterrows()
+    ]
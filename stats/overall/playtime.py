@@ -1,6 +1,21 @@
 import pandas as pd
 
-
+from ..aggregates import player_play_time, playtime_cube, server_play_time
+from ..cube import day_to_date, day_to_weekday
+from ..registry import shared, stat
+
+WEEKDAY_NAMES = [
+    "Monday",
+    "Tuesday",
+    "Wednesday",
+    "Thursday",
+    "Friday",
+    "Saturday",
+    "Sunday",
+]
+
+
+@stat({"sessions": ["play_time"]}, {"total_hours": "float", "total_days": "float"})
 def get_total_playtime(dfs: dict[str, pd.DataFrame]) -> dict:
     """Calculate total playtime across all players"""
     sessions_df = dfs["sessions"]
@@ -15,6 +30,10 @@ def get_total_playtime(dfs: dict[str, pd.DataFrame]) -> dict:
     }
 
 
+@stat(
+    {"sessions": ["uuid"], "player_names": ["uuid", "player_name"]},
+    {"player_name": "str"},
+)
 def get_active_players(dfs: dict[str, pd.DataFrame]) -> list[dict]:
     """Get list of all players who have logged in at least once"""
     sessions_df = dfs["sessions"]
@@ -40,13 +59,17 @@ def get_active_players(dfs: dict[str, pd.DataFrame]) -> list[dict]:
     return result
 
 
+@stat(
+    {"player_names": ["uuid", "player_name"]},
+    {"player_name": "str", "play_hours": "float"},
+    shared=[player_play_time],
+)
 def get_playtime_ranking(dfs: dict[str, pd.DataFrame]) -> list[dict]:
     """Calculate player rankings by total play time"""
-    sessions_df = dfs["sessions"]
     names_df = dfs["player_names"]
 
     # Calculate total play time in hours per player
-    play_time = sessions_df.groupby("uuid")["play_time"].sum().reset_index()
+    play_time = shared(dfs, player_play_time).reset_index()
     play_time["play_hours"] = play_time["play_time"] / 3600
 
     # Merge with player names
@@ -67,6 +90,10 @@ def get_playtime_ranking(dfs: dict[str, pd.DataFrame]) -> list[dict]:
     return result
 
 
+@stat(
+    {"sessions": ["uuid", "server_name"], "player_names": ["uuid", "player_name"]},
+    {"player_name": "str", "server_count": "int"},
+)
 def get_server_variety_ranking(dfs: dict[str, pd.DataFrame]) -> list[dict]:
     """Calculate player rankings by number of different servers played on"""
     sessions_df = dfs["sessions"]
@@ -97,215 +124,121 @@ def get_server_variety_ranking(dfs: dict[str, pd.DataFrame]) -> list[dict]:
     return result
 
 
+@stat({}, {"date": "str", "play_hours": "float"}, shared=[playtime_cube])
 def get_daily_playtime(dfs: dict[str, pd.DataFrame]) -> list[dict]:
     """Calculate total playtime for each day of the year in UTC+8, handling cross-day sessions"""
-    sessions_df = dfs["sessions"]
+    cube = shared(dfs, playtime_cube)
 
-    # Convert timestamps to pandas timestamps in UTC+8
-    sessions_df["start_time"] = pd.to_datetime(
-        sessions_df["join_timestamp"], unit="s", utc=True
-    ).dt.tz_convert("Asia/Shanghai")
-    sessions_df["end_time"] = sessions_df["start_time"] + pd.to_timedelta(
-        sessions_df["play_time"], unit="s"
-    )
-
-    # Initialize list to store daily segments
-    daily_segments = []
-
-    for _, session in sessions_df.iterrows():
-        start = session["start_time"]
-        end = session["end_time"]
-        current = start.normalize()  # Get start of day
-
-        while current < end:
-            next_day = current + pd.Timedelta(days=1)
-            segment_end = min(end, next_day)
-            segment_duration = (segment_end - max(start, current)).total_seconds()
-
-            if segment_duration > 0:
-                daily_segments.append(
-                    {"date": current.date(), "play_time": segment_duration}
-                )
-
-            current = next_day
-
-    # Convert segments to DataFrame and group by date
-    segments_df = pd.DataFrame(daily_segments)
-    if len(segments_df) > 0:
-        daily_play = segments_df.groupby("date")["play_time"].sum().reset_index()
-        daily_play["play_hours"] = daily_play["play_time"] / 3600
-
-        # Ensure all days between first and last session are included
-        start_date = daily_play["date"].min()
-        end_date = daily_play["date"].max()
-        all_dates = pd.date_range(start=start_date, end=end_date, freq="D").date
-
-        # Create complete date index with 0 hours for missing days
-        daily_hours = pd.DataFrame({"date": all_dates})
-        daily_hours = daily_hours.merge(
-            daily_play[["date", "play_hours"]], on="date", how="left"
-        ).fillna(0)
-    else:
+    daily_play = cube.groupby("day")["play_time"].sum()
+    if len(daily_play) == 0:
         # Handle case with no valid sessions
-        daily_hours = pd.DataFrame(columns=["date", "play_hours"])
+        return []
 
-    # Convert to list of dicts
-    result = [
-        {
-            "date": row["date"].isoformat(),
-            "play_hours": round(row["play_hours"], 1),
-        }
-        for _, row in daily_hours.iterrows()
-    ]
+    # Ensure all days between first and last session are included
+    all_days = range(daily_play.index.min(), daily_play.index.max() + 1)
+    daily_play = daily_play.reindex(all_days, fill_value=0)
+    dates = day_to_date(daily_play.index.to_series())
 
-    return result
+    return [
+        {"date": date.isoformat(), "play_hours": round(play_time / 3600, 1)}
+        for date, play_time in zip(dates, daily_play)
+    ]
 
 
+@stat({}, {"weekday": "str", "play_hours": "float"}, shared=[playtime_cube])
 def get_weekday_playtime(dfs: dict[str, pd.DataFrame]) -> list[dict]:
     """Calculate total playtime for each day of the week in UTC+8"""
-    sessions_df = dfs["sessions"]
+    cube = shared(dfs, playtime_cube)
 
-    # Convert timestamps to pandas timestamps in UTC+8
-    sessions_df["start_time"] = pd.to_datetime(
-        sessions_df["join_timestamp"], unit="s", utc=True
-    ).dt.tz_convert("Asia/Shanghai")
-    sessions_df["end_time"] = sessions_df["start_time"] + pd.to_timedelta(
-        sessions_df["play_time"], unit="s"
-    )
+    weekday_play = cube.groupby(day_to_weekday(cube["day"]))["play_time"].sum()
+    weekday_play = weekday_play.reindex(range(7), fill_value=0)
 
-    # Initialize list to store daily segments
-    weekday_segments = []
-
-    for _, session in sessions_df.iterrows():
-        start = session["start_time"]
-        end = session["end_time"]
-        current = start.normalize()  # Get start of day
-
-        while current < end:
-            next_day = current + pd.Timedelta(days=1)
-            segment_end = min(end, next_day)
-            segment_duration = (segment_end - max(start, current)).total_seconds()
-
-            if segment_duration > 0:
-                weekday_segments.append(
-                    {"weekday": current.weekday(), "play_time": segment_duration}
-                )
-
-            current = next_day
-
-    # Convert segments to DataFrame and group by weekday
-    segments_df = pd.DataFrame(weekday_segments)
-    if len(segments_df) > 0:
-        weekday_play = segments_df.groupby("weekday")["play_time"].sum().reset_index()
-        weekday_play["play_hours"] = weekday_play["play_time"] / 3600
-
-        # Create dict for weekday names
-        weekday_names = {
-            0: "Monday",
-            1: "Tuesday",
-            2: "Wednesday",
-            3: "Thursday",
-            4: "Friday",
-            5: "Saturday",
-            6: "Sunday",
-        }
+    return [
+        {"weekday": WEEKDAY_NAMES[weekday], "play_hours": round(play_time / 3600, 1)}
+        for weekday, play_time in weekday_play.items()
+    ]
 
-        # Convert to list of dicts with weekday names
-        result = [
-            {
-                "weekday": weekday_names[row["weekday"]],
-                "play_hours": round(row["play_hours"], 1),
-            }
-            for _, row in weekday_play.iterrows()
-        ]
 
-        # Sort by weekday order
-        result = sorted(
-            result, key=lambda x: list(weekday_names.values()).index(x["weekday"])
-        )
-    else:
-        # Handle case with no valid sessions
-        result = [
-            {"weekday": day, "play_hours": 0.0}
-            for day in [
-                "Monday",
-                "Tuesday",
-                "Wednesday",
-                "Thursday",
-                "Friday",
-                "Saturday",
-                "Sunday",
-            ]
-        ]
+@stat({}, {"hour": "str", "play_hours": "float"}, shared=[playtime_cube])
+def get_hourly_playtime(dfs: dict[str, pd.DataFrame]) -> list[dict]:
+    """Calculate total playtime for each hour of the day in UTC+8"""
+    cube = shared(dfs, playtime_cube)
 
-    return result
+    hourly_play = cube.groupby("hour")["play_time"].sum()
+    hourly_play = hourly_play.reindex(range(24), fill_value=0)
 
+    # 24-hour format time strings
+    return [
+        {"hour": f"{hour:02d}:00", "play_hours": round(play_time / 3600, 1)}
+        for hour, play_time in hourly_play.items()
+    ]
 
-def get_hourly_playtime(dfs: dict[str, pd.DataFrame]) -> list[dict]:
-    """Calculate total playtime for each hour of the day in UTC+8"""
-    sessions_df = dfs["sessions"]
 
-    # Convert timestamps to pandas timestamps in UTC+8
-    sessions_df["start_time"] = pd.to_datetime(
-        sessions_df["join_timestamp"], unit="s", utc=True
-    ).dt.tz_convert("Asia/Shanghai")
-    sessions_df["end_time"] = sessions_df["start_time"] + pd.to_timedelta(
-        sessions_df["play_time"], unit="s"
-    )
+@stat(
+    {},
+    {"server_name": "str", "play_hours": "list[float]"},
+    shared=[playtime_cube],
+)
+def get_server_hourly_playtime(dfs: dict[str, pd.DataFrame]) -> list[dict]:
+    """Calculate each server's playtime for each hour of the day in UTC+8"""
+    cube = shared(dfs, playtime_cube)
 
-    # Initialize list to store hourly segments
-    hourly_segments = []
-
-    for _, session in sessions_df.iterrows():
-        start = session["start_time"]
-        end = session["end_time"]
-        current = start.replace(minute=0, second=0)  # Round down to hour
-
-        while current < end:
-            next_hour = current + pd.Timedelta(hours=1)
-            segment_end = min(end, next_hour)
-            segment_duration = (segment_end - max(start, current)).total_seconds()
-
-            if segment_duration > 0:
-                hourly_segments.append(
-                    {"hour": current.hour, "play_time": segment_duration}
-                )
-
-            current = next_hour
-
-    # Convert segments to DataFrame and group by hour
-    segments_df = pd.DataFrame(hourly_segments)
-    if len(segments_df) > 0:
-        hourly_play = segments_df.groupby("hour")["play_time"].sum().reset_index()
-        hourly_play["play_hours"] = hourly_play["play_time"] / 3600
-
-        # Create complete hour index
-        all_hours = pd.DataFrame({"hour": range(24)})
-        hourly_hours = all_hours.merge(
-            hourly_play[["hour", "play_hours"]], on="hour", how="left"
-        ).fillna(0)
-    else:
-        # Handle case with no valid sessions
-        hourly_hours = pd.DataFrame({"hour": range(24), "play_hours": [0.0] * 24})
+    hourly_play = (
+        cube.groupby(["server_name", "hour"])["play_time"].sum().unstack(fill_value=0)
+    )
+    hourly_play = hourly_play.reindex(columns=range(24), fill_value=0)
 
-    # Convert to list of dicts with 24-hour format time strings
-    result = [
+    return [
         {
-            "hour": f"{int(row['hour']):02d}:00",
-            "play_hours": round(row["play_hours"], 1),
+            "server_name": server_name,
+            "play_hours": [round(play_time / 3600, 1) for play_time in hours],
         }
-        for _, row in hourly_hours.iterrows()
+        for server_name, hours in zip(hourly_play.index, hourly_play.values.tolist())
     ]
 
-    return result
 
+@stat(
+    {"player_names": ["uuid", "player_name"]},
+    {"player_name": "str", "play_hours": "dict[str, float]"},
+    shared=[playtime_cube],
+)
+def get_player_weekday_playtime(dfs: dict[str, pd.DataFrame]) -> list[dict]:
+    """Calculate each player's playtime for each day of the week in UTC+8"""
+    cube = shared(dfs, playtime_cube)
+    names_df = dfs["player_names"]
+
+    weekday_play = (
+        cube.groupby(["uuid", day_to_weekday(cube["day"]).rename("weekday")])[
+            "play_time"
+        ]
+        .sum()
+        .unstack(fill_value=0)
+        .reindex(columns=range(7), fill_value=0)
+    )
+    weekday_play = names_df.merge(weekday_play, left_on="uuid", right_index=True)
+    weekday_play = weekday_play.sort_values("player_name")
 
+    return [
+        {
+            "player_name": row["player_name"],
+            "play_hours": {
+                WEEKDAY_NAMES[weekday]: round(row[weekday] / 3600, 1)
+                for weekday in range(7)
+            },
+        }
+        for _, row in weekday_play.iterrows()
+    ]
+
+
+@stat(
+    {},
+    {"server_name": "str", "play_hours": "float", "play_days": "float"},
+    shared=[server_play_time],
+)
 def get_server_playtime_ranking(dfs: dict[str, pd.DataFrame]) -> list[dict]:
     """Calculate server rankings by total play time"""
-    sessions_df = dfs["sessions"]
-
     # Calculate total play time in hours per server
-    play_time = sessions_df.groupby("server_name")["play_time"].sum().reset_index()
+    play_time = shared(dfs, server_play_time).reset_index()
     play_time["play_hours"] = play_time["play_time"] / 3600
 
     # Sort by play time descending
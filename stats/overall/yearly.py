@@ -0,0 +1,58 @@
+import pandas as pd
+
+from ..registry import stat
+
+
+@stat(
+    {
+        "summaries": [
+            "server_name",
+            "month",
+            "uuid",
+            "play_time",
+            "messages",
+            "deaths",
+            "advancements",
+        ]
+    },
+    {
+        "year": "int",
+        "play_hours": "float",
+        "messages": "int",
+        "deaths": "int",
+        "advancements": "int",
+        "players": "int",
+        "servers": "int",
+    },
+)
+def get_yearly_summary(dfs: dict[str, pd.DataFrame]) -> list[dict]:
+    """Compare years by combining the per-month partition summaries"""
+    summary_df = dfs["summaries"]
+
+    yearly = summary_df.assign(year=summary_df["month"].str[:4])
+    yearly = (
+        yearly.groupby("year")
+        .agg(
+            play_time=("play_time", "sum"),
+            messages=("messages", "sum"),
+            deaths=("deaths", "sum"),
+            advancements=("advancements", "sum"),
+            players=("uuid", "nunique"),
+            servers=("server_name", "nunique"),
+        )
+        .reset_index()
+        .sort_values("year")
+    )
+
+    return [
+        {
+            "year": int(row["year"]),
+            "play_hours": round(row["play_time"] / 3600, 1),
+            "messages": int(row["messages"]),
+            "deaths": int(row["deaths"]),
+            "advancements": int(row["advancements"]),
+            "players": int(row["players"]),
+            "servers": int(row["servers"]),
+        }
+        for _, row in yearly.iterrows()
+    ]
@@ -0,0 +1,228 @@
+from pathlib import Path
+
+import pandas as pd
+
+# Event tables stored as data/<table>/server=<server>/month=<YYYY-MM>/data.csv,
+# partitioned by the month (UTC+8) of their time column
+PARTITIONED_TABLES = {
+    "sessions": "join_timestamp",
+    "deaths": "timestamp",
+    "messages": "timestamp",
+    "advancements": "timestamp",
+    "uptime": "start_timestamp",
+}
+TABLE_COLUMNS = {
+    "sessions": ["server_name", "uuid", "join_timestamp", "play_time"],
+    "deaths": ["server_name", "uuid", "by", "cause", "killer", "timestamp"],
+    "messages": ["server_name", "uuid", "content", "timestamp"],
+    "advancements": ["server_name", "uuid", "advancement_name", "timestamp"],
+    "uptime": ["server_name", "start_timestamp", "end_timestamp"],
+}
+# Columns always read as strings, since a file whose values all look like
+# numbers, such as a month with the single chat message "666", would
+# otherwise get a numeric column
+TEXT_COLUMNS = [
+    "server_name",
+    "uuid",
+    "player_name",
+    "content",
+    "by",
+    "cause",
+    "killer",
+    "advancement_name",
+]
+SUMMARY_COLUMNS = [
+    "server_name",
+    "month",
+    "uuid",
+    "play_time",
+    "messages",
+    "deaths",
+    "advancements",
+]
+
+
+def timestamps_to_months(timestamps: pd.Series) -> pd.Series:
+    """Convert Unix timestamps to YYYY-MM strings in UTC+8"""
+    return (
+        pd.to_datetime(timestamps, unit="s", utc=True)
+        .dt.tz_convert("Asia/Shanghai")
+        .dt.strftime("%Y-%m")
+    )
+
+
+def partition_path(base_path: Path, table: str, server: str, month: str) -> Path:
+    return base_path / table / f"server={server}" / f"month={month}"
+
+
+def summarize(dfs: dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """Per server, month and uuid totals of playtime, messages, deaths and advancements"""
+    keys = ["server_name", "month", "uuid"]
+
+    def with_month(table: str) -> pd.DataFrame:
+        df = dfs[table]
+        df = df.assign(
+            server_name=df["server_name"].astype(str),
+            uuid=df["uuid"].astype(str),
+            month=timestamps_to_months(df[PARTITIONED_TABLES[table]]),
+        )
+        return df
+
+    play_time = with_month("sessions").groupby(keys)["play_time"].sum()
+    messages = with_month("messages").groupby(keys).size().rename("messages")
+    deaths = with_month("deaths").groupby(keys).size().rename("deaths")
+    advancements = (
+        with_month("advancements").groupby(keys).size().rename("advancements")
+    )
+
+    summary = pd.concat([play_time, messages, deaths, advancements], axis=1)
+    summary = summary.fillna(0).reset_index()
+    for column in ["messages", "deaths", "advancements"]:
+        summary[column] = summary[column].astype(int)
+
+    return summary.reindex(columns=SUMMARY_COLUMNS)
+
+
+def write_partitions(dfs: dict[str, pd.DataFrame], base_path: Path) -> None:
+    """Write event tables and summaries partitioned by server and month
+
+    Every partition that has rows in this run is replaced as a whole, while
+    partitions from other months or servers are left untouched. Runs must
+    therefore cover whole months, see parsing.widen_to_months().
+    """
+    parts: dict[str, dict[tuple[str, str], pd.DataFrame]] = {}
+    for table, time_column in PARTITIONED_TABLES.items():
+        df = dfs[table]
+        months = timestamps_to_months(df[time_column])
+        parts[table] = {
+            (str(server), month): part
+            for (server, month), part in df.groupby(
+                [df["server_name"], months], observed=True
+            )
+        }
+
+    summary = summarize(dfs)
+    touched = {key for table_parts in parts.values() for key in table_parts}
+
+    for server, month in touched:
+        for table in PARTITIONED_TABLES:
+            path = partition_path(base_path, table, server, month)
+            part = parts[table].get((server, month))
+            if part is None:
+                # Remove rows left over from a previous run of this partition
+                (path / "data.csv").unlink(missing_ok=True)
+                continue
+            path.mkdir(parents=True, exist_ok=True)
+            part.to_csv(path / "data.csv", index=False)
+
+        path = partition_path(base_path, "summaries", server, month)
+        path.mkdir(parents=True, exist_ok=True)
+        summary[
+            (summary["server_name"] == server) & (summary["month"] == month)
+        ].to_csv(path / "summary.csv", index=False)
+
+
+def list_partitions(
+    base_path: Path,
+    table: str,
+    since_month: str | None = None,
+    until_month: str | None = None,
+) -> list[tuple[str, str, Path]]:
+    """Returns (server, month, path) for each partition overlapping the month range"""
+    result = []
+    for path in sorted((base_path / table).glob("server=*/month=*")):
+        server = path.parent.name.removeprefix("server=")
+        month = path.name.removeprefix("month=")
+        if since_month is not None and month < since_month:
+            continue
+        if until_month is not None and month > until_month:
+            continue
+        result.append((server, month, path))
+    return result
+
+
+def _month_range(
+    since: float | None, until: float | None
+) -> tuple[str | None, str | None]:
+    since_month = until_month = None
+    if since is not None:
+        since_month = timestamps_to_months(pd.Series([since])).iloc[0]
+    if until is not None:
+        until_month = timestamps_to_months(pd.Series([until - 1])).iloc[0]
+    return since_month, until_month
+
+
+def read_columns(path: Path, columns: list[str] | None = None) -> pd.DataFrame:
+    """Read a CSV file, only the given columns of it if columns isn't None
+
+    Columns missing from the file, like those added after it was written,
+    are skipped rather than an error.
+    """
+    dtype = {column: str for column in TEXT_COLUMNS}
+    if columns is None:
+        return pd.read_csv(path, dtype=dtype)
+    wanted = set(columns)
+    return pd.read_csv(path, usecols=lambda column: column in wanted, dtype=dtype)
+
+
+def load_partitioned_table(
+    base_path: Path,
+    table: str,
+    since: float | None = None,
+    until: float | None = None,
+    columns: list[str] | None = None,
+) -> pd.DataFrame:
+    """Load one event table, reading only partitions inside [since, until)
+
+    columns limits the columns read; the time column is always read.
+    """
+    time_column = PARTITIONED_TABLES[table]
+    if columns is not None and time_column not in columns:
+        columns = [*columns, time_column]
+    since_month, until_month = _month_range(since, until)
+    frames = [
+        read_columns(path / "data.csv", columns)
+        for _, _, path in list_partitions(base_path, table, since_month, until_month)
+        if (path / "data.csv").exists()
+    ]
+    if not frames:
+        return pd.DataFrame(
+            columns=[
+                column
+                for column in TABLE_COLUMNS[table]
+                if columns is None or column in columns
+            ]
+        )
+    df = pd.concat(frames, ignore_index=True)
+
+    # Partitions are monthly, so trim rows at the edges of the range
+    if since is not None:
+        df = df[df[time_column] >= since]
+    if until is not None:
+        df = df[df[time_column] < until]
+    return df.reset_index(drop=True)
+
+
+def load_summaries(
+    base_path: Path,
+    since: float | None = None,
+    until: float | None = None,
+    columns: list[str] | None = None,
+) -> pd.DataFrame:
+    """Load per-partition summaries for every month overlapping [since, until)"""
+    since_month, until_month = _month_range(since, until)
+    frames = [
+        read_columns(path / "summary.csv", columns)
+        for _, _, path in list_partitions(
+            base_path, "summaries", since_month, until_month
+        )
+    ]
+    if not frames:
+        return pd.DataFrame(
+            columns=[
+                column
+                for column in SUMMARY_COLUMNS
+                if columns is None or column in columns
+            ]
+        )
+    return pd.concat(frames, ignore_index=True)
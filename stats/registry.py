@@ -0,0 +1,143 @@
+"""Registry of the pandas stats, with what each one reads and returns
+
+Every get_* function registers itself with @stat, declaring the columns it
+reads from each table, the shared aggregates it uses and the columns of
+its rows. run_stats() uses that to load only the needed columns, compute
+every shared aggregate once and run the stats in parallel threads.
+"""
+
+import inspect
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+import pandas as pd
+
+from .common import load_dataframes
+
+
+class Stat:
+    """A registered stat function and what it declares"""
+
+    def __init__(
+        self,
+        function: Callable,
+        tables: dict[str, list[str]],
+        output: dict[str, str],
+        shared: list[str],
+    ) -> None:
+        self.name = function.__name__
+        self.function = function
+        self.tables = tables
+        self.output = output
+        self.shared = shared
+        # A stat returns either a list of rows or a single row
+        self.returns_rows = inspect.signature(function).return_annotation == list[dict]
+
+    def check_output(self, result) -> str | None:
+        """How result differs from the declared output, or None if it doesn't"""
+        if isinstance(result, list) != self.returns_rows:
+            return f"returned a {type(result).__name__}"
+        for row in result if self.returns_rows else [result]:
+            if set(row) != set(self.output):
+                return f"returned {sorted(row)}, declares {sorted(self.output)}"
+        return None
+
+
+class Aggregate:
+    """An intermediate result that several stats share"""
+
+    def __init__(self, function: Callable, tables: dict[str, list[str]]) -> None:
+        self.name = function.__name__
+        self.function = function
+        self.tables = tables
+
+
+REGISTRY: dict[str, Stat] = {}
+AGGREGATES: dict[str, Aggregate] = {}
+
+
+def stat(
+    tables: dict[str, list[str]],
+    output: dict[str, str],
+    shared: list[Callable] = (),
+):
+    """Register a stat that reads the given columns of tables
+
+    output maps the columns of its rows to their types, and shared lists
+    the aggregates it gets with shared().
+    """
+
+    def decorate(function: Callable) -> Callable:
+        REGISTRY[function.__name__] = Stat(
+            function, tables, output, [used.__name__ for used in shared]
+        )
+        return function
+
+    return decorate
+
+
+def aggregate(tables: dict[str, list[str]]):
+    """Register an aggregate of dfs that reads the given columns of tables"""
+
+    def decorate(function: Callable) -> Callable:
+        AGGREGATES[function.__name__] = Aggregate(function, tables)
+        return function
+
+    return decorate
+
+
+def shared(dfs: dict[str, pd.DataFrame], function: Callable):
+    """An aggregate of dfs, computed on first use and kept in dfs like a table"""
+    name = function.__name__
+    if name not in dfs:
+        dfs[name] = function(dfs)
+    return dfs[name]
+
+
+def required_columns(names: list[str]) -> dict[str, list[str]]:
+    """The columns of each table that the stats and their aggregates read"""
+    columns: dict[str, set[str]] = {}
+    for name in names:
+        registered = REGISTRY[name]
+        declared = [registered.tables] + [
+            AGGREGATES[aggregate_name].tables for aggregate_name in registered.shared
+        ]
+        for tables in declared:
+            for table, table_columns in tables.items():
+                columns.setdefault(table, set()).update(table_columns)
+    return {table: sorted(table_columns) for table, table_columns in columns.items()}
+
+
+def run_stats(
+    names: list[str] | None = None,
+    dfs: dict[str, pd.DataFrame] | None = None,
+    since: float | None = None,
+    until: float | None = None,
+    max_workers: int | None = None,
+) -> dict[str, object]:
+    """Run each stat once, all of them by default, and return {name: result}
+
+    Unless dfs is given, only the columns the stats declare are loaded.
+    The aggregates they share are computed first, then the stats run in
+    a thread pool; pandas releases the GIL in many of its kernels.
+    """
+    names = list(REGISTRY) if names is None else names
+    if dfs is None:
+        columns = required_columns(names)
+        dfs = load_dataframes(since, until, list(columns), columns)
+    needed = sorted(
+        {
+            aggregate_name
+            for name in names
+            for aggregate_name in REGISTRY[name].shared
+            if aggregate_name not in dfs
+        }
+    )
+    with ThreadPoolExecutor(max_workers) as pool:
+        # Aggregates first, so no two stats compute the same one
+        for name, result in zip(
+            needed, pool.map(lambda name: AGGREGATES[name].function(dfs), needed)
+        ):
+            dfs[name] = result
+        results = pool.map(lambda name: REGISTRY[name].function(dfs), names)
+        return dict(zip(names, results))
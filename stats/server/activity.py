@@ -2,7 +2,21 @@ from datetime import datetime
 
 import pandas as pd
 
-
+from ..registry import stat
+
+
+@stat(
+    {
+        "sessions": ["server_name", "uuid", "join_timestamp", "play_time"],
+        "player_names": ["uuid", "player_name"],
+    },
+    {
+        "server_name": "str",
+        "peak_players": "int",
+        "peak_time": "str",
+        "player_list": "list[str]",
+    },
+)
 def get_peak_concurrent_players(dfs: dict[str, pd.DataFrame]) -> list[dict]:
     """Find peak concurrent players for each server"""
     sessions_df = dfs["sessions"]
@@ -66,24 +80,40 @@ def get_peak_concurrent_players(dfs: dict[str, pd.DataFrame]) -> list[dict]:
     return results
 
 
+@stat(
+    {
+        "uptime": ["server_name", "start_timestamp", "end_timestamp"],
+        "sessions": ["server_name", "join_timestamp", "play_time"],
+    },
+    {"server_name": "str", "created_at": "str", "closed_at": "str"},
+)
 def get_server_timeline(dfs: dict[str, pd.DataFrame]) -> list[dict]:
-    """Get timeline of server creations based on actual player activity"""
-    sessions_df = dfs["sessions"]
-
-    # Group by server and find first join
-    first_joins = sessions_df.groupby("server_name")["join_timestamp"].min()
+    """Get timeline of server creations from the first start and last uptime"""
+    uptime_df = dfs["uptime"]
+    if uptime_df.empty:
+        # Data written before uptime was recorded, like the flat CSV layout,
+        # falls back to the first join and last quit
+        sessions_df = dfs["sessions"]
+        uptime_df = pd.DataFrame(
+            {
+                "server_name": sessions_df["server_name"],
+                "start_timestamp": sessions_df["join_timestamp"],
+                "end_timestamp": sessions_df["join_timestamp"]
+                + sessions_df["play_time"],
+            }
+        )
 
-    # Calculate last quit time for each server
-    last_quits = sessions_df.groupby("server_name").apply(
-        lambda group: (group["join_timestamp"] + group["play_time"]).max()
+    # First start and end of the last uptime interval per server
+    lifetimes = uptime_df.groupby("server_name", observed=True).agg(
+        created=("start_timestamp", "min"), closed=("end_timestamp", "max")
     )
 
     # Create timeline dataframe
     timeline = pd.DataFrame(
         {
-            "server_name": first_joins.index,
-            "created_time": pd.to_datetime(first_joins, unit="s"),
-            "closed_time": pd.to_datetime(last_quits, unit="s"),
+            "server_name": lifetimes.index,
+            "created_time": pd.to_datetime(lifetimes["created"], unit="s"),
+            "closed_time": pd.to_datetime(lifetimes["closed"], unit="s"),
         }
     )
 
@@ -107,6 +137,49 @@ def get_server_timeline(dfs: dict[str, pd.DataFrame]) -> list[dict]:
     return result
 
 
+@stat(
+    {"uptime": ["server_name", "start_timestamp", "end_timestamp"]},
+    {
+        "server_name": "str",
+        "up_hours": "float",
+        "uptime_percent": "float",
+        "starts": "int",
+    },
+)
+def get_server_uptime(dfs: dict[str, pd.DataFrame]) -> list[dict]:
+    """Calculate each server's uptime and its share of the server's lifetime"""
+    uptime_df = dfs["uptime"]
+
+    uptime = uptime_df.assign(
+        up_time=uptime_df["end_timestamp"] - uptime_df["start_timestamp"]
+    )
+    servers = uptime.groupby("server_name", observed=True).agg(
+        up_time=("up_time", "sum"),
+        starts=("up_time", "size"),
+        created=("start_timestamp", "min"),
+        closed=("end_timestamp", "max"),
+    )
+    lifetime = servers["closed"] - servers["created"]
+    servers["uptime_percent"] = (servers["up_time"] / lifetime * 100).where(
+        lifetime > 0, 100.0
+    )
+    servers = servers.reset_index().sort_values("up_time", ascending=False)
+
+    return [
+        {
+            "server_name": row["server_name"],
+            "up_hours": round(row["up_time"] / 3600, 1),
+            "uptime_percent": round(row["uptime_percent"], 1),
+            "starts": int(row["starts"]),
+        }
+        for _, row in servers.iterrows()
+    ]
+
+
+@stat(
+    {"sessions": ["server_name", "uuid"], "player_names": ["uuid", "player_name"]},
+    {"server_name": "str", "player_count": "int", "player_list": "list[str]"},
+)
 def get_server_player_list(dfs: dict[str, pd.DataFrame]) -> list[dict]:
     """Get list of unique players for each server with their names"""
     sessions_df = dfs["sessions"]
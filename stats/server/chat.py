@@ -1,17 +1,18 @@
 import pandas as pd
 
+from ..aggregates import server_messages, server_play_time
+from ..registry import shared, stat
+from ..text import message_contents_by, top_terms_by
 
+
+@stat({}, {"server_name": "str", "messages": "int"}, shared=[server_messages])
 def get_server_chat_ranking(dfs: dict[str, pd.DataFrame]) -> list[dict]:
     """Calculate server rankings by total message count"""
-    messages_df = dfs["messages"]
-
     # Count messages per server
-    message_counts = (
-        messages_df.groupby("server_name").size().reset_index(name="messages")
-    )
+    counts = shared(dfs, server_messages).reset_index(name="messages")
 
     # Sort by message count descending
-    server_ranking = message_counts.sort_values("messages", ascending=False)
+    server_ranking = counts.sort_values("messages", ascending=False)
 
     # Convert to list of dicts
     result = server_ranking[["server_name", "messages"]].to_dict("records")
@@ -19,25 +20,30 @@ def get_server_chat_ranking(dfs: dict[str, pd.DataFrame]) -> list[dict]:
     return result
 
 
+@stat(
+    {},
+    {
+        "server_name": "str",
+        "messages_per_hour": "float",
+        "total_messages": "int",
+        "play_hours": "float",
+    },
+    shared=[server_messages, server_play_time],
+)
 def get_server_chat_rate_ranking(dfs: dict[str, pd.DataFrame]) -> list[dict]:
     """Calculate server rankings by messages per hour of playtime"""
-    messages_df = dfs["messages"]
-    sessions_df = dfs["sessions"]
-
     # Count messages per server
-    message_counts = (
-        messages_df.groupby("server_name").size().reset_index(name="total_messages")
-    )
+    counts = shared(dfs, server_messages).reset_index(name="total_messages")
 
     # Calculate total play time in hours per server
-    play_time = sessions_df.groupby("server_name")["play_time"].sum().reset_index()
+    play_time = shared(dfs, server_play_time).reset_index()
     play_time["play_hours"] = play_time["play_time"] / 3600
 
     # Filter out servers with less than 1 hour total playtime
     play_time = play_time[play_time["play_hours"] >= 1]
 
     # Merge messages and play time
-    chat_rate = message_counts.merge(play_time, on="server_name")
+    chat_rate = counts.merge(play_time, on="server_name")
     chat_rate["messages_per_hour"] = (
         chat_rate["total_messages"] / chat_rate["play_hours"]
     )
@@ -57,3 +63,16 @@ def get_server_chat_rate_ranking(dfs: dict[str, pd.DataFrame]) -> list[dict]:
     ]
 
     return result
+
+
+@stat(
+    {"messages": ["server_name", "timestamp", "content"]},
+    {"server_name": "str", "words": "list[dict]"},
+)
+def get_server_top_words(dfs: dict[str, pd.DataFrame], limit: int = 10) -> list[dict]:
+    """Find each server's most used words in chat"""
+    groups = message_contents_by(dfs["messages"], "server_name")
+    return [
+        {"server_name": server_name, "words": words}
+        for server_name, words in top_terms_by(groups, limit).items()
+    ]
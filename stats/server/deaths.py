@@ -1,16 +1,24 @@
 import pandas as pd
 
+from ..aggregates import server_deaths, server_play_time
+from ..registry import shared, stat
 
+
+@stat(
+    {},
+    {
+        "server_name": "str",
+        "deaths_per_hour": "float",
+        "total_deaths": "int",
+        "play_hours": "float",
+    },
+    shared=[server_deaths, server_play_time],
+)
 def get_dangerous_server_ranking(dfs: dict[str, pd.DataFrame]) -> list[dict]:
     """Calculate most dangerous servers based on deaths per hour of playtime"""
-    deaths_df = dfs["deaths"]
-    sessions_df = dfs["sessions"]
-
-    death_counts = (
-        deaths_df.groupby("server_name").size().reset_index(name="total_deaths")
-    )
+    death_counts = shared(dfs, server_deaths).reset_index(name="total_deaths")
 
-    play_time = sessions_df.groupby("server_name")["play_time"].sum().reset_index()
+    play_time = shared(dfs, server_play_time).reset_index()
     play_time["play_hours"] = play_time["play_time"] / 3600
     play_time = play_time[play_time["play_hours"] >= 1]
 
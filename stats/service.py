@@ -0,0 +1,85 @@
+import hashlib
+import inspect
+import json
+import threading
+import time
+
+import pandas as pd
+
+from .common import TABLES, load_dataframes, table_files
+
+
+def data_version(tables: list[str] = TABLES) -> str:
+    """Hash of the path, size and mtime of every file the tables are loaded from"""
+    digest = hashlib.blake2b(digest_size=8)
+    for path in sorted({path for table in tables for path in table_files(table)}):
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        digest.update(f"{path}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode())
+    return digest.hexdigest()
+
+
+def encode_result(result) -> bytes:
+    return json.dumps(result, ensure_ascii=False, default=lambda x: x.item()).encode()
+
+
+class StatsCache:
+    """Results of the pandas get_* functions, as JSON, for the current data files
+
+    The tables are loaded once and reloaded only when data_version()
+    changes, which is checked at most every check_interval seconds. Results
+    are cached per version, stat and arguments, so repeated queries only
+    cost a dict lookup. Safe to use from several threads.
+    """
+
+    def __init__(self, module, check_interval: float = 1.0) -> None:
+        self.functions = {name: getattr(module, name) for name in module.__all__}
+        self.check_interval = check_interval
+        self.lock = threading.Lock()
+        self.version: str | None = None
+        self.checked_at = 0.0
+        self.dfs: dict[str, pd.DataFrame] = {}
+        self.results: dict[tuple, bytes] = {}
+
+    def parameters(self, name: str) -> dict[str, inspect.Parameter]:
+        """The arguments of a stat after dfs"""
+        parameters = inspect.signature(self.functions[name]).parameters
+        return dict(list(parameters.items())[1:])
+
+    def refresh(self) -> tuple[str, dict[str, pd.DataFrame]]:
+        """Returns (version, dfs), reloading the tables if the data files changed"""
+        with self.lock:
+            now = time.monotonic()
+            if self.version is None or now - self.checked_at >= self.check_interval:
+                self.checked_at = now
+                version = data_version()
+                if version != self.version:
+                    self.dfs = load_dataframes()
+                    self.version = version
+                    self.results = {}
+            return self.version, self.dfs
+
+    def get(self, name: str, arguments: dict[str, str]) -> tuple[str, bytes]:
+        """Returns (version, JSON result) of a stat, with arguments given as strings
+
+        Raises KeyError for unknown stats and ValueError for bad arguments.
+        """
+        parameters = self.parameters(name)
+        kwargs = {}
+        for key, value in arguments.items():
+            if key not in parameters:
+                raise ValueError(f"{name} has no argument {key!r}")
+            kwargs[key] = type(parameters[key].default)(value)
+
+        version, dfs = self.refresh()
+        key = (version, name, tuple(sorted(kwargs.items())))
+        result = self.results.get(key)
+        if result is None:
+            # Another thread may compute the same result, which is harmless
+            result = encode_result(self.functions[name](dfs, **kwargs))
+            with self.lock:
+                if self.version == version:
+                    self.results[key] = result
+        return version, result
@@ -0,0 +1,278 @@
+"""Bounded-memory sketches of the event tables, and approximate stats over them
+
+Stage 2 keeps one PartitionSketch per server and month while it parses,
+next to the partitioned tables. Sketches merge exactly across servers and
+months, so a stat over any set of partitions has the same error bounds as
+over one:
+
+- HyperLogLog distinct counts have a relative standard error of
+  1.04 / sqrt(2 ** precision), 1.6% at the default precision of 12.
+- Count-min estimates are never below the true count, and exceed it by at
+  most e / width of the total count with probability 1 - exp(-depth),
+  0.13% with 99.3% confidence at the defaults.
+- Top terms are drawn from the terms that were among the capacity most
+  frequent in at least one partition.
+"""
+
+import functools
+import hashlib
+import json
+import math
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .partitions import _month_range, list_partitions, partition_path, read_columns
+
+
+@functools.lru_cache(maxsize=1 << 16)
+def hash64(value: str) -> int:
+    """A 64-bit hash that, unlike hash(), is the same in every process"""
+    return int.from_bytes(
+        hashlib.blake2b(value.encode(), digest_size=8).digest(), "big"
+    )
+
+
+@functools.lru_cache(maxsize=1 << 16)
+def count_min_cells(term: str, width: int, depth: int) -> np.ndarray:
+    """Flat table index of term in each row, from independent 8-byte hashes"""
+    digest = hashlib.blake2b(term.encode(), digest_size=8 * depth).digest()
+    return np.array(
+        [
+            row * width + int.from_bytes(digest[8 * row : 8 * row + 8], "big") % width
+            for row in range(depth)
+        ]
+    )
+
+
+class HyperLogLog:
+    """Approximate count of distinct values in 2 ** precision bytes"""
+
+    def __init__(
+        self, precision: int = 12, registers: np.ndarray | None = None
+    ) -> None:
+        self.precision = precision
+        self.registers = (
+            registers if registers is not None else np.zeros(1 << precision, np.uint8)
+        )
+
+    def add(self, value: str) -> None:
+        h = hash64(value)
+        bits = 64 - self.precision
+        index = h >> bits
+        rank = bits - (h & ((1 << bits) - 1)).bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other: "HyperLogLog") -> None:
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def count(self) -> int:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(int)))
+        # Linear counting is more accurate for small cardinalities
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)
+        return round(estimate)
+
+
+class HeavyHitters:
+    """Count-min sketch of term counts, with the most frequent terms as candidates
+
+    depth is at most 8, the number of 8-byte hashes in one blake2b digest.
+    """
+
+    def __init__(
+        self,
+        width: int = 2048,
+        depth: int = 5,
+        capacity: int = 200,
+        table: np.ndarray | None = None,
+        candidates: dict[str, int] | None = None,
+    ) -> None:
+        self.width = width
+        self.depth = depth
+        self.capacity = capacity
+        self.table = table if table is not None else np.zeros(width * depth, np.int64)
+        self.candidates: dict[str, int] = candidates if candidates is not None else {}
+        self.total = int(self.table[:width].sum())
+
+    def cells(self, term: str) -> np.ndarray:
+        return count_min_cells(term, self.width, self.depth)
+
+    def estimate(self, term: str) -> int:
+        return int(self.table[self.cells(term)].min())
+
+    def add(self, term: str, count: int = 1) -> None:
+        cells = self.cells(term)
+        self.table[cells] += count
+        self.total += count
+        self.candidates[term] = int(self.table[cells].min())
+        if len(self.candidates) > 2 * self.capacity:
+            self.trim()
+
+    def trim(self) -> None:
+        ranked = sorted(self.candidates.items(), key=lambda x: (-x[1], x[0]))
+        self.candidates = dict(ranked[: self.capacity])
+
+    def merge(self, other: "HeavyHitters") -> None:
+        self.table += other.table
+        self.total += other.total
+        for term in self.candidates.keys() | other.candidates.keys():
+            self.candidates[term] = self.estimate(term)
+        self.trim()
+
+    def most_common(self, n: int) -> list[tuple[str, int]]:
+        return sorted(self.candidates.items(), key=lambda x: (-x[1], x[0]))[:n]
+
+
+class PartitionSketch:
+    """Distinct players and chat term counts of one server and month"""
+
+    def __init__(
+        self,
+        players: HyperLogLog | None = None,
+        words: HeavyHitters | None = None,
+    ) -> None:
+        self.players = players if players is not None else HyperLogLog()
+        self.words = words if words is not None else HeavyHitters()
+
+    def merge(self, other: "PartitionSketch") -> None:
+        self.players.merge(other.players)
+        self.words.merge(other.words)
+
+    def save(self, path: Path) -> None:
+        path.mkdir(parents=True, exist_ok=True)
+        terms = list(self.words.candidates)
+        np.savez_compressed(
+            path / "sketch.npz",
+            players=self.players.registers,
+            words=self.words.table.reshape(self.words.depth, self.words.width),
+            terms=np.array(terms, dtype=str),
+            term_counts=np.array([self.words.candidates[t] for t in terms], np.int64),
+        )
+
+    @classmethod
+    def load(cls, path: Path) -> "PartitionSketch":
+        with np.load(path / "sketch.npz") as data:
+            registers = data["players"]
+            depth, width = data["words"].shape
+            words = HeavyHitters(
+                width,
+                depth,
+                table=data["words"].reshape(-1),
+                candidates=dict(
+                    zip(data["terms"].tolist(), data["term_counts"].tolist())
+                ),
+            )
+        players = HyperLogLog(int(math.log2(len(registers))), registers)
+        return cls(players, words)
+
+
+def write_sketches(
+    sketches: dict[tuple[str, str], PartitionSketch], base_path: Path = Path("data")
+) -> None:
+    """Replace the sketch of every (server, month) partition in sketches
+
+    Like write_partitions(), this expects sketches of whole months.
+    """
+    for (server, month), sketch in sketches.items():
+        sketch.save(partition_path(base_path, "sketches", server, month))
+
+
+class Sketches:
+    """Every partition sketch overlapping a time window, plus the player table"""
+
+    def __init__(
+        self,
+        partitions: dict[tuple[str, str], PartitionSketch],
+        players: dict[str, dict],
+        player_names: pd.DataFrame,
+        since: float | None = None,
+        until: float | None = None,
+    ) -> None:
+        self.partitions = partitions
+        self.players = players
+        self.player_names = player_names
+        self.since = since
+        self.until = until
+
+    def merged(self, server: str | None = None) -> PartitionSketch:
+        result = PartitionSketch()
+        for (partition_server, _), sketch in self.partitions.items():
+            if server is None or partition_server == server:
+                result.merge(sketch)
+        return result
+
+
+def load_sketches(
+    since: float | None = None,
+    until: float | None = None,
+    base_path: Path = Path("data"),
+) -> Sketches:
+    """Load the sketches of every month overlapping [since, until)"""
+    since_month, until_month = _month_range(since, until)
+    partitions = {
+        (server, month): PartitionSketch.load(path)
+        for server, month, path in list_partitions(
+            base_path, "sketches", since_month, until_month
+        )
+    }
+    with open(base_path / "players.json", encoding="utf-8") as f:
+        players = json.load(f)
+    player_names = read_columns(base_path / "player_names.csv")
+    return Sketches(partitions, players, player_names, since, until)
+
+
+def get_total_players(sketches: Sketches) -> dict:
+    """Estimate the number of distinct players"""
+    return {"total_players": sketches.merged().players.count()}
+
+
+def get_server_player_counts(sketches: Sketches) -> list[dict]:
+    """Estimate the number of distinct players on each server"""
+    servers = sorted({server for server, _ in sketches.partitions})
+    result = [
+        {
+            "server_name": server,
+            "player_count": sketches.merged(server).players.count(),
+        }
+        for server in servers
+    ]
+    result.sort(key=lambda x: x["player_count"], reverse=True)
+    return result
+
+
+def get_top_words(sketches: Sketches, limit: int = 20) -> list[dict]:
+    """Estimate the most used words in chat"""
+    return [
+        {"word": word, "count": count}
+        for word, count in sketches.merged().words.most_common(limit)
+    ]
+
+
+def get_server_variety_ranking(sketches: Sketches) -> list[dict]:
+    """Rank players by the servers they were seen on, from the player table
+
+    A server counts when the player was first seen there before until and
+    last seen there after since.
+    """
+    since = -math.inf if sketches.since is None else sketches.since
+    until = math.inf if sketches.until is None else sketches.until
+    counts = pd.DataFrame(
+        [
+            (uuid, sum(first < until and last >= since for first, last in servers))
+            for uuid, player in sketches.players.items()
+            for servers in [player["servers"].values()]
+        ],
+        columns=["uuid", "server_count"],
+    )
+    counts = counts[counts["server_count"] > 0].merge(sketches.player_names, on="uuid")
+    counts = counts.sort_values("server_count", ascending=False)
+    return [
+        {"player_name": row["player_name"], "server_count": int(row["server_count"])}
+        for _, row in counts.iterrows()
+    ]
@@ -0,0 +1,85 @@
+from .database import (
+    ENGINES,
+    build_database,
+    connect,
+    load_database,
+    query,
+    query_df,
+    query_rows,
+)
+from .stats import (
+    get_active_players,
+    get_advancement_ranking,
+    get_chat_ranking,
+    get_chat_rate_ranking,
+    get_daily_playtime,
+    get_dangerous_server_ranking,
+    get_death_ranking,
+    get_death_rate_ranking,
+    get_deaths_by_cause,
+    get_hourly_playtime,
+    get_peak_concurrent_players,
+    get_player_top_words,
+    get_player_weekday_playtime,
+    get_playtime_ranking,
+    get_pvp_kill_ranking,
+    get_server_chat_ranking,
+    get_server_chat_rate_ranking,
+    get_server_hourly_playtime,
+    get_server_player_list,
+    get_server_playtime_ranking,
+    get_server_timeline,
+    get_server_top_words,
+    get_server_uptime,
+    get_server_variety_ranking,
+    get_top_phrases,
+    get_top_words,
+    get_total_advancements,
+    get_total_deaths,
+    get_total_messages,
+    get_total_playtime,
+    get_weekday_playtime,
+    get_yearly_summary,
+)
+
+__all__ = [
+    "ENGINES",
+    "build_database",
+    "connect",
+    "get_active_players",
+    "get_advancement_ranking",
+    "get_chat_ranking",
+    "get_chat_rate_ranking",
+    "get_daily_playtime",
+    "get_dangerous_server_ranking",
+    "get_death_ranking",
+    "get_death_rate_ranking",
+    "get_deaths_by_cause",
+    "get_hourly_playtime",
+    "get_peak_concurrent_players",
+    "get_player_top_words",
+    "get_player_weekday_playtime",
+    "get_playtime_ranking",
+    "get_pvp_kill_ranking",
+    "get_server_chat_ranking",
+    "get_server_chat_rate_ranking",
+    "get_server_hourly_playtime",
+    "get_server_player_list",
+    "get_server_playtime_ranking",
+    "get_server_timeline",
+    "get_server_top_words",
+    "get_server_uptime",
+    "get_server_variety_ranking",
+    "get_top_phrases",
+    "get_top_words",
+    "get_total_advancements",
+    "get_total_deaths",
+    "get_total_messages",
+    "get_total_playtime",
+    "get_weekday_playtime",
+    "get_yearly_summary",
+    "load_database",
+    "query",
+    "query_df",
+    "query_rows",
+]
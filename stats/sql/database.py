@@ -0,0 +1,103 @@
+import sqlite3
+from pathlib import Path
+
+import pandas as pd
+
+from ..aggregates import playtime_cube
+from ..registry import shared
+
+try:
+    import duckdb
+except ImportError:  # duckdb is optional, sqlite3 is always available
+    duckdb = None
+
+ENGINES = ["sqlite", "duckdb"]
+TABLES = [
+    "deaths",
+    "servers",
+    "sessions",
+    "messages",
+    "advancements",
+    "player_names",
+    "summaries",
+    "uptime",
+    "playtime",
+]
+INDEXES = {
+    "sessions": ["uuid", "server_name"],
+    "deaths": ["uuid", "server_name", "by"],
+    "messages": ["uuid", "server_name"],
+    "advancements": ["uuid"],
+    "player_names": ["uuid"],
+    "uptime": ["server_name"],
+    "playtime": ["uuid", "server_name"],
+}
+
+
+def database_path(engine: str, base_path: Path = Path("data")) -> Path:
+    return base_path / f"stats.{engine}"
+
+
+def connect(engine: str, path: Path):
+    """Open a DB-API connection to an embedded sqlite or duckdb database"""
+    if engine == "sqlite":
+        return sqlite3.connect(path, check_same_thread=False)
+    if engine == "duckdb":
+        if duckdb is None:
+            raise ImportError("duckdb is not installed, use the sqlite engine")
+        return duckdb.connect(str(path))
+    raise ValueError(f"Unknown engine: {engine}")
+
+
+def build_database(dfs: dict[str, pd.DataFrame], engine: str, path: Path):
+    """Store every dataframe as a table in a fresh database file"""
+    path.unlink(missing_ok=True)
+    conn = connect(engine, path)
+
+    for table in TABLES:
+        # The playtime cube is an aggregate of sessions, stored like a table
+        df = shared(dfs, playtime_cube) if table == "playtime" else dfs[table]
+        if engine == "sqlite":
+            df.to_sql(table, conn, index=False)
+        else:
+            conn.register("df_view", df)
+            conn.execute(f"CREATE TABLE {table} AS SELECT * FROM df_view")
+            conn.unregister("df_view")
+        for column in INDEXES.get(table, []):
+            conn.execute(f'CREATE INDEX idx_{table}_{column} ON {table} ("{column}")')
+
+    conn.commit()
+    return conn
+
+
+def load_database(engine: str, base_path: Path = Path("data")):
+    """Open the stats database, rebuilding it when the CSV data is newer"""
+    from ..common import load_dataframes
+
+    path = database_path(engine, base_path)
+    # player_names.csv is rewritten by every run of stage 2
+    data_mtime = (base_path / "player_names.csv").stat().st_mtime
+    if path.exists() and path.stat().st_mtime >= data_mtime:
+        return connect(engine, path)
+    return build_database(load_dataframes(), engine, path)
+
+
+def query(conn, sql: str, params: tuple = ()) -> list[dict]:
+    """Run a query and return rows as dicts"""
+    cursor = conn.execute(sql, params)
+    columns = [column[0] for column in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+def query_rows(conn, sql: str, params: tuple = (), batch_size: int = 10_000):
+    """Run a query and yield its rows as tuples, batch_size rows in memory at a time"""
+    cursor = conn.execute(sql, params)
+    while rows := cursor.fetchmany(batch_size):
+        yield from rows
+
+
+def query_df(conn, sql: str, params: tuple = ()) -> pd.DataFrame:
+    """Run a query and return the result as a DataFrame"""
+    cursor = conn.execute(sql, params)
+    columns = [column[0] for column in cursor.description]
+    return pd.DataFrame(cursor.fetchall(), columns=columns)
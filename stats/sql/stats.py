@@ -0,0 +1,522 @@
+"""SQL implementations of the stats functions
+
+Each function takes a connection from stats.sql.database and returns the
+same shapes as its pandas counterpart. Aggregations run inside the
+database. The interval-splitting stats only push down the projection of
+the session columns or playtime cube slices they need and reuse the pandas
+implementation. The chat text stats stream ordered message contents
+out of the database and tokenize in Python.
+"""
+
+from itertools import groupby
+from operator import itemgetter
+from typing import Iterator
+
+import pandas as pd
+
+from ..overall import playtime as pandas_playtime
+from ..server import activity as pandas_activity
+from ..text import top_terms, top_terms_by
+from .database import query, query_df, query_rows
+
+PLAY_HOURS_BY_UUID = """
+    SELECT uuid, SUM(play_time) / 3600.0 AS play_hours
+    FROM sessions
+    GROUP BY uuid
+    HAVING SUM(play_time) / 3600.0 >= 1
+"""
+PLAY_HOURS_BY_SERVER = """
+    SELECT server_name, SUM(play_time) / 3600.0 AS play_hours
+    FROM sessions
+    GROUP BY server_name
+    HAVING SUM(play_time) / 3600.0 >= 1
+"""
+
+
+def get_total_advancements(conn) -> dict:
+    (row,) = query(conn, "SELECT COUNT(*) AS total FROM advancements")
+    return {"total_advancements": int(row["total"])}
+
+
+def get_advancement_ranking(conn) -> list[dict]:
+    return query(
+        conn,
+        """
+        SELECT n.player_name, a.advancements
+        FROM (
+            SELECT uuid, COUNT(*) AS advancements FROM advancements GROUP BY uuid
+        ) a
+        JOIN player_names n ON n.uuid = a.uuid
+        ORDER BY a.advancements DESC
+        """,
+    )
+
+
+def get_chat_ranking(conn) -> list[dict]:
+    return query(
+        conn,
+        """
+        SELECT n.player_name, m.messages
+        FROM (SELECT uuid, COUNT(*) AS messages FROM messages GROUP BY uuid) m
+        JOIN player_names n ON n.uuid = m.uuid
+        ORDER BY m.messages DESC
+        """,
+    )
+
+
+def get_chat_rate_ranking(conn) -> list[dict]:
+    rows = query(
+        conn,
+        f"""
+        SELECT n.player_name, m.total_messages, p.play_hours
+        FROM (SELECT uuid, COUNT(*) AS total_messages FROM messages GROUP BY uuid) m
+        JOIN ({PLAY_HOURS_BY_UUID}) p ON p.uuid = m.uuid
+        JOIN player_names n ON n.uuid = m.uuid
+        ORDER BY m.total_messages / p.play_hours DESC
+        """,
+    )
+    return [
+        {
+            "player_name": row["player_name"],
+            "messages_per_hour": round(row["total_messages"] / row["play_hours"], 2),
+            "total_messages": int(row["total_messages"]),
+            "play_hours": round(row["play_hours"], 1),
+        }
+        for row in rows
+    ]
+
+
+def get_total_messages(conn) -> dict:
+    (row,) = query(conn, "SELECT COUNT(*) AS total FROM messages")
+    return {"total_messages": int(row["total"])}
+
+
+def _message_contents(conn) -> Iterator[str]:
+    rows = query_rows(conn, "SELECT content FROM messages ORDER BY timestamp, content")
+    return map(itemgetter(0), rows)
+
+
+def _message_contents_by(
+    conn, by: str, where: str = ""
+) -> Iterator[tuple[str, Iterator[str]]]:
+    """(key, contents) groups like stats.text.message_contents_by()"""
+    rows = query_rows(
+        conn,
+        f"""
+        SELECT {by}, content
+        FROM messages
+        {where}
+        ORDER BY {by}, timestamp, content
+        """,
+    )
+    for key, group in groupby(rows, key=itemgetter(0)):
+        yield key, map(itemgetter(1), group)
+
+
+def get_top_words(conn) -> list[dict]:
+    return top_terms(_message_contents(conn), 20)
+
+
+def get_top_phrases(conn) -> list[dict]:
+    return top_terms(_message_contents(conn), 20, ngram=2)
+
+
+def get_player_top_words(conn) -> list[dict]:
+    names = query_df(conn, "SELECT uuid, player_name FROM player_names")
+    names = names.set_index("uuid")["player_name"]
+    groups = _message_contents_by(
+        conn, "uuid", "WHERE uuid IN (SELECT uuid FROM player_names)"
+    )
+    result = [
+        {"player_name": names[uuid], "words": words}
+        for uuid, words in top_terms_by(groups, 10).items()
+    ]
+    result.sort(key=lambda x: x["player_name"])
+    return result
+
+
+def get_death_ranking(conn) -> list[dict]:
+    return query(
+        conn,
+        """
+        SELECT n.player_name, d.deaths
+        FROM (SELECT uuid, COUNT(*) AS deaths FROM deaths GROUP BY uuid) d
+        JOIN player_names n ON n.uuid = d.uuid
+        ORDER BY d.deaths DESC
+        """,
+    )
+
+
+def get_death_rate_ranking(conn) -> list[dict]:
+    rows = query(
+        conn,
+        f"""
+        SELECT n.player_name, d.total_deaths, p.play_hours
+        FROM (SELECT uuid, COUNT(*) AS total_deaths FROM deaths GROUP BY uuid) d
+        JOIN ({PLAY_HOURS_BY_UUID}) p ON p.uuid = d.uuid
+        JOIN player_names n ON n.uuid = d.uuid
+        ORDER BY d.total_deaths / p.play_hours DESC
+        """,
+    )
+    return [
+        {
+            "player_name": row["player_name"],
+            "deaths_per_hour": round(row["total_deaths"] / row["play_hours"], 2),
+            "total_deaths": int(row["total_deaths"]),
+            "play_hours": round(row["play_hours"], 1),
+        }
+        for row in rows
+    ]
+
+
+def get_total_deaths(conn) -> dict:
+    (row,) = query(conn, "SELECT COUNT(*) AS total FROM deaths")
+    return {"total_deaths": int(row["total"])}
+
+
+def get_deaths_by_cause(conn) -> list[dict]:
+    return query(
+        conn,
+        """
+        SELECT COALESCE(cause, 'unknown') AS cause, COUNT(*) AS deaths
+        FROM deaths
+        GROUP BY COALESCE(cause, 'unknown')
+        ORDER BY deaths DESC, cause
+        """,
+    )
+
+
+def get_pvp_kill_ranking(conn) -> list[dict]:
+    # PvP deaths store the killer's uuid in "by"
+    return query(
+        conn,
+        """
+        SELECT n.player_name, k.kills
+        FROM (
+            SELECT "by" AS uuid, COUNT(*) AS kills
+            FROM deaths
+            WHERE "by" LIKE '________-____-____-____-____________'
+            GROUP BY "by"
+        ) k
+        JOIN player_names n ON n.uuid = k.uuid
+        ORDER BY k.kills DESC
+        """,
+    )
+
+
+def get_total_playtime(conn) -> dict:
+    (row,) = query(conn, "SELECT SUM(play_time) AS total FROM sessions")
+    total_hours = (row["total"] or 0) / 3600
+    return {
+        "total_hours": round(total_hours, 1),
+        "total_days": round(total_hours / 24, 1),
+    }
+
+
+def get_active_players(conn) -> list[dict]:
+    rows = query(
+        conn,
+        """
+        SELECT DISTINCT player_name
+        FROM player_names
+        WHERE uuid IN (SELECT uuid FROM sessions)
+        """,
+    )
+    return [{"player_name": name} for name in sorted(r["player_name"] for r in rows)]
+
+
+def get_playtime_ranking(conn) -> list[dict]:
+    rows = query(
+        conn,
+        """
+        SELECT n.player_name, p.play_hours
+        FROM (
+            SELECT uuid, SUM(play_time) / 3600.0 AS play_hours
+            FROM sessions
+            GROUP BY uuid
+        ) p
+        JOIN player_names n ON n.uuid = p.uuid
+        ORDER BY p.play_hours DESC
+        """,
+    )
+    return [
+        {"player_name": row["player_name"], "play_hours": round(row["play_hours"], 1)}
+        for row in rows
+    ]
+
+
+def get_server_variety_ranking(conn) -> list[dict]:
+    return query(
+        conn,
+        """
+        SELECT n.player_name, v.server_count
+        FROM (
+            SELECT uuid, COUNT(DISTINCT server_name) AS server_count
+            FROM sessions
+            GROUP BY uuid
+        ) v
+        JOIN player_names n ON n.uuid = v.uuid
+        ORDER BY v.server_count DESC
+        """,
+    )
+
+
+def _sessions_projection(conn, columns: str) -> dict[str, pd.DataFrame]:
+    return {"sessions": query_df(conn, f"SELECT {columns} FROM sessions")}
+
+
+def _cube_slice(conn, dimensions: str) -> dict[str, pd.DataFrame]:
+    return {
+        "playtime_cube": query_df(
+            conn,
+            f"""
+            SELECT {dimensions}, SUM(play_time) AS play_time
+            FROM playtime
+            GROUP BY {dimensions}
+            """,
+        )
+    }
+
+
+def get_daily_playtime(conn) -> list[dict]:
+    return pandas_playtime.get_daily_playtime(_cube_slice(conn, "day"))
+
+
+def get_weekday_playtime(conn) -> list[dict]:
+    return pandas_playtime.get_weekday_playtime(_cube_slice(conn, "day"))
+
+
+def get_hourly_playtime(conn) -> list[dict]:
+    return pandas_playtime.get_hourly_playtime(_cube_slice(conn, "hour"))
+
+
+def get_server_hourly_playtime(conn) -> list[dict]:
+    return pandas_playtime.get_server_hourly_playtime(
+        _cube_slice(conn, "server_name, hour")
+    )
+
+
+def get_player_weekday_playtime(conn) -> list[dict]:
+    dfs = _cube_slice(conn, "uuid, day")
+    dfs["player_names"] = query_df(conn, "SELECT uuid, player_name FROM player_names")
+    return pandas_playtime.get_player_weekday_playtime(dfs)
+
+
+def get_server_playtime_ranking(conn) -> list[dict]:
+    rows = query(
+        conn,
+        """
+        SELECT server_name, SUM(play_time) / 3600.0 AS play_hours
+        FROM sessions
+        GROUP BY server_name
+        ORDER BY play_hours DESC
+        """,
+    )
+    return [
+        {
+            "server_name": row["server_name"],
+            "play_hours": round(row["play_hours"], 1),
+            "play_days": round(row["play_hours"] / 24, 1),
+        }
+        for row in rows
+    ]
+
+
+def get_peak_concurrent_players(conn) -> list[dict]:
+    dfs = _sessions_projection(conn, "server_name, uuid, join_timestamp, play_time")
+    dfs["player_names"] = query_df(conn, "SELECT uuid, player_name FROM player_names")
+    return pandas_activity.get_peak_concurrent_players(dfs)
+
+
+def get_server_timeline(conn) -> list[dict]:
+    intervals = "uptime"
+    if query(conn, "SELECT COUNT(*) AS n FROM uptime")[0]["n"] == 0:
+        intervals = """(
+            SELECT
+                server_name,
+                join_timestamp AS start_timestamp,
+                join_timestamp + play_time AS end_timestamp
+            FROM sessions
+        )"""
+    timeline = query_df(
+        conn,
+        f"""
+        SELECT
+            server_name,
+            MIN(start_timestamp) AS created_time,
+            MAX(end_timestamp) AS closed_time
+        FROM {intervals}
+        GROUP BY server_name
+        ORDER BY created_time
+        """,
+    )
+    for column in ["created_time", "closed_time"]:
+        timeline[column] = pd.to_datetime(timeline[column], unit="s") + pd.Timedelta(
+            hours=8
+        )
+    return [
+        {
+            "server_name": row["server_name"],
+            "created_at": row["created_time"].strftime("%Y-%m-%d %H:%M:%S"),
+            "closed_at": row["closed_time"].strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        for _, row in timeline.iterrows()
+    ]
+
+
+def get_server_uptime(conn) -> list[dict]:
+    rows = query(
+        conn,
+        """
+        SELECT
+            server_name,
+            SUM(end_timestamp - start_timestamp) AS up_time,
+            COUNT(*) AS starts,
+            MAX(end_timestamp) - MIN(start_timestamp) AS lifetime
+        FROM uptime
+        GROUP BY server_name
+        ORDER BY up_time DESC
+        """,
+    )
+    return [
+        {
+            "server_name": row["server_name"],
+            "up_hours": round(row["up_time"] / 3600, 1),
+            "uptime_percent": (
+                round(row["up_time"] / row["lifetime"] * 100, 1)
+                if row["lifetime"] > 0
+                else 100.0
+            ),
+            "starts": int(row["starts"]),
+        }
+        for row in rows
+    ]
+
+
+def get_server_player_list(conn) -> list[dict]:
+    servers = query(
+        conn, "SELECT DISTINCT server_name FROM sessions ORDER BY server_name"
+    )
+    rows = query(
+        conn,
+        """
+        SELECT DISTINCT s.server_name, n.player_name
+        FROM (SELECT DISTINCT server_name, uuid FROM sessions) s
+        JOIN player_names n ON n.uuid = s.uuid
+        """,
+    )
+    players: dict[str, list[str]] = {row["server_name"]: [] for row in servers}
+    for row in rows:
+        players[row["server_name"]].append(row["player_name"])
+
+    result = [
+        {
+            "server_name": server_name,
+            "player_count": len(names),
+            "player_list": sorted(names),
+        }
+        for server_name, names in players.items()
+    ]
+    result.sort(key=lambda x: x["player_count"], reverse=True)
+    return result
+
+
+def get_server_chat_ranking(conn) -> list[dict]:
+    return query(
+        conn,
+        """
+        SELECT server_name, COUNT(*) AS messages
+        FROM messages
+        GROUP BY server_name
+        ORDER BY messages DESC
+        """,
+    )
+
+
+def get_server_chat_rate_ranking(conn) -> list[dict]:
+    rows = query(
+        conn,
+        f"""
+        SELECT m.server_name, m.total_messages, p.play_hours
+        FROM (
+            SELECT server_name, COUNT(*) AS total_messages
+            FROM messages
+            GROUP BY server_name
+        ) m
+        JOIN ({PLAY_HOURS_BY_SERVER}) p ON p.server_name = m.server_name
+        ORDER BY m.total_messages / p.play_hours DESC
+        """,
+    )
+    return [
+        {
+            "server_name": row["server_name"],
+            "messages_per_hour": round(row["total_messages"] / row["play_hours"], 2),
+            "total_messages": int(row["total_messages"]),
+            "play_hours": round(row["play_hours"], 1),
+        }
+        for row in rows
+    ]
+
+
+def get_server_top_words(conn) -> list[dict]:
+    groups = _message_contents_by(conn, "server_name")
+    return [
+        {"server_name": server_name, "words": words}
+        for server_name, words in top_terms_by(groups, 10).items()
+    ]
+
+
+def get_dangerous_server_ranking(conn) -> list[dict]:
+    rows = query(
+        conn,
+        f"""
+        SELECT d.server_name, d.total_deaths, p.play_hours
+        FROM (
+            SELECT server_name, COUNT(*) AS total_deaths
+            FROM deaths
+            GROUP BY server_name
+        ) d
+        JOIN ({PLAY_HOURS_BY_SERVER}) p ON p.server_name = d.server_name
+        ORDER BY d.total_deaths / p.play_hours DESC
+        """,
+    )
+    return [
+        {
+            "server_name": row["server_name"],
+            "deaths_per_hour": round(row["total_deaths"] / row["play_hours"], 2),
+            "total_deaths": int(row["total_deaths"]),
+            "play_hours": round(row["play_hours"], 1),
+        }
+        for row in rows
+    ]
+
+
+def get_yearly_summary(conn) -> list[dict]:
+    rows = query(
+        conn,
+        """
+        SELECT
+            SUBSTR(month, 1, 4) AS year,
+            SUM(play_time) AS play_time,
+            SUM(messages) AS messages,
+            SUM(deaths) AS deaths,
+            SUM(advancements) AS advancements,
+            COUNT(DISTINCT uuid) AS players,
+            COUNT(DISTINCT server_name) AS servers
+        FROM summaries
+        GROUP BY SUBSTR(month, 1, 4)
+        ORDER BY year
+        """,
+    )
+    return [
+        {
+            "year": int(row["year"]),
+            "play_hours": round(row["play_time"] / 3600, 1),
+            "messages": int(row["messages"]),
+            "deaths": int(row["deaths"]),
+            "advancements": int(row["advancements"]),
+            "players": int(row["players"]),
+            "servers": int(row["servers"]),
+        }
+        for row in rows
+    ]
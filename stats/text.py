@@ -0,0 +1,113 @@
+from typing import Iterable, Iterator
+
+import pandas as pd
+
+from parsing.text import tokenize
+
+# Tracked terms per counter before rare ones are dropped
+DEFAULT_CAPACITY = 10_000
+
+
+def ngrams(tokens: tuple[str, ...], n: int) -> list[str]:
+    if n == 1:
+        return list(tokens)
+    return [" ".join(tokens[i : i + n]) for i in range(len(tokens) - n + 1)]
+
+
+class TopCounter:
+    """Counts terms in bounded memory, keeping at most 2 * capacity of them
+
+    Whenever it grows past that, only the capacity terms with the highest
+    possible counts are kept, and error becomes the highest possible count
+    of a dropped term. Counts only include occurrences since a term was
+    last tracked, so they are exact while error is 0 and otherwise at most
+    error below the true count. Every term counted more than error times is
+    still tracked.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY) -> None:
+        self.capacity = capacity
+        self.counts: dict[str, int] = {}
+        # error at the time a term was tracked, the most it may have missed
+        self.missed: dict[str, int] = {}
+        self.error = 0
+
+    def add(self, term: str, count: int = 1) -> None:
+        self.update((term,), count)
+
+    def update(self, terms, count: int = 1) -> None:
+        """Add count to each of terms"""
+        counts = self.counts
+        for term in terms:
+            if term in counts:
+                counts[term] += count
+                continue
+            counts[term] = count
+            if self.error:
+                self.missed[term] = self.error
+            if len(counts) > 2 * self.capacity:
+                self.prune()
+                counts = self.counts
+
+    def prune(self) -> None:
+        counts, missed = self.counts, self.missed
+        ranked = sorted(counts, key=lambda term: -counts[term] - missed.get(term, 0))
+        dropped = ranked[self.capacity]
+        self.error = max(self.error, counts[dropped] + missed.get(dropped, 0))
+        kept = ranked[: self.capacity]
+        self.counts = {term: counts[term] for term in kept}
+        self.missed = {term: missed[term] for term in kept if term in missed}
+
+    def most_common(self, n: int) -> list[tuple[str, int]]:
+        return sorted(self.counts.items(), key=lambda x: (-x[1], x[0]))[:n]
+
+
+def message_contents(messages: pd.DataFrame) -> Iterator[str]:
+    """Contents of messages in the order the counters see them"""
+    # A fixed order keeps the result independent of how rows were loaded
+    ordered = messages[["timestamp", "content"]].sort_values(["timestamp", "content"])
+    yield from ordered["content"]
+
+
+def message_contents_by(
+    messages: pd.DataFrame, by: str
+) -> Iterator[tuple[str, Iterator[str]]]:
+    """(key, message_contents()) for every value of the by column, sorted by key"""
+    for key, group in messages.groupby(by, observed=True, sort=True):
+        yield key, message_contents(group)
+
+
+def count_terms(contents: Iterable[str], ngram: int, capacity: int) -> TopCounter:
+    counter = TopCounter(capacity)
+    for content in contents:
+        counter.update(ngrams(tokenize(content), ngram))
+    return counter
+
+
+def top_terms(
+    contents: Iterable[str],
+    limit: int,
+    ngram: int = 1,
+    capacity: int = DEFAULT_CAPACITY,
+) -> list[dict]:
+    """Most frequent words (ngram=1) or phrases of ngram words in contents
+
+    Counts are lower bounds once a counter had to drop terms, see TopCounter.
+    """
+    key = "word" if ngram == 1 else "phrase"
+    return [
+        {key: term, "count": count}
+        for term, count in count_terms(contents, ngram, capacity).most_common(limit)
+    ]
+
+
+def top_terms_by(
+    groups: Iterable[tuple[str, Iterable[str]]],
+    limit: int,
+    ngram: int = 1,
+    capacity: int = DEFAULT_CAPACITY,
+) -> dict[str, list[dict]]:
+    """top_terms() of every (key, contents) group, one counter at a time"""
+    return {
+        key: top_terms(contents, limit, ngram, capacity) for key, contents in groups
+    }
@@ -0,0 +1,17 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def run_stage(stage: str, workdir: Path, *args: str) -> None:
+    """Run a pipeline stage in workdir, which holds files/"""
+    subprocess.run(
+        [sys.executable, str(REPO_ROOT / stage), *args],
+        cwd=workdir,
+        env=dict(os.environ, PYTHONPATH=str(REPO_ROOT)),
+        check=True,
+        capture_output=True,
+    )
@@ -0,0 +1,24 @@
+import pandas as pd
+
+from parsing import repair_sessions
+
+
+def test_event_after_a_quiet_gap_extends_the_session() -> None:
+    # The server logs nothing for an hour, then the player chats and it crashes
+    sessions = pd.DataFrame(
+        {
+            "server_name": ["s"],
+            "uuid": ["u"],
+            "join_timestamp": [0.0],
+            "play_time": [10_000.0],
+            "closed_by": ["restart"],
+        }
+    )
+    gaps = pd.DataFrame({"server_name": ["s", "s"], "gap_start": [600.0, 5_000.0]})
+    chat = pd.DataFrame({"server_name": ["s"], "uuid": ["u"], "timestamp": [4_200.0]})
+
+    repaired = repair_sessions(sessions, gaps, [chat], idle_timeout=1_800)
+
+    # Capped at the gap after the chat, not the one before it
+    assert repaired["play_time"].tolist() == [5_000.0]
+    assert "closed_by" not in repaired
@@ -0,0 +1,16 @@
+import random
+from collections import Counter
+
+from stats.text import TopCounter
+
+
+def test_pruned_counts_are_within_error_below_the_true_counts() -> None:
+    rng = random.Random(0)
+    terms = [f"t{int(rng.paretovariate(1))}" for _ in range(20_000)]
+    counter = TopCounter(capacity=20)
+    counter.update(terms)
+    true_counts = Counter(terms)
+
+    assert counter.error > 0
+    for term, count in counter.most_common(20):
+        assert true_counts[term] - counter.error <= count <= true_counts[term]
@@ -0,0 +1,29 @@
+from pathlib import Path
+
+import pandas as pd
+
+from bench.synthetic import generate
+
+from .common import run_stage
+
+
+def read_partition(workdir: Path, table: str) -> pd.DataFrame:
+    return pd.read_csv(
+        workdir / "data" / table / "server=server0" / "month=2024-05" / "data.csv"
+    )
+
+
+def test_mid_month_window_keeps_the_rest_of_the_month(tmp_path: Path) -> None:
+    generate(
+        tmp_path, servers=1, players=10, days=31, sessions_per_day=5, start="2024-05-01"
+    )
+    for stage in ("01-combine-and-filter-logs.py", "02-create-dataframe.py"):
+        run_stage(stage, tmp_path)
+    full = {t: read_partition(tmp_path, t) for t in ("sessions", "messages", "uptime")}
+
+    for stage in ("01-combine-and-filter-logs.py", "02-create-dataframe.py"):
+        run_stage(stage, tmp_path, "--since", "2024-05-15")
+
+    for table, expected in full.items():
+        assert len(expected) > 0
+        pd.testing.assert_frame_equal(read_partition(tmp_path, table), expected)
@@ -0,0 +1,48 @@
+from pathlib import Path
+
+import pandas as pd
+
+from bench.synthetic import write_gzip
+from parsing import parse_timestamp
+
+from .common import run_stage
+
+DONE = '[Server thread/INFO]: Done (3.1s)! For help, type "help"'
+SAVING = "[Server thread/INFO]: Saving the game (this may take a moment!)"
+
+
+def test_crash_ends_uptime_before_the_next_boot(tmp_path: Path) -> None:
+    log_dir = tmp_path / "files" / "s" / "logs"
+    log_dir.mkdir(parents=True)
+    # Crashes after 11:00, the next boot logs startup lines before "Done"
+    write_gzip(
+        log_dir / "2024-05-01-1.log.gz",
+        [
+            "[09:59:50] [Server thread/INFO]: Starting minecraft server\n",
+            f"[10:00:10] {DONE}\n",
+            f"[10:30:00] {SAVING}\n",
+            f"[11:00:00] {SAVING}\n",
+        ],
+    )
+    write_gzip(
+        log_dir / "2024-05-01-2.log.gz",
+        [
+            "[19:59:00] [Server thread/INFO]: Starting minecraft server\n",
+            "[19:59:30] [Server thread/INFO]: Preparing spawn area: 50%\n",
+            f"[20:00:00] {DONE}\n",
+            f"[20:30:00] {SAVING}\n",
+        ],
+    )
+    run_stage("01-combine-and-filter-logs.py", tmp_path)
+    run_stage("02-create-dataframe.py", tmp_path)
+
+    uptime = pd.read_csv(
+        tmp_path / "data" / "uptime" / "server=s" / "month=2024-05" / "data.csv"
+    )
+    expected = [
+        ("2024-05-01 10:00:10", "2024-05-01 11:00:00"),
+        ("2024-05-01 20:00:00", "2024-05-01 20:30:00"),
+    ]
+    assert list(zip(uptime["start_timestamp"], uptime["end_timestamp"])) == [
+        (parse_timestamp(start), parse_timestamp(end)) for start, end in expected
+    ]